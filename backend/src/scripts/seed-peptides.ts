@@ -7,12 +7,39 @@ import {
 import {
   createProductCategoriesWorkflow,
   createProductsWorkflow,
+  deleteProductsWorkflow,
+  updateProductsWorkflow,
 } from "@medusajs/medusa/core-flows"
 import * as fs from "fs"
 import * as path from "path"
 
-export default async function seedPeptideProducts({ container }: ExecArgs) {
+/**
+ * Handles that pipeline runs changed since the last successful delta seed.
+ * transform-data.py keeps merging into the manifest until it is acknowledged here.
+ */
+type TransformDelta = {
+  transformer_version?: number
+  generated_at?: string
+  pending_since?: string
+  added: string[]
+  changed: string[]
+  removed: string[]
+  unchanged?: number
+}
+
+/**
+ * Store-relative path -> file module URL of every image derivative uploaded so far,
+ * so each derivative is uploaded once. Delete it after resetting the file storage.
+ */
+const UPLOADED_IMAGES_PATH = path.join(
+  process.cwd(),
+  "tasks/premier-bio-labs-integration/data/.cache/uploaded-images.json"
+)
+const IMAGE_STORE_PATH = path.join(process.cwd(), "tasks/premier-bio-labs-integration/data/images")
+
+export default async function seedPeptideProducts({ container, args = [] }: ExecArgs) {
   const logger = container.resolve(ContainerRegistrationKeys.LOGGER)
+  const query = container.resolve(ContainerRegistrationKeys.QUERY)
   const salesChannelModuleService = container.resolve(Modules.SALES_CHANNEL)
   const fulfillmentModuleService = container.resolve(Modules.FULFILLMENT)
 
@@ -45,6 +72,32 @@ export default async function seedPeptideProducts({ container }: ExecArgs) {
       "tasks/premier-bio-labs-integration/data/final-products.json"
     )
 
+    // Only pending delta handles and products missing from the database are written, unless --full is passed
+    const deltaPath = path.join(
+      process.cwd(),
+      "tasks/premier-bio-labs-integration/data/transform-delta.json"
+    )
+    let delta: TransformDelta | null = null
+    if (!args.includes("--full") && fs.existsSync(dataPath)) {
+      delta = fs.existsSync(deltaPath)
+        ? JSON.parse(fs.readFileSync(deltaPath, "utf-8"))
+        : { added: [], changed: [], removed: [] }
+      // final-products.json is generated from the transform output the delta describes; an older
+      // one would seed stale or missing products and the delta would be acknowledged all the same
+      const needsData = delta!.added.length + delta!.changed.length > 0
+      if (needsData && delta!.generated_at && Date.parse(delta!.generated_at) > fs.statSync(dataPath).mtimeMs) {
+        throw new Error(
+          `final-products.json predates the transform delta of ${delta!.generated_at}; ` +
+          `run generate-descriptions.py before seeding`
+        )
+      }
+      logger.info(
+        `✓ Applying transform delta pending since ${delta!.pending_since ?? "the last seed"}: ` +
+        `${delta!.added.length} added, ${delta!.changed.length} changed, ${delta!.removed.length} removed ` +
+        `(pass --full to reseed everything)`
+      )
+    }
+
     // If final products don't exist, create fallback data
     let productData: any[]
     if (fs.existsSync(dataPath)) {
@@ -56,76 +109,86 @@ export default async function seedPeptideProducts({ container }: ExecArgs) {
       productData = getFallbackProducts()
     }
 
-    // Create product categories
+    // Create product categories that don't exist yet, so the seed can be re-run
     logger.info("Creating product categories...")
-    const { result: categoryResult } = await createProductCategoriesWorkflow(
-      container
-    ).run({
-      input: {
-        product_categories: [
-          {
-            name: "Research Peptides",
-            handle: "research-peptides",
-            description: "High-purity peptides for laboratory research",
-            is_active: true,
-            metadata: {
-              icon: "🧬",
-              order: 1
-            }
-          },
-          {
-            name: "Growth Factors",
-            handle: "growth-factors",
-            description: "Growth hormone and related research compounds",
-            is_active: true,
-            metadata: {
-              icon: "📈",
-              order: 2
-            }
-          },
-          {
-            name: "Metabolic Compounds",
-            handle: "metabolic-compounds",
-            description: "Compounds for metabolic and diabetes research",
-            is_active: true,
-            metadata: {
-              icon: "⚗️",
-              order: 3
-            }
-          },
-          {
-            name: "Anti-Aging Research",
-            handle: "anti-aging-research",
-            description: "Compounds studied in longevity and aging research",
-            is_active: true,
-            metadata: {
-              icon: "⏰",
-              order: 4
-            }
-          },
-          {
-            name: "Starter Kits",
-            handle: "starter-kits",
-            description: "Complete research kits with multiple peptides",
-            is_active: true,
-            metadata: {
-              icon: "📦",
-              order: 5
-            }
-          },
-        ],
+    const peptideCategories = [
+      {
+        name: "Research Peptides",
+        handle: "research-peptides",
+        description: "High-purity peptides for laboratory research",
+        is_active: true,
+        metadata: {
+          icon: "🧬",
+          order: 1
+        }
+      },
+      {
+        name: "Growth Factors",
+        handle: "growth-factors",
+        description: "Growth hormone and related research compounds",
+        is_active: true,
+        metadata: {
+          icon: "📈",
+          order: 2
+        }
+      },
+      {
+        name: "Metabolic Compounds",
+        handle: "metabolic-compounds",
+        description: "Compounds for metabolic and diabetes research",
+        is_active: true,
+        metadata: {
+          icon: "⚗️",
+          order: 3
+        }
+      },
+      {
+        name: "Anti-Aging Research",
+        handle: "anti-aging-research",
+        description: "Compounds studied in longevity and aging research",
+        is_active: true,
+        metadata: {
+          icon: "⏰",
+          order: 4
+        }
+      },
+      {
+        name: "Starter Kits",
+        handle: "starter-kits",
+        description: "Complete research kits with multiple peptides",
+        is_active: true,
+        metadata: {
+          icon: "📦",
+          order: 5
+        }
       },
+    ]
+    const { data: existingCategories } = await query.graph({
+      entity: "product_category",
+      fields: ["id", "name", "handle"],
+      filters: { handle: peptideCategories.map((category) => category.handle) },
     })
+    const existingHandles = new Set(existingCategories.map((category: any) => category.handle))
+    const missingCategories = peptideCategories.filter(
+      (category) => !existingHandles.has(category.handle)
+    )
+    let categoryResult: any[] = []
+    if (missingCategories.length) {
+      const { result } = await createProductCategoriesWorkflow(container).run({
+        input: { product_categories: missingCategories },
+      })
+      categoryResult = result
+    }
     logger.info(`✓ Created ${categoryResult.length} categories`)
 
     // Map category names to IDs
-    const categoryMap = categoryResult.reduce((acc, cat) => {
+    const categoryMap = [...existingCategories, ...categoryResult].reduce((acc, cat) => {
       acc[cat.name] = cat.id
       return acc
     }, {} as Record<string, string>)
 
     // Transform products for Medusa
-    const medusaProducts = productData.map(product => {
+    const toMedusaProduct = (product: any) => {
       // Map categories
       const categoryIds = (product.categories || [])
         .map((catName: string) => categoryMap[catName])
@@ -194,13 +257,29 @@ export default async function seedPeptideProducts({ container }: ExecArgs) {
           }
         })),
       }
-    })
+    }
+
+    const uploadedImages: Record<string, string> = fs.existsSync(UPLOADED_IMAGES_PATH)
+      ? JSON.parse(fs.readFileSync(UPLOADED_IMAGES_PATH, "utf-8"))
+      : {}
+
+    if (delta) {
+      const remaining = await applyDelta(
+        container, logger, delta, productData.map(toMedusaProduct), uploadedImages, args.includes("--allow-deletes")
+      )
+      acknowledgeDelta(logger, deltaPath, delta, remaining)
+      logger.info("✅ Peptide product delta applied!")
+      return
+    }
+
+    const medusaProducts = productData.map(toMedusaProduct)
 
     // Create products
     logger.info(`Creating ${medusaProducts.length} products...`)
 
     for (const product of medusaProducts) {
       try {
+        await uploadResponsiveImages(container, logger, uploadedImages, product)
         const { result } = await createProductsWorkflow(container).run({
           input: {
             products: [product],
@@ -229,6 +308,185 @@ export default async function seedPeptideProducts({ container }: ExecArgs) {
   }
 }
 
+/**
+ * Create, update and delete only the products named in the transform delta,
+ * plus any product in the data file that the database does not have yet.
+ * Products are matched by handle; variants of existing products by SKU.
+ * Deletions only happen with --allow-deletes: a scrape that fell back to the
+ * built-in products or a truncated catalog pull would otherwise wipe the store.
+ * Handles the delta names but the data file lacks (transform-data.py re-ran without
+ * generate-descriptions.py) stay pending instead of being acknowledged unapplied.
+ * Returns the handles that could not be applied and must stay pending.
+ */
+async function applyDelta(
+  container: any,
+  logger: any,
+  delta: TransformDelta,
+  medusaProducts: any[],
+  uploadedImages: Record<string, string>,
+  allowDeletes: boolean
+): Promise<TransformDelta> {
+  const query = container.resolve(ContainerRegistrationKeys.QUERY)
+  const remaining: TransformDelta = { added: [], changed: [], removed: [] }
+
+  const { data: existing } = await query.graph({
+    entity: "product",
+    fields: ["id", "handle", "variants.id", "variants.sku"],
+    filters: { handle: [...new Set([...medusaProducts.map((product) => product.handle), ...delta.removed])] },
+  })
+  const existingByHandle = new Map<string, any>(existing.map((product: any) => [product.handle, product]))
+
+  const wanted = new Set([...delta.added, ...delta.changed])
+  const pending = medusaProducts.filter(
+    (product) => wanted.has(product.handle) || !existingByHandle.has(product.handle)
+  )
+
+  const available = new Set(medusaProducts.map((product) => product.handle))
+  const unavailable = [...wanted].filter((handle) => !available.has(handle))
+  if (unavailable.length) {
+    logger.warn(
+      `⚠️ ${unavailable.length} delta products are missing from final-products.json and stay pending ` +
+      `(run generate-descriptions.py after transform-data.py): ${unavailable.join(", ")}`
+    )
+    remaining.added.push(...delta.added.filter((handle) => !available.has(handle)))
+    remaining.changed.push(...delta.changed.filter((handle) => !available.has(handle)))
+  }
+
+  if (!pending.length && !delta.removed.length) {
+    logger.info("✓ No product changes to apply")
+    return remaining
+  }
+
+  for (const product of pending) {
+    const current = existingByHandle.get(product.handle)
+    try {
+      await uploadResponsiveImages(container, logger, uploadedImages, product)
+      if (!current) {
+        await createProductsWorkflow(container).run({ input: { products: [product] } })
+        logger.info(`✓ Created: ${product.title}`)
+        continue
+      }
+
+      // Options are left as they are; existing variants keep their ids so prices update in place
+      const { options, ...fields } = product
+      const variantIds = new Map<string, string>(
+        (current.variants || []).map((variant: any) => [variant.sku, variant.id])
+      )
+      await updateProductsWorkflow(container).run({
+        input: {
+          products: [{
+            ...fields,
+            id: current.id,
+            variants: product.variants.map(({ options, ...variant }: any) => (
+              variantIds.has(variant.sku)
+                ? { ...variant, id: variantIds.get(variant.sku) }
+                : { ...variant, options }
+            )),
+          }],
+        },
+      })
+      logger.info(`✓ Updated: ${product.title}`)
+    } catch (error) {
+      logger.error(`✗ Failed to apply ${product.title}:`, error)
+      const retryList = current ? remaining.changed : remaining.added
+      retryList.push(product.handle)
+    }
+  }
+
+  const removedHandles = delta.removed.filter((handle) => existingByHandle.has(handle))
+  if (removedHandles.length) {
+    logger.info(
+      `${removedHandles.length} products are no longer in the catalog of ${medusaProducts.length}: ` +
+      removedHandles.join(", ")
+    )
+    if (!allowDeletes) {
+      logger.warn("⚠️ Not deleting them; re-run with --allow-deletes once the scrape is confirmed complete")
+      remaining.removed.push(...removedHandles)
+    } else {
+      await deleteProductsWorkflow(container).run({
+        input: { ids: removedHandles.map((handle) => existingByHandle.get(handle).id) },
+      })
+      logger.info(`✓ Deleted ${removedHandles.length} products`)
+    }
+  }
+  return remaining
+}
+
+/**
+ * Upload the responsive image derivatives that build-image-derivatives.py recorded by
+ * store path through the file module, and fill in their URLs in the product metadata.
+ * Sources that already have a URL (built with --public-url) are left as they are.
+ */
+async function uploadResponsiveImages(
+  container: any,
+  logger: any,
+  uploadedImages: Record<string, string>,
+  product: any
+) {
+  const metadata = product.metadata || {}
+  const images = [...(metadata.responsive_images || []), metadata.responsive_thumbnail].filter(Boolean)
+  const sources = images.flatMap((image: any) => Object.values(image.sources || {}).flat() as any[])
+  const missing = sources.filter((source: any) => !source.url && !uploadedImages[source.path])
+
+  const toUpload = [...new Set(missing.map((source: any) => source.path as string))].filter((storePath) => {
+    if (fs.existsSync(path.join(IMAGE_STORE_PATH, storePath))) {
+      return true
+    }
+    logger.warn(`⚠️ Image derivative ${storePath} is missing from ${IMAGE_STORE_PATH}; leaving it out`)
+    return false
+  })
+  if (toUpload.length) {
+    const fileModuleService = container.resolve(Modules.FILE)
+    const files = await fileModuleService.createFiles(toUpload.map((storePath) => ({
+      filename: storePath.replace(/\//g, "-"),
+      mimeType: `image/${path.extname(storePath).slice(1)}`,
+      content: fs.readFileSync(path.join(IMAGE_STORE_PATH, storePath)).toString("binary"),
+    })))
+    toUpload.forEach((storePath, index) => {
+      uploadedImages[storePath] = files[index].url
+    })
+
+    const tmpPath = `${UPLOADED_IMAGES_PATH}.tmp`
+    fs.mkdirSync(path.dirname(UPLOADED_IMAGES_PATH), { recursive: true })
+    fs.writeFileSync(tmpPath, JSON.stringify(uploadedImages, null, 2))
+    fs.renameSync(tmpPath, UPLOADED_IMAGES_PATH)
+  }
+
+  for (const image of images) {
+    for (const [format, formatSources] of Object.entries(image.sources || {})) {
+      image.sources[format] = (formatSources as any[])
+        .map((source) => (source.url ? source : { ...source, url: uploadedImages[source.path] }))
+        .filter((source) => source.url)
+    }
+  }
+}
+
+/**
+ * Mark the delta manifest as consumed: rename it once everything was applied,
+ * otherwise rewrite it with only the handles that are still pending.
+ */
+function acknowledgeDelta(logger: any, deltaPath: string, delta: TransformDelta, remaining: TransformDelta) {
+  if (!fs.existsSync(deltaPath)) {
+    return
+  }
+  // A transform that finished while we were seeding merged new handles; leave them for the next seed
+  const onDisk: TransformDelta = JSON.parse(fs.readFileSync(deltaPath, "utf-8"))
+  if (onDisk.generated_at !== delta.generated_at) {
+    logger.warn(`⚠️ ${deltaPath} changed during seeding; it stays pending and will be re-applied`)
+    return
+  }
+  const pendingCount = remaining.added.length + remaining.changed.length + remaining.removed.length
+  if (!pendingCount) {
+    fs.renameSync(deltaPath, deltaPath.replace(/\.json$/, ".applied.json"))
+    logger.info("✓ Transform delta acknowledged")
+    return
+  }
+  const tmpPath = `${deltaPath}.tmp`
+  fs.writeFileSync(tmpPath, JSON.stringify({ ...delta, ...remaining }, null, 2))
+  fs.renameSync(tmpPath, deltaPath)
+  logger.warn(`⚠️ ${pendingCount} delta entries could not be applied and stay pending in ${deltaPath}`)
+}
+
 /**
  * Fallback product data if no data file exists
  */
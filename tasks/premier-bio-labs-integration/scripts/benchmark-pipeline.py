@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark
+Generates synthetic WooCommerce catalogs and measures extraction, transformation
+and description throughput and peak memory against a stored baseline
+
+Peak memory per stage comes from tracemalloc, which only sees allocations made
+through Python's allocator: lxml/libxml2 trees and other native buffers are not
+counted, so the extract figure understates real usage. The process peak RSS,
+printed at the end, includes them but covers the whole run rather than a stage.
+"""
+
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    # Windows: no getrusage, so no process peak RSS
+    resource = None
+
+SCRIPTS_DIR = Path(__file__).parent
+DATA_DIR = SCRIPTS_DIR.parent / 'data'
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+
+
+def load_script(module_name: str, filename: str):
+    """Import one of the hyphenated pipeline scripts as a module"""
+    spec = importlib.util.spec_from_file_location(module_name, SCRIPTS_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so process pools can pickle references to its functions
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+class SyntheticCatalog:
+    """Deterministic generator of WooCommerce-shaped product pages and raw records"""
+
+    BASE_URL = "https://premierbiolabs.com"
+
+    PEPTIDES = ['BPC-157', 'GHK-Cu', 'Tesamorelin', 'GLP-2 (T*)', 'GLP-3 (R*)', 'NAD+', 'TB-500',
+                'Ipamorelin', 'CJC-1295', 'Semax', 'Selank', 'Epitalon', 'MOTS-c', 'AOD-9604',
+                'Thymosin Alpha-1', 'Kisspeptin-10', 'PT-141', 'DSIP', 'Starter Kit R', 'Starter Kit T']
+    CATEGORIES = ['Research Peptides', 'Metabolic Research', 'Anti-Aging Research', 'Tissue Research',
+                  'Growth Factors', 'Starter Kits', 'Research Compounds', 'Nootropic Research']
+    SIZES = ['2mg', '5mg', '10mg', '20mg', '30mg', '50mg', '100mg', '250mg', '500mg', '1g']
+    SPEC_KEYS = ['Purity', 'Molecular Formula', 'Molecular Weight', 'CAS Number', 'Storage', 'Form',
+                 'Solubility', 'Appearance', 'Sequence', 'Counter Ion', 'Endotoxin', 'Water Content',
+                 'Peptide Content', 'Mass Spec', 'HPLC Method', 'Lot Number', 'Manufacture Date',
+                 'Retest Date', 'Synonyms', 'Source']
+    WORDS = ('peptide research laboratory synthesis purity analysis receptor tissue metabolic cellular '
+             'signaling pathway stability lyophilized reconstitution assay protocol study compound '
+             'sequence structure binding affinity in vitro model evaluation').split()
+
+    def __init__(self, seed: int = 1759643286):
+        self.seed = seed
+
+    def sentence(self, rng: random.Random, words: int) -> str:
+        """A plausible-looking filler sentence"""
+        text = ' '.join(rng.choice(self.WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + '.'
+
+    def record(self, index: int) -> Dict:
+        """Raw product record as emitted by the scraper"""
+        rng = random.Random(self.seed * 1_000_003 + index)
+        name = f"{self.PEPTIDES[index % len(self.PEPTIDES)]} Lot {index}"
+        handle = name.lower().replace('+', '').replace('(', '').replace(')', '').replace('*', '')
+        handle = '-'.join(handle.split())
+        sku = f"PBL-{index:06d}"
+        price = round(rng.uniform(9.99, 499.99), 2)
+
+        # Roughly one product in ten is variation-heavy
+        variant_count = rng.randint(12, 30) if rng.random() < 0.1 else rng.randint(1, 4)
+        variants = []
+        for position in range(variant_count):
+            size = self.SIZES[position % len(self.SIZES)]
+            if position >= len(self.SIZES):
+                size = f"{size} x{position // len(self.SIZES) + 1}"
+            variants.append({
+                'size': size,
+                'price': round(price * (1 + position * 0.35), 2),
+                'sku': f"{sku}-{position}",
+                'in_stock': rng.random() > 0.1
+            })
+
+        # Large spec tables on a similar share of products
+        spec_count = rng.randint(25, 60) if rng.random() < 0.1 else rng.randint(3, 8)
+        specifications = {}
+        for position in range(spec_count):
+            key = self.SPEC_KEYS[position % len(self.SPEC_KEYS)]
+            if position >= len(self.SPEC_KEYS):
+                key = f"{key} {position // len(self.SPEC_KEYS) + 1}"
+            specifications[key] = self.sentence(rng, rng.randint(1, 4)).rstrip('.')
+
+        categories = rng.sample(self.CATEGORIES, rng.randint(1, 3))
+        return {
+            'url': f"{self.BASE_URL}/product/{handle}/",
+            'scraped_at': datetime(2025, 10, 5).isoformat(),
+            'name': name,
+            'handle': handle,
+            'sku': sku,
+            'price': price,
+            'short_description': self.sentence(rng, rng.randint(8, 20)),
+            'full_description': ' '.join(self.sentence(rng, rng.randint(10, 30)) for _ in range(rng.randint(3, 12))),
+            'images': [f"{self.BASE_URL}/wp-content/uploads/2025/10/{handle}-{n}.jpg"
+                       for n in range(rng.randint(1, 5))],
+            'variants': variants,
+            'categories': categories,
+            'specifications': specifications
+        }
+
+    def page(self, record: Dict) -> str:
+        """Server-rendered WooCommerce product page for a record"""
+        variations = [
+            {'attributes': {'attribute_pa_size': v['size']}, 'display_price': v['price'], 'sku': v['sku'],
+             'is_in_stock': v['in_stock'], 'variation_id': position}
+            for position, v in enumerate(record['variants'])
+        ]
+        gallery = ''.join(
+            f'<div class="woocommerce-product-gallery__image"><img class="wp-post-image" src="{url}" '
+            f'data-large_image="{url}" width="600" height="600"></div>'
+            for url in record['images']
+        )
+        options = ''.join(f'<option value="{escape(v["size"])}">{escape(v["size"])}</option>'
+                          for v in record['variants'])
+        spec_rows = ''.join(f'<tr><th>{escape(key)}</th><td>{escape(value)}</td></tr>'
+                            for key, value in record['specifications'].items())
+        paragraphs = ''.join(f'<p>{escape(part)}.</p>' for part in record['full_description'].split('. ') if part)
+        tags = ', '.join(f'<a href="{self.BASE_URL}/product-category/{escape(cat.lower().replace(" ", "-"))}/" '
+                         f'rel="tag">{escape(cat)}</a>' for cat in record['categories'])
+        return f"""<!DOCTYPE html>
+<html lang="en-US"><head><meta charset="UTF-8"><title>{escape(record['name'])} - Premier Bio Labs</title>
+<meta property="product:retailer_item_id" content="{record['sku']}">
+<link rel="stylesheet" href="{self.BASE_URL}/wp-content/plugins/woocommerce/assets/css/woocommerce.css">
+<script>window.wc_add_to_cart_params = {{"ajax_url": "/wp-admin/admin-ajax.php"}};</script>
+<style>.product_title {{ font-size: 2rem; }}</style></head>
+<body class="product-template-default single single-product woocommerce">
+<header class="site-header"><nav><ul class="menu"><li><a href="{self.BASE_URL}/shop/">Shop</a></li>
+<li><a href="{self.BASE_URL}/about/">About</a></li></ul></nav></header>
+<main id="main" class="site-main"><div class="woocommerce-notices-wrapper"></div>
+<div id="product-{record['sku']}" class="product type-product status-publish instock has-post-thumbnail">
+<div class="woocommerce-product-gallery images">{gallery}</div>
+<div class="summary entry-summary">
+<h1 class="product_title entry-title">{escape(record['name'])}</h1>
+<p class="price"><span class="woocommerce-Price-amount amount"><bdi><span class="woocommerce-Price-currencySymbol">$</span>{record['price']:,.2f}</bdi></span></p>
+<div class="woocommerce-product-details__short-description"><p>{escape(record['short_description'])}</p></div>
+<form class="variations_form cart" method="post" data-product_id="{record['sku'][4:]}" data-product_variations="{escape(json.dumps(variations))}">
+<table class="variations"><tbody><tr><th class="label"><label for="pa_size">Size</label></th>
+<td class="value"><select id="pa_size" name="attribute_pa_size"><option value="">Choose an option</option>{options}</select></td></tr></tbody></table>
+<button type="submit" class="single_add_to_cart_button button alt">Add to cart</button></form>
+<div class="product_meta"><span class="sku_wrapper">SKU: <span class="sku">{record['sku']}</span></span>
+<span class="posted_in">Categories: {tags}</span></div></div>
+<div class="woocommerce-tabs wc-tabs-wrapper"><ul class="tabs wc-tabs"><li class="description_tab"><a href="#tab-description">Description</a></li></ul>
+<div class="woocommerce-Tabs-panel woocommerce-Tabs-panel--description panel entry-content wc-tab" id="tab-description">
+<h2>Description</h2>{paragraphs}<table class="woocommerce-product-attributes shop_attributes"><tbody>{spec_rows}</tbody></table></div></div>
+</div></main><footer class="site-footer"><p>For research use only.</p></footer>
+<script src="{self.BASE_URL}/wp-includes/js/jquery/jquery.min.js"></script></body></html>"""
+
+    def records(self, count: int) -> Iterator[Dict]:
+        """Stream ``count`` raw records"""
+        for index in range(count):
+            yield self.record(index)
+
+    def pages(self, count: int) -> Iterator[Dict]:
+        """Stream ``count`` (url, html) page entries"""
+        for record in self.records(count):
+            yield {'url': record['url'], 'html': self.page(record)}
+
+
+class PipelineBenchmark:
+    """Time each pipeline stage and track its peak Python heap with tracemalloc"""
+
+    DEFAULT_BASELINE = DATA_DIR / 'benchmark-baseline.json'
+
+    def __init__(self, parser: str = 'compiled', measure_memory: bool = True, repeat: int = 3):
+        self.parser = parser
+        self.repeat = max(1, repeat)
+        self.measure_memory = measure_memory
+        self.scraper = load_script('scrape_products', 'scrape-products.py')
+        self.transformer = load_script('transform_data', 'transform-data.py')
+        self.descriptions = load_script('generate_descriptions', 'generate-descriptions.py')
+
+    # Pages rendered ahead of each timed extraction batch, so generation cost stays out of the figures
+    PAGE_BATCH = 1000
+
+    def extract(self, pages: Iterator[Dict]) -> Tuple[List[Dict], float]:
+        """Run the product extractor over every page, timing only the extraction itself"""
+        records, elapsed, batch = [], 0.0, []
+        for page in pages:
+            batch.append(page)
+            if len(batch) >= self.PAGE_BATCH:
+                elapsed += self.extract_batch(batch, records)
+                batch = []
+        elapsed += self.extract_batch(batch, records)
+        return records, elapsed
+
+    def extract_batch(self, batch: List[Dict], records: List[Dict]) -> float:
+        """Extract one batch of pages into ``records`` and return the time taken"""
+        started = time.perf_counter()
+        for page in batch:
+            records.append(self.scraper.parse_product_html(page['html'], page['url'], parser=self.parser))
+        return time.perf_counter() - started
+
+    def transform(self, raw_products: List[Dict]) -> Tuple[List[Any], float]:
+        """Run ProductTransformer.transform_all, which returns TransformedProduct records"""
+        started = time.perf_counter()
+        output = self.transformer.ProductTransformer().transform_all(raw_products)
+        return output, time.perf_counter() - started
+
+    def describe(self, products: List[Dict]) -> Tuple[List[Dict], float]:
+        """Run DescriptionGenerator.enhance_all_products"""
+        started = time.perf_counter()
+        output = self.descriptions.DescriptionGenerator().enhance_all_products(products)
+        return output, time.perf_counter() - started
+
+    def measure(self, stage: str, count: int, run) -> Tuple[Dict, Any]:
+        """Best-of-N timing for throughput, then one more run under tracemalloc for peak Python heap
+
+        ``peak_mb`` leaves out native allocations such as lxml trees; see the module docstring.
+        """
+        elapsed = None
+        for _ in range(self.repeat):
+            output = None
+            gc.collect()
+            with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                output, seconds = run()
+            elapsed = seconds if elapsed is None else min(elapsed, seconds)
+        result = {'stage': stage, 'items': count, 'seconds': round(elapsed, 3),
+                  'items_per_sec': round(count / elapsed, 1) if elapsed else None, 'peak_mb': None}
+
+        if self.measure_memory:
+            del output
+            gc.collect()
+            tracemalloc.start()
+            try:
+                baseline = tracemalloc.get_traced_memory()[0]
+                with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+                    output, _ = run()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            result['peak_mb'] = round((peak - baseline) / 1024 / 1024, 1)
+        return result, output
+
+    def run(self, scale: str, catalog: SyntheticCatalog) -> List[Dict]:
+        """Benchmark every stage at one scale, feeding each stage's output into the next"""
+        count = SCALES[scale]
+        results = []
+
+        result, raw_products = self.measure('extract', count, lambda: self.extract(catalog.pages(count)))
+        results.append(result)
+        result, transformed = self.measure('transform', count, lambda: self.transform(raw_products))
+        results.append(result)
+        del raw_products
+        # enhance_all_products rewrites descriptions in place, so each run gets its own dicts
+        result, _ = self.measure('describe', count, lambda: self.describe([p.to_dict() for p in transformed]))
+        results.append(result)
+
+        for result in results:
+            result['scale'] = scale
+        return results
+
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """List regressions beyond ``tolerance`` against the stored baseline
+
+    A stage the baseline has no entry for is reported too: it cannot be checked.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(f"{result['scale']}/{result['stage']}")
+        if not previous:
+            regressions.append(f"{result['scale']}/{result['stage']}: no baseline entry "
+                               f"(run with --save-baseline to add one)")
+            continue
+        if previous.get('items_per_sec') and result['items_per_sec'] is not None:
+            floor = previous['items_per_sec'] * (1 - tolerance)
+            if result['items_per_sec'] < floor:
+                regressions.append(f"{result['scale']}/{result['stage']}: {result['items_per_sec']:.0f} items/s "
+                                   f"< {previous['items_per_sec']:.0f} baseline")
+        if previous.get('peak_mb') and result['peak_mb'] is not None:
+            ceiling = previous['peak_mb'] * (1 + tolerance)
+            if result['peak_mb'] > ceiling:
+                regressions.append(f"{result['scale']}/{result['stage']}: peak {result['peak_mb']:.1f} MB "
+                                   f"> {previous['peak_mb']:.1f} MB baseline")
+    return regressions
+
+
+def write_fixtures(catalog: SyntheticCatalog, count: int, raw_path: Optional[str], archive_path: Optional[str],
+                   scraper):
+    """Write a synthetic raw-products file and/or a replayable page archive"""
+    if raw_path:
+        with open(raw_path, 'w') as f:
+            f.write('[')
+            for index, record in enumerate(catalog.records(count)):
+                f.write(',\n' if index else '\n')
+                f.write(json.dumps(record))
+            f.write('\n]')
+        print(f"✓ Wrote {count} raw products to {raw_path}")
+    if archive_path:
+        archive = scraper.PageArchive(Path(archive_path))
+        archive.open_for_recording()
+        for page in catalog.pages(count):
+            archive.record(page['url'], 'synthetic', {'content-type': 'text/html; charset=UTF-8'}, page['html'])
+        archive.mark_complete(count)
+        archive.close()
+        print(f"✓ Wrote {count} pages to {archive_path} (replay with scrape-products.py --replay)")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Benchmark the product pipeline on synthetic catalogs')
+    parser.add_argument('--scale', nargs='+', choices=list(SCALES), default=['1k'],
+                        help='Catalog sizes to benchmark (default: 1k)')
+    parser.add_argument('--parser', choices=['compiled', 'soup'], default='compiled',
+                        help='Product page extractor to benchmark (default: compiled)')
+    parser.add_argument('--seed', type=int, default=1759643286, help='Generator seed')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Timed runs per stage; the fastest is reported (default: 3)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Skip the tracemalloc pass (halves run time, no peak memory figures); the '
+                             'figures cover the Python heap only, not lxml\'s native allocations')
+    parser.add_argument('--baseline', default=str(PipelineBenchmark.DEFAULT_BASELINE),
+                        help=f'Baseline results to compare against (default: {PipelineBenchmark.DEFAULT_BASELINE})')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store these results as the new baseline instead of comparing')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed throughput drop / memory growth before failing (default: 0.2)')
+    parser.add_argument('--output', default=None, help='Also write the results as JSON')
+    parser.add_argument('--write-raw', metavar='PATH', default=None,
+                        help='Write a synthetic raw-products JSON file at the first --scale and exit')
+    parser.add_argument('--write-archive', metavar='PATH', default=None,
+                        help='Write a synthetic page archive at the first --scale and exit')
+    return parser.parse_args(argv)
+
+
+def main(args: Optional[argparse.Namespace] = None) -> int:
+    """Run the benchmark"""
+    args = args or parse_args([])
+    catalog = SyntheticCatalog(args.seed)
+    bench = PipelineBenchmark(args.parser, measure_memory=not args.no_memory, repeat=args.repeat)
+
+    if args.write_raw or args.write_archive:
+        write_fixtures(catalog, SCALES[args.scale[0]], args.write_raw, args.write_archive, bench.scraper)
+        return 0
+
+    print("⏱  Premier Bio Labs pipeline benchmark")
+    print("-" * 50)
+    results = []
+    for scale in args.scale:
+        for result in bench.run(scale, catalog):
+            results.append(result)
+            peak = f"{result['peak_mb']:.1f} MB" if result['peak_mb'] is not None else 'n/a'
+            print(f"  {scale:>4} {result['stage']:<10} {result['items_per_sec']:>10,.0f} items/s  "
+                  f"{result['seconds']:>8.2f}s  peak Python heap {peak}")
+    if resource:
+        # ru_maxrss is in kilobytes on Linux and bytes on macOS
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        max_rss_mb = max_rss / 1024 / 1024 if sys.platform == 'darwin' else max_rss / 1024
+        print(f"  Process peak RSS, native allocations included: {max_rss_mb:.0f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+        baseline.update({f"{r['scale']}/{r['stage']}": r for r in results})
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_path, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\n✅ Saved baseline to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\n✗ No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 1
+
+    regressions = compare(results, json.loads(baseline_path.read_text()), args.tolerance)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) beyond {args.tolerance:.0%} or unchecked stage(s):")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print(f"\n✓ Within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main(parse_args()))
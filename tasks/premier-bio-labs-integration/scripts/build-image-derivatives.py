@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Responsive Image Derivatives
+Resizes downloaded product images to the storefront's breakpoints as WebP/AVIF,
+builds blur placeholders, and records them in product metadata
+
+Derivatives are recorded by their path inside the image store; seed-peptides.ts
+uploads them through the Medusa file module and fills in the URLs. Pass
+--public-url only when the store is already served from somewhere.
+"""
+
+import argparse
+import base64
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from delta_manifest import DeltaManifest
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    print("Please install required packages:")
+    print("pip install Pillow")
+    exit(1)
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+# Rendered widths from the storefront thumbnail and gallery `sizes` attributes
+BREAKPOINTS = (180, 280, 360, 440, 480, 800)
+FORMATS = ('webp', 'avif')
+QUALITY = {'webp': 78, 'avif': 55}
+PLACEHOLDER_WIDTH = 16
+
+
+def resize_to_width(image, width: int):
+    """Downscale to a target width, keeping the aspect ratio"""
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.LANCZOS)
+
+
+def blur_placeholder(image) -> str:
+    """Tiny WebP as a data URI, for next/image's blurDataURL"""
+    buffer = io.BytesIO()
+    resize_to_width(image, PLACEHOLDER_WIDTH).save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def build_derivatives(source: str, output_dir: str, formats: List[str]) -> Dict:
+    """Process-pool entry point: write every breakpoint/format of one source image"""
+    with Image.open(source) as opened:
+        image = ImageOps.exif_transpose(opened)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+    # Never upscale; images narrower than every breakpoint get one derivative at native width
+    widths = [width for width in BREAKPOINTS if width < image.width] or [image.width]
+    derivatives = []
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        for image_format in formats:
+            path = output / f"{width}.{image_format}"
+            # Derivatives are keyed by source digest, so existing files are already correct
+            if not path.exists():
+                if resized is None:
+                    resized = resize_to_width(image, width) if width != image.width else image
+                tmp_path = output / f"{width}.tmp.{image_format}"
+                resized.save(tmp_path, image_format.upper(), quality=QUALITY[image_format])
+                tmp_path.replace(path)
+            derivatives.append({'format': image_format, 'width': width, 'height': height,
+                                'path': str(path), 'bytes': path.stat().st_size})
+
+    return {
+        'width': image.width,
+        'height': image.height,
+        'placeholder': blur_placeholder(image),
+        'derivatives': derivatives
+    }
+
+
+class DerivativeBuilder:
+    """Fan image processing out across cores and attach the results to products"""
+
+    def __init__(self, store_root: Path, public_url: Optional[str] = None, workers: Optional[int] = None):
+        self.store_root = Path(store_root)
+        self.output_root = self.store_root / 'derivatives'
+        self.public_url = public_url.rstrip('/') if public_url else None
+        self.workers = workers or os.cpu_count() or 1
+        self.formats = [image_format for image_format in FORMATS if features.check(image_format)]
+        for image_format in FORMATS:
+            if image_format not in self.formats:
+                print(f"⚠️ This Pillow build cannot encode {image_format.upper()}; skipping it")
+
+        manifest_path = self.store_root / 'manifest.json'
+        self.manifest: Dict[str, Dict] = {}
+        if manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def store_path(self, path: str) -> str:
+        """Path of a file relative to the image store, as recorded in metadata"""
+        return Path(path).relative_to(self.store_root).as_posix()
+
+    def build_all(self, digests: Dict[str, str]) -> Dict[str, Dict]:
+        """Process each distinct image once; returns results keyed by SHA-256"""
+        results = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                digest: pool.submit(build_derivatives, str(self.store_root / path),
+                                    str(self.output_root / digest), self.formats)
+                for digest, path in digests.items()
+            }
+            for digest, future in futures.items():
+                try:
+                    results[digest] = future.result()
+                    print(f"✓ Derivatives: {digest[:12]} ({len(results[digest]['derivatives'])} files)")
+                except Exception as e:
+                    print(f"✗ Error processing {digest[:12]}: {e}")
+        return results
+
+    def image_metadata(self, url: str, results: Dict[str, Dict]) -> Optional[Dict]:
+        """Responsive variants of one source URL, grouped by format"""
+        entry = self.manifest.get(url)
+        result = results.get(entry['sha256']) if entry else None
+        if not result:
+            return None
+
+        sources = {}
+        for derivative in result['derivatives']:
+            source = {
+                'path': self.store_path(derivative['path']),
+                'width': derivative['width'],
+                'height': derivative['height']
+            }
+            if self.public_url:
+                source['url'] = f"{self.public_url}/{source['path']}"
+            sources.setdefault(derivative['format'], []).append(source)
+        return {
+            'source': url,
+            'width': result['width'],
+            'height': result['height'],
+            'placeholder': result['placeholder'],
+            'sources': sources
+        }
+
+    def apply(self, products: List[Dict]) -> List[str]:
+        """Build derivatives for every stored product image and write them into product metadata
+
+        Returns the handles whose responsive image metadata changed.
+        """
+        digests = {}
+        for product in products:
+            for url in self.product_image_urls(product):
+                entry = self.manifest.get(url)
+                if entry:
+                    digests[entry['sha256']] = entry['path']
+        if not digests:
+            return []
+
+        results = self.build_all(digests)
+        changed = []
+        for product in products:
+            images = [meta for meta in (self.image_metadata(url, results)
+                                        for url in self.product_image_urls(product)) if meta]
+            if not images:
+                continue
+            metadata = product.setdefault('metadata', {})
+            before = (metadata.get('responsive_images'), metadata.get('responsive_thumbnail'))
+            metadata['responsive_images'] = images
+            thumbnail = self.image_metadata(product.get('thumbnail') or '', results)
+            if thumbnail:
+                metadata['responsive_thumbnail'] = thumbnail
+            if (metadata.get('responsive_images'), metadata.get('responsive_thumbnail')) != before:
+                changed.append(product['handle'])
+        return changed
+
+    @staticmethod
+    def product_image_urls(product: Dict) -> List[str]:
+        """Image URLs of a raw or transformed product"""
+        return [image.get('url') if isinstance(image, dict) else image for image in product.get('images', [])]
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Build responsive WebP/AVIF derivatives for product images')
+    parser.add_argument('--input', default=str(DATA_DIR / 'transformed-products.json'),
+                        help='Products to annotate (default: transformed-products.json)')
+    parser.add_argument('--output', default=None,
+                        help='Where to write the annotated products (default: overwrite --input)')
+    parser.add_argument('--store', default=str(DATA_DIR / 'images'),
+                        help='Image store populated by download-images.py (default: data/images)')
+    parser.add_argument('--public-url', default=None,
+                        help='URL prefix the image store is already served from (default: none; '
+                             'seed-peptides.ts uploads the derivatives through the file module)')
+    parser.add_argument('--delta', default=str(DeltaManifest.DEFAULT_PATH),
+                        help='Manifest of handles not yet seeded; products whose responsive images changed '
+                             'are added to it (default: data/transform-delta.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Image processing processes (default: all cores)')
+    return parser.parse_args(argv)
+
+
+def main(args: Optional[argparse.Namespace] = None):
+    """Run the derivative builder"""
+    args = args or parse_args([])
+    input_path = Path(args.input)
+    with open(input_path, 'r') as f:
+        products = json.load(f)
+
+    builder = DerivativeBuilder(Path(args.store), args.public_url, args.workers)
+    print(f"🖼  Building {', '.join(builder.formats)} derivatives at {', '.join(map(str, BREAKPOINTS))}px "
+          f"with {builder.workers} workers...")
+    changed = builder.apply(products)
+
+    output_path = Path(args.output) if args.output else input_path
+    with open(output_path, 'w') as f:
+        json.dump(products, f, indent=2)
+
+    # The transform delta only sees raw data changes; metadata added here must reach the seed too
+    if changed:
+        manifest = DeltaManifest(Path(args.delta))
+        manifest.merge(changed=changed)
+        manifest.save()
+        print(f"  Marked {len(changed)} products with new responsive images as changed in {manifest.path.name}")
+
+    print(f"\n✅ Updated responsive images of {len(changed)} of {len(products)} products in {output_path}")
+    return products
+
+
+if __name__ == "__main__":
+    main(parse_args())
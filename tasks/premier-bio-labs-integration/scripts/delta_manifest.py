@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Delta Manifest
+Product handles added, changed or removed since seed-peptides.ts last applied
+the catalog; pipeline runs merge into it until the seed acknowledges it
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class DeltaManifest:
+    """Pending product changes by handle, accumulated across runs until seeding consumes them
+
+    The seed renames the manifest once it has applied every entry (or rewrites it
+    with the entries that still failed), so a missing manifest means nothing is pending.
+    """
+
+    DEFAULT_PATH = DATA_DIR / 'transform-delta.json'
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        # Dicts as ordered sets, so handles keep the order they were first reported in
+        self.added: Dict[str, None] = {}
+        self.changed: Dict[str, None] = {}
+        self.removed: Dict[str, None] = {}
+        self.pending_since: Optional[str] = None
+        # Run details written by whichever script saved last, e.g. the transformer version
+        self.details: Dict[str, Any] = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                manifest = json.load(f)
+            self.details = {key: value for key, value in manifest.items()
+                            if key not in ('generated_at', 'pending_since', 'added', 'changed', 'removed')}
+            self.added = dict.fromkeys(manifest.get('added', []))
+            self.changed = dict.fromkeys(manifest.get('changed', []))
+            self.removed = dict.fromkeys(manifest.get('removed', []))
+            self.pending_since = manifest.get('pending_since') or manifest.get('generated_at')
+
+    def merge(self, added: Iterable[str] = (), changed: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Fold one run's changes into what is still waiting to be seeded"""
+        for handle in added:
+            if handle in self.removed:
+                # Removed and re-added before seeding: the database still has the old version
+                del self.removed[handle]
+                self.changed[handle] = None
+            elif handle not in self.changed:
+                self.added[handle] = None
+        for handle in changed:
+            self.removed.pop(handle, None)
+            if handle not in self.added:
+                self.changed[handle] = None
+        for handle in removed:
+            self.added.pop(handle, None)
+            self.changed.pop(handle, None)
+            # Kept even when it was only pending as added: an interrupted seed may already have created it
+            self.removed[handle] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of handles waiting to be seeded"""
+        return len(self.added) + len(self.changed) + len(self.removed)
+
+    def save(self, **extra: Any) -> Path:
+        """Write the manifest atomically; ``extra`` adds or replaces run details such as the transformer version"""
+        now = datetime.now().isoformat()
+        self.details.update(extra)
+        manifest = {
+            **self.details,
+            'generated_at': now,
+            'pending_since': self.pending_since or now,
+            'added': list(self.added),
+            'changed': list(self.changed),
+            'removed': list(self.removed)
+        }
+        self.pending_since = manifest['pending_since']
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        tmp_path.replace(self.path)
+        return self.path
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Product Image Downloader
+Fetches every product image once into a SHA-256 content-addressed local store
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+except ImportError:
+    print("Please install required packages:")
+    print("pip install playwright")
+    exit(1)
+
+from host_throttle import HostThrottle, RetryableError, backoff_delay, is_congested, parse_retry_after
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+class ImageStore:
+    """Content-addressed image files plus a manifest mapping source URLs to their digests"""
+
+    DEFAULT_ROOT = DATA_DIR / 'images'
+
+    EXTENSIONS = {
+        'image/jpeg': '.jpg',
+        'image/png': '.png',
+        'image/webp': '.webp',
+        'image/avif': '.avif',
+        'image/gif': '.gif',
+        'image/svg+xml': '.svg'
+    }
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else self.DEFAULT_ROOT
+        self.manifest_path = self.root / 'manifest.json'
+        self.manifest: Dict[str, Dict] = {}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def path_for(self, digest: str, extension: str) -> Path:
+        """Fan files out by digest prefix to keep directories small"""
+        return self.root / digest[:2] / f"{digest}{extension}"
+
+    def extension_for(self, url: str, content_type: str) -> str:
+        """File extension from the response type, falling back to the URL suffix"""
+        extension = self.EXTENSIONS.get(content_type.split(';')[0].strip().lower())
+        if extension:
+            return extension
+        suffix = Path(urlparse(url).path).suffix.lower()
+        return '.jpg' if suffix == '.jpeg' else suffix or '.bin'
+
+    def has(self, url: str) -> bool:
+        """Whether a URL was already downloaded and its file is still on disk"""
+        entry = self.manifest.get(url)
+        return bool(entry) and (self.root / entry['path']).exists()
+
+    def put(self, url: str, body: bytes, content_type: str) -> Dict:
+        """Store a downloaded body under its SHA-256; identical bytes are written once"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.path_for(digest, self.extension_for(url, content_type))
+        written = False
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(path.suffix + '.tmp')
+            tmp_path.write_bytes(body)
+            tmp_path.replace(path)
+            written = True
+
+        self.manifest[url] = {
+            'sha256': digest,
+            'path': str(path.relative_to(self.root)),
+            'bytes': len(body),
+            'content_type': content_type,
+            'downloaded_at': datetime.now().isoformat()
+        }
+        return {'entry': self.manifest[url], 'written': written}
+
+    def save(self):
+        """Persist the manifest atomically"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        tmp_path.replace(self.manifest_path)
+
+
+class ImageDownloader:
+    """Concurrent image fetch stage over a pooled keep-alive HTTP client
+
+    Every response feeds the per-host adaptive limit; 429/5xx answers, timeouts and
+    network errors are re-queued after a jittered backoff that honours Retry-After,
+    without a worker sitting out the delay.
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    # Same retry policy as the scraper's product fetches
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+
+    def __init__(self, store: ImageStore, concurrency: int = 8, per_host_limit: int = 4,
+                 min_request_interval: float = 0.0, adaptive: bool = True, max_retries: Optional[int] = None):
+        self.store = store
+        self.concurrency = max(1, concurrency)
+        # Adaptive mode lets each host's in-flight limit float between 1 and the worker count
+        self.throttle = HostThrottle(per_host_limit, min_request_interval, self.concurrency if adaptive else None)
+        self.max_retries = self.MAX_RETRIES if max_retries is None else max(0, max_retries)
+        self.http = None
+        # Backoff timers of failed URLs waiting to be re-queued
+        self.retry_timers: set = set()
+        self.stats = {'downloaded': 0, 'deduplicated': 0, 'skipped': 0, 'failed': 0, 'retried': 0, 'bytes': 0}
+
+    @staticmethod
+    def image_urls(products: Iterable[Dict]) -> List[str]:
+        """Every distinct image URL across the catalog, in first-seen order"""
+        urls = {}
+        for product in products:
+            for image in product.get('images', []):
+                url = image.get('url') if isinstance(image, dict) else image
+                if url and url.startswith('http'):
+                    urls[url] = True
+            thumbnail = product.get('thumbnail')
+            if thumbnail and thumbnail.startswith('http'):
+                urls[thumbnail] = True
+        return list(urls)
+
+    async def fetch(self, url: str) -> Tuple[object, bytes]:
+        """Throttled GET reporting its outcome to the throttle; 429/5xx and timeouts raise RetryableError"""
+        async with self.throttle.slot(url):
+            started = time.perf_counter()
+            try:
+                response = await self.http.get(url, timeout=30000)
+                body = await response.body()
+            except PlaywrightTimeoutError:
+                self.throttle.record(url, congested=True)
+                raise RetryableError(f"timeout fetching {url}")
+            congested = is_congested(response.status)
+            retry_after = parse_retry_after(response.headers) if congested else None
+            self.throttle.record(url, time.perf_counter() - started, congested, retry_after)
+        if congested:
+            raise RetryableError(f"HTTP {response.status}", retry_after=retry_after)
+        return response, body
+
+    def schedule_retry(self, queue: asyncio.Queue, item: Tuple[str, int], delay: float):
+        """Re-queue a URL after its backoff without tying up a worker while it waits"""
+        async def requeue_later():
+            await asyncio.sleep(delay)
+            await queue.put(item)
+
+        timer = asyncio.create_task(requeue_later())
+        self.retry_timers.add(timer)
+        timer.add_done_callback(self.retry_timers.discard)
+
+    async def download(self, url: str, attempt: int, queue: asyncio.Queue):
+        """Fetch one image into the store, re-queueing it with backoff when the fetch fails"""
+        try:
+            response, body = await self.fetch(url)
+        except Exception as e:
+            if attempt < self.max_retries:
+                retry_after = e.retry_after if isinstance(e, RetryableError) else None
+                delay = backoff_delay(attempt, retry_after, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+                print(f"↻ Retry {attempt + 1}/{self.max_retries} for {url} in {delay:.1f}s ({e})")
+                self.stats['retried'] += 1
+                self.schedule_retry(queue, (url, attempt + 1), delay)
+            else:
+                print(f"✗ Image {url} after {attempt + 1} attempts: {e}")
+                self.stats['failed'] += 1
+            return
+
+        try:
+            content_type = response.headers.get('content-type', '')
+            if response.status != 200 or not content_type.startswith('image/'):
+                print(f"✗ Image {url}: HTTP {response.status} ({content_type or 'no content type'})")
+                self.stats['failed'] += 1
+                return
+
+            result = self.store.put(url, body, content_type)
+            if result['written']:
+                self.stats['downloaded'] += 1
+                self.stats['bytes'] += len(body)
+                print(f"✓ Downloaded: {url} ({len(body) / 1024:.0f} KB)")
+            else:
+                self.stats['deduplicated'] += 1
+                print(f"= Same content as a stored image: {url}")
+
+        except Exception as e:
+            print(f"✗ Image {url}: {e}")
+            self.stats['failed'] += 1
+
+    async def _worker(self, queue: asyncio.Queue):
+        """Download queued (url, attempt) items until the end is signalled"""
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                url, attempt = item
+                await self.download(url, attempt, queue)
+            finally:
+                queue.task_done()
+
+    async def run(self, urls: List[str]) -> Dict[str, int]:
+        """Download every URL not already in the store"""
+        queue: asyncio.Queue = asyncio.Queue()
+        for url in urls:
+            if self.store.has(url):
+                self.stats['skipped'] += 1
+            else:
+                queue.put_nowait((url, 0))
+        if queue.empty():
+            return self.stats
+
+        playwright = await async_playwright().start()
+        try:
+            self.http = await playwright.request.new_context(user_agent=self.USER_AGENT)
+            workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+            # Retries are re-queued later, so drain until no backoff timer is left
+            while True:
+                await queue.join()
+                if not self.retry_timers:
+                    break
+                await asyncio.wait(set(self.retry_timers))
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        finally:
+            self.store.save()
+            if self.http:
+                await self.http.dispose()
+            await playwright.stop()
+        return self.stats
+
+
+def load_products(path: Path) -> Iterator[Dict]:
+    """Read products from a JSON array or a JSONL file"""
+    with open(path, 'r') as f:
+        if path.suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Download product images into a content-addressed store')
+    parser.add_argument('--input', default=str(DATA_DIR / 'raw-products.json'),
+                        help='Products file (.json or .jsonl) whose images to fetch (default: raw-products.json)')
+    parser.add_argument('--store', default=str(ImageStore.DEFAULT_ROOT),
+                        help=f'Image store directory (default: {ImageStore.DEFAULT_ROOT})')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Downloads in flight across all hosts (default: 8)')
+    parser.add_argument('--per-host-limit', type=int, default=4,
+                        help='Starting in-flight downloads per host; adaptive mode grows it up to --concurrency '
+                             '(default: 4)')
+    parser.add_argument('--no-adaptive', action='store_true',
+                        help='Keep --per-host-limit fixed instead of adjusting it to origin latency and errors')
+    parser.add_argument('--max-retries', type=int, default=ImageDownloader.MAX_RETRIES,
+                        help=f'Retries per image after timeouts, 429/5xx or network errors '
+                             f'(default: {ImageDownloader.MAX_RETRIES})')
+    parser.add_argument('--min-request-interval', type=float, default=0.0,
+                        help='Minimum seconds between download starts per host (default: 0)')
+    return parser.parse_args(argv)
+
+
+async def main(args: Optional[argparse.Namespace] = None):
+    """Run the downloader"""
+    args = args or parse_args([])
+    store = ImageStore(Path(args.store))
+    urls = ImageDownloader.image_urls(load_products(Path(args.input)))
+
+    print(f"🖼  Fetching {len(urls)} distinct product images...")
+    print("-" * 50)
+    downloader = ImageDownloader(store, args.concurrency, args.per_host_limit, args.min_request_interval,
+                                 adaptive=not args.no_adaptive, max_retries=args.max_retries)
+    stats = await downloader.run(urls)
+
+    print("-" * 50)
+    print(f"✓ Downloaded {stats['downloaded']} images ({stats['bytes'] / 1024 / 1024:.1f} MB)")
+    print(f"  Already stored: {stats['skipped']}, duplicate content: {stats['deduplicated']}, "
+          f"retried: {stats['retried']}, failed: {stats['failed']}")
+    limits = downloader.throttle.limits()
+    if limits:
+        print(f"  Adaptive per-host limits: {', '.join(f'{host}={limit}' for host, limit in limits.items())}")
+    print(f"  Manifest: {store.manifest_path}")
+    return stats
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Stand-in Store
+Local WooCommerce origin for integration runs of scrape-products.py --base-url
+"""
+
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = Path(__file__).parent
+
+STORE_API_PATH = '/wp-json/wc/store/v1/products'
+PRODUCT_COUNT = 250
+# Product id the AJAX-variations fixture page points its form at
+AJAX_PRODUCT_ID = 311
+
+# Product pages listed in the sitemap, served from the saved fixture pages
+PRODUCT_PAGES = {
+    '/product/simple/': 'product-simple.html',
+    '/product/variable/': 'product-variable.html',
+    '/product/tb-500/': 'product-ajax-variations.html'
+}
+
+# Paths answered once with 429 + Retry-After before they succeed
+THROTTLED_ONCE = {'page=2', '/product/variable/'}
+
+
+def variation_ids(product_id: int) -> List[int]:
+    """Two size variations for every third product"""
+    return [product_id * 10 + k for k in range(2)] if product_id % 3 == 0 else []
+
+
+def store_product(product_id: int, base_url: str) -> Dict:
+    """Store API product record; variable products carry only their variation references"""
+    variations = variation_ids(product_id)
+    return {
+        'id': product_id,
+        'name': f'Peptide &#8211; {product_id}',
+        'type': 'variable' if variations else 'simple',
+        'permalink': f'{base_url}/product/p{product_id}/',
+        'sku': f'SKU{product_id}',
+        'short_description': '<p>Research peptide</p>',
+        'description': '<p>Lyophilized powder.</p><table><tr><td>Purity</td><td>99%</td></tr></table>',
+        'prices': {
+            'price': '1799',
+            'currency_minor_unit': 2,
+            'price_range': {'min_amount': '1799', 'max_amount': '2799'} if variations else None
+        },
+        'images': [{'src': f'{base_url}/img/{product_id}.jpg'}],
+        'categories': [{'name': 'Research Peptides'}],
+        'variations': [{'id': variation_id, 'attributes': [{'name': 'Size', 'value': f'{5 * (k + 1)}mg'}]}
+                       for k, variation_id in enumerate(variations)]
+    }
+
+
+def variation_price(variation_id: int) -> str:
+    """17.99 for the first size of a product, 27.99 for the second"""
+    return str(1799 + variation_id % 10 * 1000)
+
+
+class StandInStoreHandler(BaseHTTPRequestHandler):
+    """Store API, sitemaps and fixture product pages"""
+
+    throttled: set = set()
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.headers.get('Host')}"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        throttle_key = next((key for key in THROTTLED_ONCE if key in self.path), None)
+        if throttle_key and throttle_key not in self.throttled:
+            self.throttled.add(throttle_key)
+            self.send_body(429, b'', 'text/plain', {'Retry-After': '1'})
+            return
+
+        if url.path == STORE_API_PATH:
+            if query.get('type') == ['variation']:
+                ids = [int(variation_id) for variation_id in query['include'][0].split(',')]
+                self.send_json([{'id': variation_id, 'type': 'variation', 'sku': f'V{variation_id}',
+                                 'is_in_stock': True,
+                                 'prices': {'price': variation_price(variation_id), 'currency_minor_unit': 2}}
+                                for variation_id in ids])
+                return
+            page = int(query.get('page', ['1'])[0])
+            per_page = int(query.get('per_page', ['10'])[0])
+            ids = range((page - 1) * per_page + 1, min(page * per_page, PRODUCT_COUNT) + 1)
+            self.send_json([store_product(product_id, self.base_url) for product_id in ids], {
+                'X-WP-Total': str(PRODUCT_COUNT),
+                'X-WP-TotalPages': str((PRODUCT_COUNT + per_page - 1) // per_page)
+            })
+        elif url.path.startswith(f'{STORE_API_PATH}/'):
+            product_id = int(url.path.rsplit('/', 1)[1])
+            product = store_product(product_id, self.base_url)
+            if product_id == AJAX_PRODUCT_ID:
+                product['variations'] = [{'id': 3110 + k, 'attributes': [{'name': 'Size', 'value': f'{5 * (k + 1)}mg'}]}
+                                         for k in range(2)]
+            self.send_json(product)
+        elif url.path == '/wp-sitemap.xml':
+            self.send_xml('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                          f'<sitemap><loc>{self.base_url}/wp-sitemap-posts-product-1.xml</loc></sitemap>'
+                          f'<sitemap><loc>{self.base_url}/wp-sitemap-posts-page-1.xml</loc></sitemap>'
+                          '</sitemapindex>')
+        elif url.path == '/wp-sitemap-posts-product-1.xml':
+            self.send_xml('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                          + ''.join(f'<url><loc>{self.base_url}{path}</loc></url>' for path in PRODUCT_PAGES)
+                          + '</urlset>')
+        elif url.path in PRODUCT_PAGES:
+            self.send_body(200, (FIXTURES_DIR / PRODUCT_PAGES[url.path]).read_bytes(), 'text/html; charset=utf-8')
+        else:
+            self.send_body(404, b'', 'text/plain')
+
+    def send_json(self, body, headers: Optional[Dict[str, str]] = None):
+        self.send_body(200, json.dumps(body).encode(), 'application/json', headers)
+
+    def send_xml(self, body: str):
+        self.send_body(200, f'<?xml version="1.0" encoding="UTF-8"?>{body}'.encode(), 'application/xml')
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Serve a stand-in WooCommerce store for scraper integration runs')
+    parser.add_argument('--port', type=int, default=8766, help='Port to listen on (default: 8766)')
+    return parser.parse_args(argv)
+
+
+def main(args: Optional[argparse.Namespace] = None):
+    """Serve until interrupted"""
+    args = args or parse_args([])
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StandInStoreHandler)
+    print(f"Stand-in store on http://127.0.0.1:{args.port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -9,10 +9,153 @@ from pathlib import Path
 from typing import Dict, List
 from datetime import datetime
 
+from keyword_matcher import KeywordMatcher
+from pricing import format_cents
+
 
 class DescriptionGenerator:
     """Generate enhanced SEO descriptions for peptide products"""
 
+    PEPTIDE_DATABASE = {
+        'BPC-157': {
+            'class': 'gastric pentadecapeptide',
+            'overview': 'BPC-157 stands for Body Protection Compound-157, a synthetic peptide consisting of 15 amino acids derived from a protective protein found in human gastric juice.',
+            'scientific_background': """BPC-157 (Body Protection Compound-157) is a synthetic pentadecapeptide with the sequence Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val. Originally isolated from gastric juice, this stable gastric pentadecapeptide has demonstrated remarkable stability in human gastric juice and maintains its structure even in the harsh acidic environment of the stomach.
+
+Research has shown that BPC-157 exhibits cytoprotective and anti-ulcer activity, with studies exploring its potential mechanisms involving the nitric oxide (NO) system, prostaglandin system, and growth factor modulation. The peptide has been studied for its effects on angiogenesis, with research indicating it may influence VEGF expression and blood vessel formation.""",
+            'research_applications': """- Tissue repair and wound healing studies
+- Angiogenesis and vascular research
+- Gastrointestinal protection investigations
+- Musculoskeletal injury models
+- Tendon and ligament healing protocols
+- Inflammatory response modulation
+- Gut-brain axis research
+- Cellular migration studies""",
+            'molecular_formula': 'C₆₂H₉₈N₁₆O₂₂',
+            'molecular_weight': '1419.53 g/mol',
+            'cas_number': '137525-51-0',
+            'sequence': 'Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val',
+            'reconstitution_concentration': '1-2 mg/mL',
+            'stability_lyophilized': '36 months at -20°C',
+            'stability_reconstituted': '4-6 weeks at 2-8°C',
+            'stability_working': '7 days at 2-8°C',
+            'related_peptides': """- TB-500 (Thymosin Beta-4) - Complementary tissue repair research
+- GHK-Cu (Copper Peptide) - Tissue remodeling studies
+- Thymosin Alpha-1 - Immune modulation research""",
+            'keywords': ['pentadecapeptide', 'gastric peptide', 'tissue repair', 'angiogenesis', 'wound healing research']
+        },
+        'GHK-Cu': {
+            'class': 'copper-binding tripeptide complex',
+            'overview': 'GHK-Cu is a naturally occurring copper complex of the tripeptide Gly-His-Lys, first isolated from human plasma and later found in saliva and urine.',
+            'scientific_background': """GHK-Cu (Glycyl-L-Histidyl-L-Lysine-Copper(II)) is a naturally occurring copper complex that was first isolated from human plasma by Pickart and Thaler in 1973. The tripeptide has a strong affinity for copper(II), with a binding constant of 10^16 M^-1 at physiological pH.
+
+The copper-peptide complex has been extensively studied for its role in tissue remodeling, with research showing it can modulate the expression of genes involved in the extracellular matrix remodeling process. Studies indicate GHK-Cu influences the activity of metalloproteinases and their inhibitors (TIMPs), as well as stimulating collagen synthesis.""",
+            'research_applications': """- Collagen synthesis and skin aging research
+- Wound healing acceleration studies
+- Hair follicle research and growth studies
+- Antioxidant enzyme expression
+- Extracellular matrix remodeling
+- Anti-inflammatory pathway investigation
+- Stem cell differentiation research
+- Neuroprotection studies""",
+            'molecular_formula': 'C₁₄H₂₄N₆O₄·Cu',
+            'molecular_weight': '403.93 g/mol',
+            'cas_number': '49557-75-7',
+            'sequence': 'Gly-His-Lys',
+            'reconstitution_concentration': '1-5 mg/mL',
+            'stability_lyophilized': '24 months at -20°C',
+            'stability_reconstituted': '2-4 weeks at 2-8°C',
+            'stability_working': '48-72 hours at 2-8°C',
+            'related_peptides': """- Matrixyl (Palmitoyl Pentapeptide) - Collagen synthesis research
+- Argireline (Acetyl Hexapeptide) - Neuromuscular research
+- BPC-157 - Tissue repair studies""",
+            'keywords': ['copper peptide', 'tripeptide', 'collagen', 'tissue remodeling', 'skin research']
+        },
+        'Tesamorelin': {
+            'class': 'synthetic growth hormone-releasing hormone (GHRH) analog',
+            'overview': 'Tesamorelin is a synthetic peptide consisting of 44 amino acids, designed as a stabilized analog of human growth hormone-releasing hormone.',
+            'scientific_background': """Tesamorelin is a synthetic analog of human growth hormone-releasing hormone (GHRH), also known as growth hormone-releasing factor (GRF). It consists of the 44 amino acid sequence of human GHRH with a trans-3-hexenoic acid group modification at the N-terminus, which increases stability and half-life.
+
+The peptide acts as a GHRH receptor agonist, stimulating the synthesis and pulsatile release of growth hormone from the anterior pituitary. Research has focused on its effects on growth hormone secretion patterns and subsequent IGF-1 production.""",
+            'research_applications': """- Growth hormone secretion studies
+- Pituitary function research
+- Metabolic regulation investigations
+- Body composition studies
+- Lipodystrophy research
+- Aging and hormone decline studies
+- IGF-1 pathway research
+- Hypothalamic-pituitary axis studies""",
+            'molecular_formula': 'C₂₂₁H₃₆₆N₇₂O₆₇S',
+            'molecular_weight': '5135.89 g/mol',
+            'cas_number': '218949-48-5',
+            'sequence': 'Modified 44-amino acid sequence',
+            'reconstitution_concentration': '1-2 mg/mL',
+            'stability_lyophilized': '24 months at -20°C',
+            'stability_reconstituted': '14 days at 2-8°C',
+            'stability_working': '24 hours at room temperature',
+            'related_peptides': """- CJC-1295 - Extended GHRH analog research
+- Sermorelin - GHRH fragment studies
+- Ipamorelin - Growth hormone secretagogue research""",
+            'keywords': ['GHRH analog', 'growth hormone', 'pituitary', 'IGF-1', 'metabolic research']
+        },
+        'GLP': {  # For GLP-2 and GLP-3
+            'class': 'glucagon-like peptide analog',
+            'overview': 'GLP peptides are incretin hormones derived from proglucagon, playing crucial roles in glucose homeostasis and intestinal function.',
+            'scientific_background': """Glucagon-like peptides (GLPs) are a family of incretin hormones derived from the post-translational processing of proglucagon. These peptides play crucial roles in glucose homeostasis, insulin secretion, and gastrointestinal function.
+
+GLP receptor agonists have been extensively studied for their effects on glucose-dependent insulin secretion, glucagon suppression, gastric emptying, and satiety signaling. Research has explored their potential in metabolic regulation and cellular proliferation pathways.""",
+            'research_applications': """- Glucose metabolism research
+- Insulin secretion studies
+- Intestinal growth and repair
+- Appetite regulation research
+- Metabolic syndrome investigations
+- Diabetes research models
+- Gut hormone signaling
+- Neuroprotection studies""",
+            'molecular_formula': 'Variable by specific analog',
+            'molecular_weight': 'See specific product COA',
+            'cas_number': 'Compound-specific',
+            'sequence': 'Modified GLP sequence',
+            'reconstitution_concentration': '0.5-1 mg/mL',
+            'stability_lyophilized': '24 months at -20°C',
+            'stability_reconstituted': '7-14 days at 2-8°C',
+            'stability_working': '24 hours at 2-8°C',
+            'related_peptides': """- Exenatide - GLP-1 receptor agonist research
+- Liraglutide - Long-acting GLP-1 analog
+- GIP - Glucose-dependent insulinotropic peptide""",
+            'keywords': ['incretin', 'glucose metabolism', 'insulin', 'diabetes research', 'gut hormone']
+        },
+        'NAD+': {
+            'class': 'essential coenzyme',
+            'overview': 'NAD+ (Nicotinamide Adenine Dinucleotide) is a critical coenzyme found in all living cells, essential for energy metabolism and cellular processes.',
+            'scientific_background': """NAD+ (Nicotinamide Adenine Dinucleotide) is a fundamental coenzyme present in all living cells, playing crucial roles in metabolism, energy production, and cellular signaling. It exists in two forms: NAD+ (oxidized) and NADH (reduced), functioning as an electron carrier in redox reactions.
+
+NAD+ serves as a substrate for several important enzymes including sirtuins (SIRT1-7), poly(ADP-ribose) polymerases (PARPs), and cyclic ADP-ribose synthases. Research has focused on NAD+ decline with age and its role in cellular senescence, DNA repair, and metabolic homeostasis.""",
+            'research_applications': """- Cellular metabolism studies
+- Aging and longevity research
+- Sirtuin activation studies
+- Mitochondrial function research
+- DNA repair mechanisms
+- Circadian rhythm studies
+- Neuroprotection research
+- Metabolic disease models""",
+            'molecular_formula': 'C₂₁H₂₇N₇O₁₄P₂',
+            'molecular_weight': '663.43 g/mol',
+            'cas_number': '53-84-9',
+            'sequence': 'Not applicable (coenzyme)',
+            'reconstitution_concentration': '10-50 mg/mL',
+            'stability_lyophilized': '24 months at -20°C',
+            'stability_reconstituted': '7 days at 2-8°C',
+            'stability_working': 'Use immediately after preparation',
+            'related_peptides': """- NMN (Nicotinamide Mononucleotide) - NAD+ precursor
+- NR (Nicotinamide Riboside) - NAD+ precursor
+- Resveratrol - Sirtuin activation research""",
+            'keywords': ['coenzyme', 'metabolism', 'aging', 'sirtuin', 'mitochondria', 'cellular energy']
+        }
+    }
+
+    KEYWORDS = KeywordMatcher().add_table('peptide', PEPTIDE_DATABASE.items())
+
     def __init__(self):
         self.enhanced_products = []
 
@@ -122,148 +265,10 @@ This product is intended for research use only. Researchers are encouraged to re
     def get_peptide_info(self, name: str) -> Dict:
         """Get peptide-specific information"""
 
-        peptide_database = {
-            'BPC-157': {
-                'class': 'gastric pentadecapeptide',
-                'overview': 'BPC-157 stands for Body Protection Compound-157, a synthetic peptide consisting of 15 amino acids derived from a protective protein found in human gastric juice.',
-                'scientific_background': """BPC-157 (Body Protection Compound-157) is a synthetic pentadecapeptide with the sequence Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val. Originally isolated from gastric juice, this stable gastric pentadecapeptide has demonstrated remarkable stability in human gastric juice and maintains its structure even in the harsh acidic environment of the stomach.
-
-Research has shown that BPC-157 exhibits cytoprotective and anti-ulcer activity, with studies exploring its potential mechanisms involving the nitric oxide (NO) system, prostaglandin system, and growth factor modulation. The peptide has been studied for its effects on angiogenesis, with research indicating it may influence VEGF expression and blood vessel formation.""",
-                'research_applications': """- Tissue repair and wound healing studies
-- Angiogenesis and vascular research
-- Gastrointestinal protection investigations
-- Musculoskeletal injury models
-- Tendon and ligament healing protocols
-- Inflammatory response modulation
-- Gut-brain axis research
-- Cellular migration studies""",
-                'molecular_formula': 'C₆₂H₉₈N₁₆O₂₂',
-                'molecular_weight': '1419.53 g/mol',
-                'cas_number': '137525-51-0',
-                'sequence': 'Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val',
-                'reconstitution_concentration': '1-2 mg/mL',
-                'stability_lyophilized': '36 months at -20°C',
-                'stability_reconstituted': '4-6 weeks at 2-8°C',
-                'stability_working': '7 days at 2-8°C',
-                'related_peptides': """- TB-500 (Thymosin Beta-4) - Complementary tissue repair research
-- GHK-Cu (Copper Peptide) - Tissue remodeling studies
-- Thymosin Alpha-1 - Immune modulation research""",
-                'keywords': ['pentadecapeptide', 'gastric peptide', 'tissue repair', 'angiogenesis', 'wound healing research']
-            },
-            'GHK-Cu': {
-                'class': 'copper-binding tripeptide complex',
-                'overview': 'GHK-Cu is a naturally occurring copper complex of the tripeptide Gly-His-Lys, first isolated from human plasma and later found in saliva and urine.',
-                'scientific_background': """GHK-Cu (Glycyl-L-Histidyl-L-Lysine-Copper(II)) is a naturally occurring copper complex that was first isolated from human plasma by Pickart and Thaler in 1973. The tripeptide has a strong affinity for copper(II), with a binding constant of 10^16 M^-1 at physiological pH.
-
-The copper-peptide complex has been extensively studied for its role in tissue remodeling, with research showing it can modulate the expression of genes involved in the extracellular matrix remodeling process. Studies indicate GHK-Cu influences the activity of metalloproteinases and their inhibitors (TIMPs), as well as stimulating collagen synthesis.""",
-                'research_applications': """- Collagen synthesis and skin aging research
-- Wound healing acceleration studies
-- Hair follicle research and growth studies
-- Antioxidant enzyme expression
-- Extracellular matrix remodeling
-- Anti-inflammatory pathway investigation
-- Stem cell differentiation research
-- Neuroprotection studies""",
-                'molecular_formula': 'C₁₄H₂₄N₆O₄·Cu',
-                'molecular_weight': '403.93 g/mol',
-                'cas_number': '49557-75-7',
-                'sequence': 'Gly-His-Lys',
-                'reconstitution_concentration': '1-5 mg/mL',
-                'stability_lyophilized': '24 months at -20°C',
-                'stability_reconstituted': '2-4 weeks at 2-8°C',
-                'stability_working': '48-72 hours at 2-8°C',
-                'related_peptides': """- Matrixyl (Palmitoyl Pentapeptide) - Collagen synthesis research
-- Argireline (Acetyl Hexapeptide) - Neuromuscular research
-- BPC-157 - Tissue repair studies""",
-                'keywords': ['copper peptide', 'tripeptide', 'collagen', 'tissue remodeling', 'skin research']
-            },
-            'Tesamorelin': {
-                'class': 'synthetic growth hormone-releasing hormone (GHRH) analog',
-                'overview': 'Tesamorelin is a synthetic peptide consisting of 44 amino acids, designed as a stabilized analog of human growth hormone-releasing hormone.',
-                'scientific_background': """Tesamorelin is a synthetic analog of human growth hormone-releasing hormone (GHRH), also known as growth hormone-releasing factor (GRF). It consists of the 44 amino acid sequence of human GHRH with a trans-3-hexenoic acid group modification at the N-terminus, which increases stability and half-life.
-
-The peptide acts as a GHRH receptor agonist, stimulating the synthesis and pulsatile release of growth hormone from the anterior pituitary. Research has focused on its effects on growth hormone secretion patterns and subsequent IGF-1 production.""",
-                'research_applications': """- Growth hormone secretion studies
-- Pituitary function research
-- Metabolic regulation investigations
-- Body composition studies
-- Lipodystrophy research
-- Aging and hormone decline studies
-- IGF-1 pathway research
-- Hypothalamic-pituitary axis studies""",
-                'molecular_formula': 'C₂₂₁H₃₆₆N₇₂O₆₇S',
-                'molecular_weight': '5135.89 g/mol',
-                'cas_number': '218949-48-5',
-                'sequence': 'Modified 44-amino acid sequence',
-                'reconstitution_concentration': '1-2 mg/mL',
-                'stability_lyophilized': '24 months at -20°C',
-                'stability_reconstituted': '14 days at 2-8°C',
-                'stability_working': '24 hours at room temperature',
-                'related_peptides': """- CJC-1295 - Extended GHRH analog research
-- Sermorelin - GHRH fragment studies
-- Ipamorelin - Growth hormone secretagogue research""",
-                'keywords': ['GHRH analog', 'growth hormone', 'pituitary', 'IGF-1', 'metabolic research']
-            },
-            'GLP': {  # For GLP-2 and GLP-3
-                'class': 'glucagon-like peptide analog',
-                'overview': 'GLP peptides are incretin hormones derived from proglucagon, playing crucial roles in glucose homeostasis and intestinal function.',
-                'scientific_background': """Glucagon-like peptides (GLPs) are a family of incretin hormones derived from the post-translational processing of proglucagon. These peptides play crucial roles in glucose homeostasis, insulin secretion, and gastrointestinal function.
-
-GLP receptor agonists have been extensively studied for their effects on glucose-dependent insulin secretion, glucagon suppression, gastric emptying, and satiety signaling. Research has explored their potential in metabolic regulation and cellular proliferation pathways.""",
-                'research_applications': """- Glucose metabolism research
-- Insulin secretion studies
-- Intestinal growth and repair
-- Appetite regulation research
-- Metabolic syndrome investigations
-- Diabetes research models
-- Gut hormone signaling
-- Neuroprotection studies""",
-                'molecular_formula': 'Variable by specific analog',
-                'molecular_weight': 'See specific product COA',
-                'cas_number': 'Compound-specific',
-                'sequence': 'Modified GLP sequence',
-                'reconstitution_concentration': '0.5-1 mg/mL',
-                'stability_lyophilized': '24 months at -20°C',
-                'stability_reconstituted': '7-14 days at 2-8°C',
-                'stability_working': '24 hours at 2-8°C',
-                'related_peptides': """- Exenatide - GLP-1 receptor agonist research
-- Liraglutide - Long-acting GLP-1 analog
-- GIP - Glucose-dependent insulinotropic peptide""",
-                'keywords': ['incretin', 'glucose metabolism', 'insulin', 'diabetes research', 'gut hormone']
-            },
-            'NAD+': {
-                'class': 'essential coenzyme',
-                'overview': 'NAD+ (Nicotinamide Adenine Dinucleotide) is a critical coenzyme found in all living cells, essential for energy metabolism and cellular processes.',
-                'scientific_background': """NAD+ (Nicotinamide Adenine Dinucleotide) is a fundamental coenzyme present in all living cells, playing crucial roles in metabolism, energy production, and cellular signaling. It exists in two forms: NAD+ (oxidized) and NADH (reduced), functioning as an electron carrier in redox reactions.
-
-NAD+ serves as a substrate for several important enzymes including sirtuins (SIRT1-7), poly(ADP-ribose) polymerases (PARPs), and cyclic ADP-ribose synthases. Research has focused on NAD+ decline with age and its role in cellular senescence, DNA repair, and metabolic homeostasis.""",
-                'research_applications': """- Cellular metabolism studies
-- Aging and longevity research
-- Sirtuin activation studies
-- Mitochondrial function research
-- DNA repair mechanisms
-- Circadian rhythm studies
-- Neuroprotection research
-- Metabolic disease models""",
-                'molecular_formula': 'C₂₁H₂₇N₇O₁₄P₂',
-                'molecular_weight': '663.43 g/mol',
-                'cas_number': '53-84-9',
-                'sequence': 'Not applicable (coenzyme)',
-                'reconstitution_concentration': '10-50 mg/mL',
-                'stability_lyophilized': '24 months at -20°C',
-                'stability_reconstituted': '7 days at 2-8°C',
-                'stability_working': 'Use immediately after preparation',
-                'related_peptides': """- NMN (Nicotinamide Mononucleotide) - NAD+ precursor
-- NR (Nicotinamide Riboside) - NAD+ precursor
-- Resveratrol - Sirtuin activation research""",
-                'keywords': ['coenzyme', 'metabolism', 'aging', 'sirtuin', 'mitochondria', 'cellular energy']
-            }
-        }
-
         # Match peptide name
-        for key, info in peptide_database.items():
-            if key.lower() in name.lower():
-                return info
+        info = self.KEYWORDS.first(name, 'peptide')
+        if info:
+            return info
 
         # Default info for unknown peptides
         return {
@@ -292,9 +297,9 @@ NAD+ serves as a substrate for several important enzymes including sirtuins (SIR
         for variant in variants:
             size = variant.get('title', 'Standard')
             sku = variant.get('sku', 'N/A')
-            price = variant.get('prices', [{}])[0].get('amount', 0) / 100
+            price = format_cents(variant.get('prices', [{}])[0].get('amount', 0))
             stock = "In Stock" if variant.get('inventory_quantity', 0) > 0 else "Out of Stock"
-            lines.append(f"- **{size}** (SKU: {sku}) - ${price:.2f} - {stock}")
+            lines.append(f"- **{size}** (SKU: {sku}) - {price} - {stock}")
 
         return '\n'.join(lines)
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Host Throttle
+Per-host politeness and adaptive concurrency shared by the scraper and the image
+downloader, plus the congestion and Retry-After rules both back off by
+"""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class RetryableError(Exception):
+    """The origin pushed back (429/5xx or a timeout); retry later, honouring Retry-After when given"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_congested(status: int) -> bool:
+    """Responses that mean the origin wants us to slow down"""
+    return status == 429 or status >= 500
+
+
+def parse_retry_after(headers: Dict[str, str]) -> Optional[float]:
+    """Seconds requested by a Retry-After header (delta-seconds form only)"""
+    value = (headers or {}).get('retry-after', '')
+    return float(value) if value.strip().isdigit() else None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float], base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+    delay = random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class AdaptiveLimit:
+    """AIMD in-flight limit: one more slot per healthy window, halved on congestion"""
+
+    # Latency above this multiple of the baseline means requests are queueing at the origin
+    LATENCY_TOLERANCE = 2.0
+    # Ignore further congestion signals right after a decrease; they describe the old limit
+    DECREASE_COOLDOWN = 2.0
+
+    def __init__(self, initial: int, ceiling: int):
+        self.ceiling = max(1, ceiling)
+        self.limit = min(max(1, initial), self.ceiling)
+        self.in_flight = 0
+        self.successes = 0
+        self.baseline: Optional[float] = None
+        self.last_decrease = float('-inf')
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        """Wait for a free slot under the current limit"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    async def release(self):
+        """Return a slot and wake waiters that may now fit under the limit"""
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency: float):
+        """Additive increase once a full window of requests completed at healthy latency"""
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Let the baseline follow slow drifts in origin speed
+            self.baseline += (latency - self.baseline) * 0.05
+        if latency > self.baseline * self.LATENCY_TOLERANCE:
+            self.successes = 0
+            return
+        self.successes += 1
+        if self.successes >= self.limit and self.limit < self.ceiling:
+            self.limit += 1
+            self.successes = 0
+
+    def on_congestion(self, now: float) -> bool:
+        """Multiplicative decrease; returns False while still cooling down from the last one"""
+        if now - self.last_decrease < self.DECREASE_COOLDOWN:
+            return False
+        self.limit = max(1, self.limit // 2)
+        self.successes = 0
+        self.last_decrease = now
+        return True
+
+
+class HostThrottle:
+    """Per-host politeness budget: caps in-flight requests and spaces out request starts"""
+
+    def __init__(self, max_in_flight: int = 2, min_interval: float = 0.5, adaptive_ceiling: Optional[int] = None):
+        self.max_in_flight = max(1, max_in_flight)
+        self.min_interval = max(0.0, min_interval)
+        self.adaptive_ceiling = adaptive_ceiling
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._limits: Dict[str, AdaptiveLimit] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._last_start: Dict[str, float] = {}
+        self._paused_until: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's request slots for the duration of the block"""
+        host = urlparse(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+
+        if self.adaptive_ceiling:
+            limit = self._limits.setdefault(host, AdaptiveLimit(self.max_in_flight, self.adaptive_ceiling))
+            await limit.acquire()
+            try:
+                await self._space_start(host, lock)
+                yield
+            finally:
+                await limit.release()
+            return
+
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_in_flight))
+        async with semaphore:
+            await self._space_start(host, lock)
+            yield
+
+    async def _space_start(self, host: str, lock: asyncio.Lock):
+        """Honour the minimum interval between starts and any Retry-After pause"""
+        async with lock:
+            loop = asyncio.get_running_loop()
+            start_at = max(self._last_start.get(host, 0.0) + self.min_interval, self._paused_until.get(host, 0.0))
+            wait = start_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._last_start[host] = loop.time()
+
+    def record(self, url: str, latency: Optional[float] = None, congested: bool = False,
+               retry_after: Optional[float] = None):
+        """Feed a request outcome back into the host's adaptive limit"""
+        host = urlparse(url).netloc
+        now = asyncio.get_running_loop().time()
+        if retry_after:
+            self._paused_until[host] = max(self._paused_until.get(host, 0.0), now + retry_after)
+        limit = self._limits.get(host)
+        if not limit:
+            return
+        if congested:
+            if limit.on_congestion(now):
+                print(f"  ↓ {host}: backing off to {limit.limit} in flight")
+        elif latency is not None:
+            before = limit.limit
+            limit.on_success(latency)
+            if limit.limit > before:
+                print(f"  ↑ {host}: raising to {limit.limit} in flight")
+
+    def limits(self) -> Dict[str, int]:
+        """Current adaptive limit per host"""
+        return {host: limit.limit for host, limit in self._limits.items()}
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Keyword Matcher
+Aho-Corasick automaton shared by the pipeline scripts for case-insensitive
+substring lookups against keyword tables (categories, tags, subtitles, peptides)
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class KeywordMatcher:
+    """Find every keyword of every registered table in a text with one pass over its characters
+
+    Each table keeps the priority of its entries (their registration order), so
+    lookups can reproduce "first matching key wins" and "all matching keys, in
+    table order" over plain dicts of keywords.
+    """
+
+    CACHE_SIZE = 4096
+
+    def __init__(self):
+        self.transitions: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[Tuple[str, int, Any]]] = [[]]
+        self.table_sizes: Dict[str, int] = {}
+        self.built = False
+        # Names are looked up once per table, so repeated scans of the same string are cached
+        self.scan = lru_cache(maxsize=self.CACHE_SIZE)(self._scan)
+
+    def add_table(self, table: str, entries: Iterable[Tuple[str, Any]]) -> 'KeywordMatcher':
+        """Register (keyword, value) pairs under a table name; earlier entries have higher priority"""
+        priority = self.table_sizes.get(table, 0)
+        for keyword, value in entries:
+            self._insert(keyword.lower(), (table, priority, value))
+            priority += 1
+        self.table_sizes[table] = priority
+        self.built = False
+        self.scan.cache_clear()
+        return self
+
+    def _insert(self, keyword: str, output: Tuple[str, int, Any]):
+        """Add one keyword path to the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append(output)
+
+    def build(self):
+        """Compute failure links breadth-first and fold suffix matches into each state's outputs"""
+        queue = deque()
+        for state in self.transitions[0].values():
+            self.fail[state] = 0
+            queue.append(state)
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+        self.built = True
+
+    def _scan(self, text: str) -> Dict[str, Tuple[Any, ...]]:
+        """Matched values per table, ordered by priority and without duplicates"""
+        if not self.built:
+            self.build()
+        hits: Dict[str, Dict[int, Any]] = {}
+        state = 0
+        for char in text.lower():
+            while state and char not in self.transitions[state]:
+                state = self.fail[state]
+            state = self.transitions[state].get(char, 0)
+            for table, priority, value in self.outputs[state]:
+                hits.setdefault(table, {})[priority] = value
+
+        matches = {}
+        for table, found in hits.items():
+            values = []
+            for priority in sorted(found):
+                if found[priority] not in values:
+                    values.append(found[priority])
+            matches[table] = tuple(values)
+        return matches
+
+    def all(self, text: str, table: str) -> Tuple[Any, ...]:
+        """Values of every keyword of a table found in the text, in table order"""
+        return self.scan(text).get(table, ())
+
+    def first(self, text: str, table: str, default: Optional[Any] = None) -> Any:
+        """Value of the highest-priority keyword of a table found in the text"""
+        values = self.all(text, table)
+        return values[0] if values else default
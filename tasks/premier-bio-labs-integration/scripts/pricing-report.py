@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Catalog Pricing Report
+Price ranges and inventory rollups for every transformed product, computed in
+batch over a columnar view of the catalog's variants
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from pricing import VariantColumns, format_cents
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+
+def load_products(path: Path) -> Iterator[Dict]:
+    """Read transformed products from a JSON array or a JSONL file"""
+    with open(path, 'r') as f:
+        if path.suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(f)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Report prices and inventory across the transformed catalog')
+    parser.add_argument('--input', default=str(DATA_DIR / 'transformed-products.json'),
+                        help='Transformed products, as a JSON array or JSONL (default: transformed-products.json)')
+    parser.add_argument('--output', default=str(DATA_DIR / 'pricing-report.json'),
+                        help='Where to write the report (default: data/pricing-report.json)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Most expensive products to list (default: 10)')
+    return parser.parse_args(argv)
+
+
+def main(args: Optional[argparse.Namespace] = None) -> Dict:
+    """Build and print the pricing report"""
+    args = args or parse_args([])
+    started = time.perf_counter()
+    columns = VariantColumns.from_products(load_products(Path(args.input)))
+    report = columns.report()
+    elapsed = time.perf_counter() - started
+
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    prices = report['price_cents']
+    print("\n💲 Pricing Report:")
+    print("-" * 50)
+    print(f"  Products: {report['products']}, variants: {report['variants']} "
+          f"({'NumPy' if columns.vectorized else 'pure Python'}, {elapsed:.2f}s)")
+    if prices['min'] is not None:
+        print(f"  Prices: {format_cents(prices['min'])} - {format_cents(prices['max'])}, "
+              f"median {format_cents(prices['median'])}")
+    print(f"  Inventory: {report['inventory_units']} units worth {format_cents(report['inventory_value_cents'])}, "
+          f"{report['out_of_stock_variants']} variants out of stock")
+
+    ranked = sorted((row for row in report['product_prices'] if row['max_cents'] is not None),
+                    key=lambda row: row['max_cents'], reverse=True)[:args.top]
+    if ranked:
+        print(f"\n  Top {len(ranked)} by price:")
+        for row in ranked:
+            print(f"    {row['handle']}: {format_cents(row['min_cents'])} - {format_cents(row['max_cents'])}")
+
+    print(f"\n✅ Saved pricing report to {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    main(parse_args())
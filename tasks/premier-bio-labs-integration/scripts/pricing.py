@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Pricing
+Exact dollar/cent conversion and a columnar view of catalog variants for batch
+price and inventory math, vectorized with NumPy when it is installed
+"""
+
+import statistics
+from array import array
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # Optional: columns fall back to array.array and plain loops
+    np = None
+
+
+def to_cents(price: Any) -> int:
+    """Dollars to integer cents, rounding the decimal value rather than its binary float (19.99 -> 1999)"""
+    # str() gives the shortest repr of a float, i.e. the price as it was written
+    return int((Decimal(str(price)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def format_cents(amount: Any) -> str:
+    """Integer cents as a dollar string, without going through float division"""
+    cents = int(round(amount))
+    sign = '-' if cents < 0 else ''
+    return f"{sign}${abs(cents) // 100}.{abs(cents) % 100:02d}"
+
+
+def variant_rows(product: Any) -> Iterable[Tuple[int, int]]:
+    """(amount in cents, inventory quantity) of each variant of a product record or dict"""
+    if isinstance(product, dict):
+        for variant in product.get('variants', []):
+            yield (variant.get('prices', [{}])[0].get('amount', 0), variant.get('inventory_quantity', 0))
+    else:
+        for variant in product.variants:
+            yield variant.amount, variant.inventory_quantity
+
+
+class VariantColumns:
+    """Every variant of a catalog as parallel columns, with offsets marking each product's rows"""
+
+    def __init__(self, handles: List[str], offsets: array, amounts: array, inventory: array):
+        self.handles = handles
+        if np is not None:
+            self.offsets = np.asarray(offsets, dtype=np.int64)
+            self.amounts = np.asarray(amounts, dtype=np.int64)
+            self.inventory = np.asarray(inventory, dtype=np.int64)
+        else:
+            self.offsets, self.amounts, self.inventory = offsets, amounts, inventory
+
+    @classmethod
+    def from_products(cls, products: Iterable[Any]) -> 'VariantColumns':
+        """Build the columns in one pass over product records or dicts"""
+        handles = []
+        offsets, amounts, inventory = array('q', [0]), array('q'), array('q')
+        for product in products:
+            handles.append(product['handle'] if isinstance(product, dict) else product.handle)
+            for amount, quantity in variant_rows(product):
+                amounts.append(amount)
+                inventory.append(quantity)
+            offsets.append(len(amounts))
+        return cls(handles, offsets, amounts, inventory)
+
+    @property
+    def vectorized(self) -> bool:
+        """Whether NumPy backs the columns"""
+        return np is not None
+
+    def __len__(self) -> int:
+        return len(self.handles)
+
+    def variant_counts(self) -> List[int]:
+        """Number of variants per product"""
+        if np is not None:
+            return np.diff(self.offsets).tolist()
+        return [self.offsets[i + 1] - self.offsets[i] for i in range(len(self))]
+
+    def _reduce(self, ufunc, values, empty: Optional[int]) -> List[Optional[int]]:
+        """Apply a NumPy reduction to each product's rows; products without variants get ``empty``"""
+        starts = self.offsets[:-1]
+        has_rows = np.diff(self.offsets) > 0
+        result: List[Optional[int]] = [empty] * len(self)
+        if has_rows.any():
+            # Empty products share their start with the next product, so dropping them keeps segments intact
+            reduced = ufunc.reduceat(values, starts[has_rows]).tolist()
+            for index, value in zip(np.flatnonzero(has_rows).tolist(), reduced):
+                result[index] = value
+        return result
+
+    def _segments(self) -> Iterable[Tuple[int, int]]:
+        """(start, end) row range of each product"""
+        return ((self.offsets[i], self.offsets[i + 1]) for i in range(len(self)))
+
+    def price_ranges(self) -> Tuple[List[Optional[int]], List[Optional[int]]]:
+        """Lowest and highest variant price of each product, in cents (None without variants)"""
+        if np is not None:
+            return (self._reduce(np.minimum, self.amounts, None),
+                    self._reduce(np.maximum, self.amounts, None))
+        lows, highs = [], []
+        for start, end in self._segments():
+            prices = self.amounts[start:end]
+            lows.append(min(prices) if prices else None)
+            highs.append(max(prices) if prices else None)
+        return lows, highs
+
+    def inventory_totals(self) -> List[int]:
+        """Units in stock per product"""
+        if np is not None:
+            return self._reduce(np.add, self.inventory, 0)
+        return [sum(self.inventory[start:end]) for start, end in self._segments()]
+
+    def in_stock_counts(self) -> List[int]:
+        """Variants with stock per product"""
+        if np is not None:
+            return self._reduce(np.add, (self.inventory > 0).astype(np.int64), 0)
+        return [sum(1 for quantity in self.inventory[start:end] if quantity > 0) for start, end in self._segments()]
+
+    def report(self) -> Dict[str, Any]:
+        """Catalog-wide price distribution and inventory rollups, plus per-product ranges"""
+        lows, highs = self.price_ranges()
+        counts = self.variant_counts()
+        in_stock = self.in_stock_counts()
+        units = self.inventory_totals()
+
+        if np is not None:
+            has_variants = len(self.amounts) > 0
+            prices = {
+                'min': int(self.amounts.min()) if has_variants else None,
+                'median': float(np.median(self.amounts)) if has_variants else None,
+                'max': int(self.amounts.max()) if has_variants else None
+            }
+            inventory_value = int(np.dot(self.amounts, self.inventory))
+            out_of_stock = int((self.inventory <= 0).sum())
+        else:
+            amounts = self.amounts
+            prices = {
+                'min': min(amounts) if amounts else None,
+                'median': float(statistics.median(amounts)) if amounts else None,
+                'max': max(amounts) if amounts else None
+            }
+            inventory_value = sum(amount * quantity for amount, quantity in zip(amounts, self.inventory))
+            out_of_stock = sum(1 for quantity in self.inventory if quantity <= 0)
+
+        return {
+            'products': len(self),
+            'variants': len(self.amounts),
+            'price_cents': prices,
+            'inventory_units': sum(units),
+            'inventory_value_cents': inventory_value,
+            'out_of_stock_variants': out_of_stock,
+            'product_prices': [
+                {'handle': handle, 'min_cents': low, 'max_cents': high, 'variants': count,
+                 'in_stock_variants': stocked, 'inventory_units': quantity}
+                for handle, low, high, count, stocked, quantity
+                in zip(self.handles, lows, highs, counts, in_stock, units)
+            ]
+        }
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Product Records
+Slotted record types for raw and transformed products; fields that are the
+same for every product or variant live once on the class instead of in each record
+"""
+
+import sys
+from dataclasses import dataclass, field
+from typing import Any, ClassVar, Dict, List, Optional
+
+
+class _Missing:
+    """Type of MISSING"""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return 'MISSING'
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __reduce__(self) -> str:
+        # Unpickle (e.g. in a worker process) to the same singleton, so ``is MISSING`` keeps working
+        return 'MISSING'
+
+
+# Marks a field the source dict did not contain, so an explicit null stays distinguishable
+MISSING: Any = _Missing()
+
+
+def field_or(value: Any, default: Any) -> Any:
+    """``default`` when a field was absent, its value (even None) otherwise: ``dict.get(key, default)`` for records"""
+    return default if value is MISSING else value
+
+
+def intern_strings(values: Optional[List[Any]]) -> Optional[List[Any]]:
+    """Share one copy of repeated short strings (sizes, categories, tags) across records"""
+    if values is None:
+        return None
+    return [sys.intern(value) if isinstance(value, str) else value for value in values]
+
+
+def split_extra(data: Dict, known: tuple, defaults: Dict[str, Any]) -> Dict[str, Any]:
+    """Keys a record does not model, plus constant fields whose value differs from the shared default"""
+    return {
+        key: value for key, value in data.items()
+        if key not in known and (key not in defaults or defaults[key] != value)
+    }
+
+
+@dataclass(slots=True)
+class RawVariant:
+    """One size option as scraped; MISSING means the field was absent, None that it was null"""
+
+    size: Optional[str] = MISSING
+    price: Optional[float] = MISSING
+    sku: Optional[str] = MISSING
+    in_stock: Optional[bool] = MISSING
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    FIELDS: ClassVar[tuple] = ('size', 'price', 'sku', 'in_stock')
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RawVariant':
+        """Build from a scraped variant dict"""
+        size = data.get('size', MISSING)
+        return cls(
+            size=sys.intern(size) if isinstance(size, str) else size,
+            price=data.get('price', MISSING),
+            sku=data.get('sku', MISSING),
+            in_stock=data.get('in_stock', MISSING),
+            extra=split_extra(data, cls.FIELDS, {})
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain dict with the scraper's key order"""
+        data = {key: getattr(self, key) for key in self.FIELDS if getattr(self, key) is not MISSING}
+        data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class RawProduct:
+    """A scraped product as produced by scrape-products.py; MISSING means the field was absent, None that it was null"""
+
+    url: Optional[str] = MISSING
+    scraped_at: Optional[str] = MISSING
+    name: Optional[str] = MISSING
+    handle: Optional[str] = MISSING
+    sku: Optional[str] = MISSING
+    price: Optional[float] = MISSING
+    short_description: Optional[str] = MISSING
+    full_description: Optional[str] = MISSING
+    images: Optional[List[str]] = MISSING
+    variants: Optional[List[RawVariant]] = MISSING
+    categories: Optional[List[str]] = MISSING
+    specifications: Optional[Dict[str, str]] = MISSING
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    FIELDS: ClassVar[tuple] = ('url', 'scraped_at', 'name', 'handle', 'sku', 'price', 'short_description',
+                               'full_description', 'images', 'variants', 'categories', 'specifications')
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RawProduct':
+        """Build from a scraped product dict"""
+        variants = data.get('variants', MISSING)
+        categories = data.get('categories', MISSING)
+        return cls(
+            url=data.get('url', MISSING),
+            scraped_at=data.get('scraped_at', MISSING),
+            name=data.get('name', MISSING),
+            handle=data.get('handle', MISSING),
+            sku=data.get('sku', MISSING),
+            price=data.get('price', MISSING),
+            short_description=data.get('short_description', MISSING),
+            full_description=data.get('full_description', MISSING),
+            images=data.get('images', MISSING),
+            variants=[RawVariant.from_dict(variant) for variant in variants] if variants else variants,
+            categories=intern_strings(categories) if categories else categories,
+            specifications=data.get('specifications', MISSING),
+            extra=split_extra(data, cls.FIELDS, {})
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain dict with the scraper's key order"""
+        data = {}
+        for key in self.FIELDS:
+            value = getattr(self, key)
+            if value is not MISSING:
+                data[key] = [variant.to_dict() for variant in value] if key == 'variants' and value else value
+        data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class Variant:
+    """A Medusa product variant with a single price"""
+
+    title: str
+    sku: str
+    inventory_quantity: int
+    amount: int
+    currency_code: str = 'usd'
+    option_value: Optional[str] = MISSING  # MISSING: the variant has no options
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    # Identical on every variant, so stored once here
+    DEFAULTS: ClassVar[Dict[str, Any]] = {
+        'barcode': None,
+        'ean': None,
+        'upc': None,
+        'allow_backorder': False,
+        'manage_inventory': True,
+        'requires_shipping': True,
+        'weight': 50,  # grams
+        'length': 5,
+        'height': 5,
+        'width': 2
+    }
+    FIELDS: ClassVar[tuple] = ('title', 'sku', 'inventory_quantity', 'prices', 'options')
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Variant':
+        """Build from a transformed variant dict"""
+        extra = split_extra(data, cls.FIELDS, cls.DEFAULTS)
+        prices = data.get('prices') or []
+        single_price = len(prices) == 1 and set(prices[0]) == {'currency_code', 'amount'}
+        if not single_price:
+            extra['prices'] = prices
+        options = data.get('options')
+        single_option = options is not None and len(options) == 1 and set(options[0]) == {'value'}
+        if options is not None and not single_option:
+            extra['options'] = options
+        title = data['title']
+        option_value = options[0]['value'] if single_option else MISSING
+        return cls(
+            title=sys.intern(title) if isinstance(title, str) else title,
+            sku=data['sku'],
+            inventory_quantity=data['inventory_quantity'],
+            amount=prices[0]['amount'] if single_price else 0,
+            currency_code=sys.intern(prices[0]['currency_code']) if single_price else 'usd',
+            option_value=sys.intern(option_value) if isinstance(option_value, str) else option_value,
+            extra=extra
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the shape seed-peptides.ts expects"""
+        defaults = self.DEFAULTS
+        data = {
+            'title': self.title,
+            'sku': self.sku,
+            'barcode': defaults['barcode'],
+            'ean': defaults['ean'],
+            'upc': defaults['upc'],
+            'inventory_quantity': self.inventory_quantity,
+            'allow_backorder': defaults['allow_backorder'],
+            'manage_inventory': defaults['manage_inventory'],
+            'requires_shipping': defaults['requires_shipping'],
+            'weight': defaults['weight'],
+            'length': defaults['length'],
+            'height': defaults['height'],
+            'width': defaults['width'],
+            'prices': [{'currency_code': self.currency_code, 'amount': self.amount}]
+        }
+        if self.option_value is not MISSING:
+            data['options'] = [{'value': self.option_value}]
+        data.update(self.extra)
+        return data
+
+
+@dataclass(slots=True)
+class TransformedProduct:
+    """A Medusa product ready for seeding"""
+
+    title: str
+    subtitle: str
+    description: str
+    handle: str
+    thumbnail: Optional[str]
+    images: List[str]
+    metadata: Dict[str, Any]
+    categories: List[str]
+    tags: List[str]
+    variants: List[Variant] = field(default_factory=list)
+    options: Optional[List[Dict]] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    # Identical on every product, so stored once here
+    DEFAULTS: ClassVar[Dict[str, Any]] = {
+        'is_giftcard': False,
+        'status': 'published',
+        'weight': 50,  # grams (typical vial weight)
+        'length': 5,   # cm
+        'height': 5,   # cm
+        'width': 2,    # cm
+        'origin_country': 'US',
+        'hs_code': '2937290090',  # Peptide hormones HS code
+        'mid_code': 'peptide',
+        'material': 'Lyophilized Powder',
+        'type': 'Research Peptide'
+    }
+    FIELDS: ClassVar[tuple] = ('title', 'subtitle', 'description', 'handle', 'thumbnail', 'images', 'metadata',
+                               'categories', 'tags', 'variants', 'options')
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TransformedProduct':
+        """Build from a transformed product dict, e.g. a previous transformed-products.json"""
+        extra = split_extra(data, cls.FIELDS, cls.DEFAULTS)
+        images = data.get('images') or []
+        plain_images = all(isinstance(image, dict) and set(image) == {'url'} for image in images)
+        if not plain_images:
+            extra['images'] = images
+        subtitle = data.get('subtitle', '')
+        return cls(
+            title=data['title'],
+            subtitle=sys.intern(subtitle) if isinstance(subtitle, str) else subtitle,
+            description=data.get('description', ''),
+            handle=data['handle'],
+            thumbnail=data.get('thumbnail'),
+            images=[image['url'] for image in images] if plain_images else [],
+            metadata=data.get('metadata', {}),
+            categories=intern_strings(data.get('categories', [])),
+            tags=intern_strings(data.get('tags', [])),
+            variants=[Variant.from_dict(variant) for variant in data.get('variants', [])],
+            options=data.get('options'),
+            extra=extra
+        )
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the shape seed-peptides.ts expects"""
+        defaults = self.DEFAULTS
+        data = {
+            'title': self.title,
+            'subtitle': self.subtitle,
+            'description': self.description,
+            'handle': self.handle,
+            'is_giftcard': defaults['is_giftcard'],
+            'status': defaults['status'],
+            'thumbnail': self.thumbnail,
+            'images': [{'url': url} for url in self.images],
+            'weight': defaults['weight'],
+            'length': defaults['length'],
+            'height': defaults['height'],
+            'width': defaults['width'],
+            'origin_country': defaults['origin_country'],
+            'hs_code': defaults['hs_code'],
+            'mid_code': defaults['mid_code'],
+            'material': defaults['material'],
+            'metadata': self.metadata,
+            'categories': self.categories,
+            'tags': self.tags,
+            'type': defaults['type']
+        }
+        if self.options is not None:
+            data['options'] = self.options
+        data['variants'] = [variant.to_dict() for variant in self.variants]
+        data.update(self.extra)
+        return data
+
+
+def to_json(record: Any) -> Dict:
+    """``default`` hook for json.dump(s), serializing records as they are reached"""
+    if hasattr(record, 'to_dict'):
+        return record.to_dict()
+    raise TypeError(f"Object of type {type(record).__name__} is not JSON serializable")
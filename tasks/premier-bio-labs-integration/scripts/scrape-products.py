@@ -4,22 +4,1450 @@ Premier Bio Labs Product Scraper
 Scrapes all peptide products from premierbiolabs.com using Playwright
 """
 
+import argparse
 import asyncio
+import gzip
+import hashlib
+import html as html_lib
 import json
+import math
+import os
+import random
 import re
+import shutil
+import signal
+import subprocess
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+from xml.etree import ElementTree
 
 try:
-    from playwright.async_api import async_playwright, Page
+    from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeoutError
     from bs4 import BeautifulSoup
+    from lxml import etree
 except ImportError:
     print("Please install required packages:")
     print("pip install playwright beautifulsoup4 lxml")
     print("Then run: playwright install chromium")
     exit(1)
 
+from host_throttle import HostThrottle, RetryableError, backoff_delay, is_congested, parse_retry_after
+
+
+class CompiledProductExtractor:
+    """Single-pass product extractor over a trimmed lxml tree
+
+    Produces the same dict as ``parse_product_html_soup``: one walk over the
+    document records the first/all elements each field needs (mirroring the
+    BeautifulSoup ``find``/``find_all`` fallbacks), and text is collected with
+    BeautifulSoup's rules (no comments, no script/style/template/ruby strings).
+    """
+
+    # Strings under these tags are never part of BeautifulSoup's ``.text``
+    NON_CONTENT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+    # BeautifulSoup collapses whitespace-only strings to one character, except inside these
+    PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+    ASCII_SPACES = ' \n\t\x0c\r'
+    SIZE_SELECT_NAME = re.compile('attribute_pa_size|attribute_size')
+    PRICE_NUMBER = re.compile(r'[\d,]+\.?\d*')
+
+    def __init__(self):
+        # Comments stay in the tree: removing them would merge the strings around them, which
+        # BeautifulSoup keeps apart (and collapses separately when they are whitespace)
+        self.parser = etree.HTMLParser(remove_pis=True, collect_ids=False,
+                                       no_network=True, encoding='utf-8')
+
+    def parse_tree(self, html: str):
+        """Parse and trim the document: scripts and styles carry no extractable content
+
+        They are emptied rather than removed, so the text around them stays separate strings.
+        """
+        try:
+            root = etree.fromstring(html.encode('utf-8'), self.parser)
+        except etree.XMLSyntaxError:
+            return None
+        if root is not None:
+            for element in root.iter('script', 'style'):
+                element.text = None
+        return root
+
+    @staticmethod
+    def has_class(element, name: str) -> bool:
+        return name in element.get('class', '').split()
+
+    def text(self, element) -> str:
+        """Equivalent of BeautifulSoup's ``Tag.text``"""
+        if element.tag in self.NON_CONTENT_TAGS:
+            return ''
+        preserve = element.tag in self.PRESERVE_WHITESPACE_TAGS
+        for ancestor in element.iterancestors():
+            if ancestor.tag in self.NON_CONTENT_TAGS:
+                return ''
+            preserve = preserve or ancestor.tag in self.PRESERVE_WHITESPACE_TAGS
+        parts: List[str] = []
+        self._collect_text(element, parts, preserve)
+        return ''.join(parts)
+
+    def _collect_text(self, element, parts: List[str], preserve: bool = False):
+        if element.text:
+            parts.append(self._string(element.text, preserve))
+        for child in element:
+            if isinstance(child.tag, str) and child.tag not in self.NON_CONTENT_TAGS:
+                self._collect_text(child, parts, preserve or child.tag in self.PRESERVE_WHITESPACE_TAGS)
+            if child.tail:
+                parts.append(self._string(child.tail, preserve))
+
+    def _string(self, value: str, preserve: bool) -> str:
+        """A text node as BeautifulSoup stores it: whitespace-only strings become a newline or a space"""
+        if preserve or value.strip(self.ASCII_SPACES):
+            return value
+        return '\n' if '\n' in value else ' '
+
+    def collect(self, root) -> Dict[str, Any]:
+        """Walk the tree once, recording every element a field may be read from"""
+        found: Dict[str, Any] = {
+            'title': None, 'h1': None, 'sku': None, 'sku_meta': None, 'price': None, 'amount': None,
+            'short_description': None, 'tab_description': None, 'description_panel': None,
+            'variation_form': None, 'size_select': None,
+            'post_images': [], 'large_images': [], 'tag_links': [], 'category_links': [], 'tables': []
+        }
+        if root is None:
+            return found
+
+        for element in root.iter():
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue
+            if tag == 'h1':
+                if found['h1'] is None:
+                    found['h1'] = element
+                if found['title'] is None and self.has_class(element, 'product_title'):
+                    found['title'] = element
+            elif tag == 'span':
+                if found['sku'] is None and self.has_class(element, 'sku'):
+                    found['sku'] = element
+                if found['amount'] is None and self.has_class(element, 'amount'):
+                    found['amount'] = element
+            elif tag == 'meta':
+                if found['sku_meta'] is None and element.get('property') == 'product:retailer_item_id':
+                    found['sku_meta'] = element
+            elif tag == 'p':
+                if found['price'] is None and self.has_class(element, 'price'):
+                    found['price'] = element
+            elif tag == 'div':
+                if found['short_description'] is None and self.has_class(element, 'woocommerce-product-details__short-description'):
+                    found['short_description'] = element
+                if found['tab_description'] is None and element.get('id') == 'tab-description':
+                    found['tab_description'] = element
+                if found['description_panel'] is None and self.has_class(element, 'woocommerce-Tabs-panel--description'):
+                    found['description_panel'] = element
+            elif tag == 'img':
+                if self.has_class(element, 'wp-post-image'):
+                    found['post_images'].append(element)
+                if element.get('data-large_image') is not None:
+                    found['large_images'].append(element)
+            elif tag == 'form':
+                if found['variation_form'] is None and self.has_class(element, 'variations_form'):
+                    found['variation_form'] = element
+            elif tag == 'select':
+                name = element.get('name')
+                if found['size_select'] is None and name is not None and self.SIZE_SELECT_NAME.search(name):
+                    found['size_select'] = element
+            elif tag == 'a':
+                if 'tag' in element.get('rel', '').split():
+                    found['tag_links'].append(element)
+                if self.has_class(element, 'product-category'):
+                    found['category_links'].append(element)
+            elif tag == 'table':
+                found['tables'].append(element)
+        return found
+
+    def extract(self, html: str, product_url: str, diagnostics: Optional[Dict] = None) -> Dict:
+        """Build the raw product dict from one pass over the page"""
+        found = self.collect(self.parse_tree(html))
+
+        product_data = {
+            'url': product_url,
+            'scraped_at': datetime.now().isoformat(),
+        }
+
+        # Product name
+        title_elem = found['title'] if found['title'] is not None else found['h1']
+        if title_elem is not None:
+            product_data['name'] = self.text(title_elem).strip()
+            product_data['handle'] = create_handle(product_data['name'])
+
+        # SKU (a meta tag has no text, matching the reference extractor)
+        sku_elem = found['sku'] if found['sku'] is not None else found['sku_meta']
+        if sku_elem is not None:
+            product_data['sku'] = self.text(sku_elem).strip()
+
+        # Price
+        price_elem = found['price'] if found['price'] is not None else found['amount']
+        if price_elem is not None:
+            price_match = self.PRICE_NUMBER.search(self.text(price_elem).strip())
+            if price_match:
+                product_data['price'] = float(price_match.group().replace(',', ''))
+
+        # Descriptions
+        if found['short_description'] is not None:
+            product_data['short_description'] = self.text(found['short_description']).strip()
+        full_desc = found['tab_description'] if found['tab_description'] is not None else found['description_panel']
+        if full_desc is not None:
+            product_data['full_description'] = self.text(full_desc).strip()
+
+        # Images
+        images = []
+        for img in (found['post_images'] or found['large_images'])[:5]:  # Limit to 5 images
+            img_url = img.get('data-large_image') or img.get('src')
+            if img_url and img_url.startswith('http'):
+                images.append(img_url)
+        product_data['images'] = images
+
+        # Variants (size options)
+        variants = []
+        variation_form = found['variation_form']
+        if variation_form is not None:
+            variations_data = variation_form.get('data-product_variations')
+            if variations_data:
+                try:
+                    for var in json.loads(variations_data):
+                        variants.append({
+                            'size': var.get('attributes', {}).get('attribute_pa_size', ''),
+                            'price': var.get('display_price', 0),
+                            'sku': var.get('sku', ''),
+                            'in_stock': var.get('is_in_stock', True)
+                        })
+                except Exception:
+                    pass
+        variations_from_json = bool(variants)
+        # Above WooCommerce's AJAX threshold the form only carries the product id
+        ajax_product_id = variation_product_id(variation_form) if variation_form is not None else None
+
+        # Fallback: Check for size dropdown
+        if not variants and found['size_select'] is not None:
+            options = [el for el in found['size_select'].iter('option')][1:]  # Skip first empty option
+            for opt in options:
+                size = self.text(opt).strip()
+                if size:
+                    variants.append({
+                        'size': size,
+                        'price': product_data.get('price', 0),
+                        'sku': f"{product_data.get('sku', 'PBL')}-{size.replace(' ', '')}",
+                        'in_stock': True
+                    })
+
+        product_data['variants'] = variants if variants else [default_variant(product_data)]
+
+        # Categories
+        categories = []
+        for cat in found['tag_links'] or found['category_links']:
+            cat_text = self.text(cat).strip()
+            if cat_text and cat_text not in categories:
+                categories.append(cat_text)
+        product_data['categories'] = categories
+
+        # Specifications (if available in table format)
+        specs = {}
+        for table in found['tables']:
+            for row in table.iter('tr'):
+                cells = list(row.iter('td', 'th'))
+                if len(cells) >= 2:
+                    key = self.text(cells[0]).strip()
+                    value = self.text(cells[1]).strip()
+                    if key and value:
+                        specs[key] = value
+        product_data['specifications'] = apply_peptide_defaults(specs, product_data.get('name', ''), categories)
+
+        if diagnostics is not None:
+            diagnostics['has_variation_form'] = variation_form is not None
+            diagnostics['variations_from_json'] = variations_from_json
+            diagnostics['ajax_variations_product_id'] = ajax_product_id
+
+        return product_data
+
+
+class IncompleteCatalogError(Exception):
+    """A catalog source the result depends on is incomplete: a Store API request still
+    failed after retries, or a page archive comes from a recording that was cut short"""
+
+
+_compiled_extractor: Optional[CompiledProductExtractor] = None
+
+
+def parse_product_html(html: str, product_url: str, diagnostics: Optional[Dict] = None,
+                       parser: str = 'compiled') -> Dict:
+    """Parse a rendered or server-side product page into a raw product dict
+
+    When a ``diagnostics`` dict is passed it is filled with details about where
+    the variants came from, so callers can decide whether the page needs a browser.
+    """
+    global _compiled_extractor
+    if parser == 'soup':
+        return parse_product_html_soup(html, product_url, diagnostics)
+    if _compiled_extractor is None:
+        _compiled_extractor = CompiledProductExtractor()
+    return _compiled_extractor.extract(html, product_url, diagnostics)
+
+
+def parse_product_page(html: str, product_url: str, parser: str = 'compiled') -> Tuple[Dict, Dict]:
+    """Process-pool entry point: parse a page and return the product with its diagnostics"""
+    diagnostics: Dict = {}
+    started = time.perf_counter()
+    product_data = parse_product_html(html, product_url, diagnostics, parser)
+    diagnostics['parse_ms'] = (time.perf_counter() - started) * 1000
+    return product_data, diagnostics
+
+
+def extract_product_links(html: str, base_url: str) -> List[str]:
+    """Collect product URLs from raw listing HTML, in page order without duplicates"""
+    soup = BeautifulSoup(html, 'lxml')
+    product_links = []
+
+    # Look for product links in the page
+    for a in soup.find_all('a', href=True):
+        href = a['href']
+        if '/product/' in href:
+            full_url = href if href.startswith('http') else f"{base_url}{href}"
+            if full_url not in product_links:
+                product_links.append(full_url)
+
+    return product_links
+
+
+# Saved product and listing pages that --check-parser runs when no files are given
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+
+def check_parser_parity(paths: Optional[List[str]] = None) -> int:
+    """Compare the compiled and BeautifulSoup extractors on saved pages; returns the mismatch count
+
+    Listing pages are recognized by a ``<name>.links.json`` file next to them and are
+    checked against the product links it lists instead.
+    """
+    if not paths:
+        paths = [str(path) for path in sorted(FIXTURES_DIR.glob('*.html'))]
+    mismatches = 0
+    for path in paths:
+        html = Path(path).read_text(encoding='utf-8')
+        expected_links_path = Path(path).with_suffix('.links.json')
+        if expected_links_path.exists():
+            with open(expected_links_path, 'r') as f:
+                expected_links = json.load(f)
+            links = extract_product_links(html, PremierBioLabsScraper.BASE_URL)
+            if links == expected_links:
+                print(f"✓ {path}: {len(links)} product links")
+            else:
+                mismatches += 1
+                missing = [link for link in expected_links if link not in links]
+                unexpected = [link for link in links if link not in expected_links]
+                detail = (f"missing {', '.join(missing) or 'none'}; unexpected {', '.join(unexpected) or 'none'}"
+                          if missing or unexpected else 'links out of order')
+                print(f"✗ {path}: {detail}")
+            continue
+
+        compiled = parse_product_html(html, path, parser='compiled')
+        reference = parse_product_html(html, path, parser='soup')
+        compiled.pop('scraped_at')
+        reference.pop('scraped_at')
+        if compiled == reference:
+            print(f"✓ {path}")
+        else:
+            mismatches += 1
+            differing = sorted(key for key in set(compiled) | set(reference) if compiled.get(key) != reference.get(key))
+            print(f"✗ {path}: {', '.join(differing)}")
+    return mismatches
+
+
+class PageCache:
+    """On-disk cache of HTTP validators, content hashes and extracted records keyed by URL
+
+    The index held in memory keeps only validators and the offset of each record in
+    a JSONL sidecar, so memory grows by a few hundred bytes per URL rather than by
+    whole product records. Superseded records are dropped when the sidecar is compacted.
+    """
+
+    DEFAULT_PATH = Path(__file__).parent.parent / 'data' / '.cache' / 'page-cache.json'
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.records_path = self.path.with_suffix('.records.jsonl')
+        self.entries: Dict[str, Dict] = {}
+        self.records = None
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+        for url, entry in self.entries.items():
+            if 'record' in entry:
+                # Older caches kept records inline in the index
+                self.write_record(url, entry, entry.pop('record'))
+        live = sum(entry.get('length', 0) for entry in self.entries.values())
+        self.dead_bytes = max(0, self.records_size() - live)
+
+    @staticmethod
+    def hash_content(content: str) -> str:
+        """Stable fingerprint of a page body"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def records_size(self) -> int:
+        """Bytes in the records sidecar, including superseded records"""
+        if self.records:
+            self.records.seek(0, os.SEEK_END)
+            return self.records.tell()
+        return self.records_path.stat().st_size if self.records_path.exists() else 0
+
+    def open_records(self):
+        """Open the records sidecar for appending and random reads"""
+        if not self.records:
+            self.records_path.parent.mkdir(parents=True, exist_ok=True)
+            self.records = open(self.records_path, 'a+b')
+        return self.records
+
+    def write_record(self, url: str, entry: Dict, record: Dict):
+        """Append a record to the sidecar and point the index entry at it"""
+        records = self.open_records()
+        line = (json.dumps({'url': url, 'record': record}, default=str) + '\n').encode('utf-8')
+        records.seek(0, os.SEEK_END)
+        entry['offset'] = records.tell()
+        entry['length'] = len(line)
+        records.write(line)
+
+    def read_record(self, url: str, entry: Dict) -> Optional[Dict]:
+        """Load the record an index entry points at; None if the sidecar no longer matches the index"""
+        if 'offset' not in entry:
+            return None
+        records = self.open_records()
+        records.flush()
+        records.seek(entry['offset'])
+        try:
+            stored = json.loads(records.read(entry['length']))
+        except ValueError:
+            return None
+        # A crash between compacting the sidecar and saving the index leaves stale offsets
+        return stored['record'] if isinstance(stored, dict) and stored.get('url') == url else None
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return the cached index entry for a URL, if any"""
+        return self.entries.get(url)
+
+    def record(self, url: str) -> Optional[Dict]:
+        """Return the cached record for a URL, if any"""
+        entry = self.entries.get(url)
+        return self.read_record(url, entry) if entry else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from the cached validators"""
+        entry = self.entries.get(url)
+        if not entry or 'offset' not in entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def lookup(self, url: str, content_hash: str) -> Optional[Dict]:
+        """Return the previously extracted record when the page body is unchanged"""
+        entry = self.entries.get(url)
+        if entry and entry.get('content_hash') == content_hash:
+            return self.read_record(url, entry)
+        return None
+
+    def store(self, url: str, headers: Dict[str, str], content_hash: str, record: Dict,
+              ajax_product_id: Optional[str] = None):
+        """Remember the validators, body hash and extracted record for a URL
+
+        ``ajax_product_id`` marks pages whose variations come from the Store API rather
+        than the HTML, so a cache hit still has to refresh them.
+        """
+        previous = self.entries.get(url)
+        if previous:
+            self.dead_bytes += previous.get('length', 0)
+        entry = {
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+            'content_hash': content_hash,
+            'ajax_product_id': ajax_product_id,
+            'cached_at': datetime.now().isoformat()
+        }
+        self.write_record(url, entry, record)
+        self.entries[url] = entry
+
+    def compact(self):
+        """Rewrite the sidecar with only the records the index still points at"""
+        tmp_path = self.records_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            for entry in self.entries.values():
+                if 'offset' not in entry:
+                    continue
+                self.records.seek(entry['offset'])
+                line = self.records.read(entry['length'])
+                entry['offset'] = f.tell()
+                f.write(line)
+        self.records.close()
+        tmp_path.replace(self.records_path)
+        self.records = None
+        self.dead_bytes = 0
+
+    def save(self):
+        """Persist the cache atomically, compacting the sidecar once most of it is superseded"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.records:
+            self.records.flush()
+            os.fsync(self.records.fileno())
+            if self.dead_bytes > self.records_size() - self.dead_bytes:
+                self.compact()
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, default=str)
+        tmp_path.replace(self.path)
+
+    def close(self):
+        """Close the records sidecar"""
+        if self.records:
+            self.records.close()
+            self.records = None
+
+
+class ProductSink:
+    """Append-only JSONL product output with a journal of completed URLs for crash-resume
+
+    Each journal line records the end offset of the URL's record in the output, so a
+    resume truncates the output back to the last journaled record: a record written
+    just before a crash, without its journal line, is dropped and scraped again rather
+    than duplicated.
+
+    A run writes both files with a ``.part`` suffix and ``commit()`` moves them over the
+    previous output once the run has succeeded, so a failed or interrupted run leaves
+    the last complete output untouched; ``--resume`` continues from the ``.part`` files.
+    """
+
+    DEFAULT_PATH = Path(__file__).parent.parent / 'data' / 'raw-products.jsonl'
+    DEFAULT_JOURNAL = Path(__file__).parent.parent / 'data' / '.cache' / 'scrape-checkpoint.txt'
+
+    def __init__(self, path: Optional[Path] = None, journal_path: Optional[Path] = None, resume: bool = False):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.journal_path = Path(journal_path) if journal_path else self.DEFAULT_JOURNAL
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self.part_journal_path = self.journal_path.with_name(self.journal_path.name + '.part')
+        self.completed = set()
+        self.count = 0
+
+        if self.part_path.exists() and not self.part_journal_path.exists():
+            # commit() moves the journal first: finish a commit that was interrupted
+            self.part_path.replace(self.path)
+        if resume and not self.part_path.exists() and self.path.exists() and self.journal_path.exists():
+            # Extending a finished run: continue from a copy so its output stays intact until commit
+            shutil.copyfile(self.path, self.part_path)
+            shutil.copyfile(self.journal_path, self.part_journal_path)
+        if resume and self.part_path.exists() and self.part_journal_path.exists():
+            self.truncate_partial_line(self.part_journal_path)
+            self.completed = self.recover()
+            self.count = len(self.completed)
+        mode = 'a' if self.completed else 'w'
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        self.records = open(self.part_path, mode + 'b')
+        self.journal = open(self.part_journal_path, mode)
+
+    def recover(self) -> set:
+        """Line the output up with the journal and return the URLs it covers"""
+        entries = []
+        with open(self.part_journal_path, 'r') as f:
+            for line in f:
+                offset, tab, url = line.strip().partition('\t')
+                if tab and offset.isdigit():
+                    entries.append((int(offset), url))
+                elif offset:
+                    # Journals from before offsets were recorded hold bare URLs
+                    entries.append((None, offset))
+
+        size = self.part_path.stat().st_size
+        # Offsets only grow, so entries pointing past the end of the output are a suffix
+        kept = [(offset, url) for offset, url in entries if offset is None or offset <= size]
+        offsets = [offset for offset, _ in kept if offset is not None]
+        if offsets and offsets[-1] < size:
+            with open(self.part_path, 'rb+') as f:
+                f.truncate(offsets[-1])
+        elif not offsets:
+            # Without an offset only a torn last line can be repaired
+            self.truncate_partial_line(self.part_path)
+        if len(kept) < len(entries):
+            with open(self.part_journal_path, 'w') as f:
+                f.writelines(f"{url}\n" if offset is None else f"{offset}\t{url}\n" for offset, url in kept)
+        return {url for _, url in kept}
+
+    @staticmethod
+    def truncate_partial_line(path: Path):
+        """Drop a half-written trailing line left behind by a crash"""
+        with open(path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                step = min(4096, position)
+                f.seek(position - step)
+                newline = f.read(step).rfind(b'\n')
+                if newline != -1:
+                    position = position - step + newline + 1
+                    break
+                position -= step
+            if position != end:
+                f.truncate(position)
+
+    def is_done(self, url: str) -> bool:
+        """Whether a previous run already wrote this URL"""
+        return url in self.completed
+
+    def write(self, url: str, record: Dict):
+        """Append one record, then journal its URL and end offset once the record is written"""
+        if url in self.completed:
+            return
+        self.records.write((json.dumps(record, default=str) + '\n').encode('utf-8'))
+        self.records.flush()
+        self.journal.write(f"{self.records.tell()}\t{url}\n")
+        self.journal.flush()
+        self.completed.add(url)
+        self.count += 1
+
+    def close(self):
+        """Flush and close the output files"""
+        if not self.records.closed:
+            self.records.close()
+            self.journal.close()
+
+    def commit(self):
+        """Replace the previous output and journal with this run's"""
+        self.close()
+        if self.part_journal_path.exists():
+            self.part_journal_path.replace(self.journal_path)
+        if self.part_path.exists():
+            self.part_path.replace(self.path)
+
+    def iter_records(self):
+        """Stream records back from the JSONL file"""
+        with open(self.part_path if self.part_path.exists() else self.path, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def export_json(self, output_path: Path) -> int:
+        """Commit the JSONL file and convert it into a JSON array one record at a time"""
+        self.commit()
+        count = 0
+        tmp_path = output_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write('[')
+            for record in self.iter_records():
+                f.write(',\n' if count else '\n')
+                f.write('\n'.join('  ' + line for line in json.dumps(record, indent=2, default=str).split('\n')))
+                count += 1
+            f.write('\n]' if count else ']')
+        tmp_path.replace(output_path)
+        return count
+
+
+class ReadinessEngine:
+    """Waits on the DOM signals the extractor needs instead of fixed sleeps
+
+    Each signal is a dict with a ``selector``, a ``timeout`` in milliseconds, a
+    ``required`` flag and an optional ``if_present`` gate: gated signals are only
+    awaited when the gate selector already exists (e.g. variation data is only
+    expected on pages that render a variations form).
+    """
+
+    PRODUCT_SIGNALS = [
+        {'name': 'title', 'selector': 'h1.product_title, h1', 'timeout': 15000, 'required': True},
+        {'name': 'price', 'selector': 'p.price, span.amount', 'timeout': 5000, 'required': True},
+        {'name': 'variations', 'selector': 'form.variations_form[data-product_variations]', 'timeout': 5000,
+         'required': False, 'if_present': 'form.variations_form'},
+    ]
+
+    SHOP_SIGNALS = [
+        {'name': 'product_links', 'selector': 'a.woocommerce-LoopProduct-link, .products a[href*="/product/"]',
+         'timeout': 15000, 'required': True},
+    ]
+
+    async def wait_for_signal(self, page: Page, signal: Dict) -> Optional[float]:
+        """Wait for one signal, returning the elapsed milliseconds or None on timeout/absence"""
+        start = time.perf_counter()
+        if signal.get('if_present') and not await page.query_selector(signal['if_present']):
+            return None
+        try:
+            await page.wait_for_selector(signal['selector'], state='attached', timeout=signal['timeout'])
+        except PlaywrightTimeoutError:
+            return None
+        return (time.perf_counter() - start) * 1000
+
+    async def wait(self, page: Page, signals: List[Dict]) -> Dict:
+        """Wait for all signals concurrently and report how long the page took to become ready"""
+        start = time.perf_counter()
+        elapsed = await asyncio.gather(*(self.wait_for_signal(page, signal) for signal in signals))
+
+        timings = {signal['name']: ms for signal, ms in zip(signals, elapsed)}
+        missing = [signal['name'] for signal, ms in zip(signals, elapsed) if ms is None and signal['required']]
+        return {
+            'ready_ms': round((time.perf_counter() - start) * 1000, 1),
+            'signals': {name: round(ms, 1) if ms is not None else None for name, ms in timings.items()},
+            'missing': missing
+        }
+
+    async def wait_for_growth(self, page: Page, selector: str, previous: int, timeout: int = 2000) -> int:
+        """Wait until more elements match ``selector`` than before, e.g. after an infinite-scroll trigger"""
+        try:
+            await page.wait_for_function(
+                '([selector, previous]) => document.querySelectorAll(selector).length > previous',
+                arg=[selector, previous],
+                timeout=timeout
+            )
+        except PlaywrightTimeoutError:
+            pass
+        return await page.evaluate('(selector) => document.querySelectorAll(selector).length', selector)
+
+
+class RequestBlocker:
+    """Aborts non-essential browser requests for one worker and counts what was avoided
+
+    Images, media, fonts and any request to a host outside the store's own domain
+    (plus the allowlist) are aborted. Avoided bytes are estimated from the sizes the
+    image store (download-images.py) recorded for the same URLs, since measuring
+    them here would mean sending the very requests being avoided; blocked URLs the
+    store has never fetched are counted but not sized.
+    """
+
+    BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+    SIZE_MANIFEST = Path(__file__).parent.parent / 'data' / 'images' / 'manifest.json'
+
+    def __init__(self, first_party_host: str, allowlist: Optional[List[str]] = None,
+                 known_sizes: Optional[Dict[str, int]] = None):
+        self.first_party_host = first_party_host
+        self.allowlist = [domain.lower() for domain in (allowlist or [])]
+        self.known_sizes = known_sizes or {}
+        self.current: Optional[Dict] = None
+        # Running totals rather than per-page reports, so memory stays flat over a long crawl
+        self.page_count = 0
+        self.blocked_requests = 0
+        self.sized_requests = 0
+        self.avoided_bytes = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    @classmethod
+    def load_known_sizes(cls, path: Optional[Path] = None) -> Dict[str, int]:
+        """Byte size per URL from the image store manifest, empty when no images were downloaded"""
+        path = Path(path) if path else cls.SIZE_MANIFEST
+        if not path.exists():
+            return {}
+        try:
+            with open(path, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Ignoring unreadable image manifest {path}: {e}")
+            return {}
+        return {url: entry['bytes'] for url, entry in manifest.items() if 'bytes' in entry}
+
+    def is_allowed_host(self, host: str) -> bool:
+        """First-party hosts, their subdomains and allowlisted domains may load"""
+        for domain in [self.first_party_host] + self.allowlist:
+            if host == domain or host.endswith(f".{domain}"):
+                return True
+        return False
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Decide whether a browser request is non-essential"""
+        if resource_type in self.BLOCKED_RESOURCE_TYPES:
+            return True
+        host = urlparse(url).hostname
+        return bool(host) and not self.is_allowed_host(host.lower())
+
+    async def handle(self, route):
+        """Playwright route handler"""
+        request = route.request
+        if not self.should_block(request.resource_type, request.url):
+            await route.continue_()
+            return
+
+        if self.current is not None:
+            self.current['blocked_requests'] += 1
+            by_type = self.current['blocked_by_type']
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            size = self.known_sizes.get(request.url)
+            if size is not None:
+                self.current['sized_requests'] += 1
+                self.current['avoided_bytes'] += size
+        await route.abort()
+
+    def begin_page(self, url: str):
+        """Start accounting for a new navigation"""
+        self.current = {'url': url, 'blocked_requests': 0, 'sized_requests': 0, 'avoided_bytes': 0,
+                        'blocked_by_type': {}}
+
+    def end_page(self):
+        """Stop accounting, report the page and fold it into the totals"""
+        if self.current is None:
+            return
+        report, self.current = self.current, None
+        self.page_count += 1
+        self.blocked_requests += report['blocked_requests']
+        self.sized_requests += report['sized_requests']
+        self.avoided_bytes += report['avoided_bytes']
+        for resource_type, count in report['blocked_by_type'].items():
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + count
+        if report['blocked_requests']:
+            print(f"  ⛔ Blocked {report['blocked_requests']} requests "
+                  f"({format_type_counts(report['blocked_by_type'])}"
+                  f"{format_avoided_bytes(report['avoided_bytes'], report['sized_requests'], report['blocked_requests'])}"
+                  f") on {report['url']}")
+
+
+def format_type_counts(counts: Dict[str, int]) -> str:
+    """Render per-resource-type counts, largest first"""
+    return ', '.join(f"{count} {resource_type}" for resource_type, count
+                     in sorted(counts.items(), key=lambda item: -item[1]))
+
+
+def format_avoided_bytes(avoided_bytes: int, sized: int, blocked: int) -> str:
+    """Render the estimated bytes avoided and how many blocked requests the estimate covers"""
+    if not sized:
+        return ''
+    return f"; ~{avoided_bytes / 1024:.0f} KB avoided, sizes known for {sized} of {blocked}"
+
+
+def create_handle(name: str) -> str:
+    """Create URL-safe handle from product name"""
+    handle = name.lower()
+    handle = re.sub(r'[^a-z0-9\s-]', '', handle)
+    handle = re.sub(r'[-\s]+', '-', handle)
+    return handle.strip('-')
+
+
+def default_variant(product_data: Dict) -> Dict:
+    """Single variant used when a product exposes no size options"""
+    return {
+        'size': 'Standard',
+        'price': product_data.get('price', 0),
+        'sku': product_data.get('sku', 'PBL-STD'),
+        'in_stock': True
+    }
+
+
+def variation_product_id(variation_form) -> Optional[int]:
+    """Product id of a variations form whose variation data is loaded over AJAX, else None"""
+    if variation_form.get('data-product_variations') != 'false':
+        return None
+    try:
+        return int(variation_form.get('data-product_id'))
+    except (TypeError, ValueError):
+        return None
+
+
+def extract_specifications(soup) -> Dict[str, str]:
+    """Collect key/value pairs from every two-column table row"""
+    specs = {}
+    spec_tables = soup.find_all('table')
+    for table in spec_tables:
+        rows = table.find_all('tr')
+        for row in rows:
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                key = cells[0].text.strip()
+                value = cells[1].text.strip()
+                if key and value:
+                    specs[key] = value
+    return specs
+
+
+def apply_peptide_defaults(specs: Dict[str, str], name: str, categories: List[str]) -> Dict[str, str]:
+    """Add default specifications for peptides"""
+    if 'peptide' in name.lower() or any('peptide' in cat.lower() for cat in categories):
+        specs.setdefault('Purity', '>98%')
+        specs.setdefault('Form', 'Lyophilized Powder')
+        specs.setdefault('Storage', 'Store at -20°C')
+        specs.setdefault('Research Use', 'Laboratory Research Only')
+    return specs
+
+
+def parse_product_html_soup(html: str, product_url: str, diagnostics: Optional[Dict] = None) -> Dict:
+    """Reference BeautifulSoup extractor, kept for parity checks against the compiled one"""
+    soup = BeautifulSoup(html, 'lxml')
+
+    product_data = {
+        'url': product_url,
+        'scraped_at': datetime.now().isoformat(),
+    }
+
+    # Product name
+    title_elem = soup.find('h1', class_='product_title') or soup.find('h1')
+    if title_elem:
+        product_data['name'] = title_elem.text.strip()
+        product_data['handle'] = create_handle(product_data['name'])
+
+    # SKU
+    sku_elem = soup.find('span', class_='sku') or soup.find('meta', {'property': 'product:retailer_item_id'})
+    if sku_elem:
+        product_data['sku'] = sku_elem.text.strip() if hasattr(sku_elem, 'text') else sku_elem.get('content')
+
+    # Price
+    price_elem = soup.find('p', class_='price') or soup.find('span', class_='amount')
+    if price_elem:
+        price_text = price_elem.text.strip()
+        # Extract numeric price
+        price_match = re.search(r'[\d,]+\.?\d*', price_text)
+        if price_match:
+            product_data['price'] = float(price_match.group().replace(',', ''))
+
+    # Short description
+    short_desc = soup.find('div', class_='woocommerce-product-details__short-description')
+    if short_desc:
+        product_data['short_description'] = short_desc.text.strip()
+
+    # Full description
+    full_desc = soup.find('div', {'id': 'tab-description'}) or soup.find('div', class_='woocommerce-Tabs-panel--description')
+    if full_desc:
+        product_data['full_description'] = full_desc.text.strip()
+
+    # Images
+    images = []
+    gallery = soup.find_all('img', class_='wp-post-image') or soup.find_all('img', {'data-large_image': True})
+    for img in gallery[:5]:  # Limit to 5 images
+        img_url = img.get('data-large_image') or img.get('src')
+        if img_url and img_url.startswith('http'):
+            images.append(img_url)
+    product_data['images'] = images
+
+    # Variants (size options)
+    variants = []
+
+    # Try to find variation form
+    variation_form = soup.find('form', class_='variations_form')
+    if variation_form:
+        # Extract variations data
+        variations_data = variation_form.get('data-product_variations')
+        if variations_data:
+            try:
+                variations_json = json.loads(variations_data)
+                for var in variations_json:
+                    variant = {
+                        'size': var.get('attributes', {}).get('attribute_pa_size', ''),
+                        'price': var.get('display_price', 0),
+                        'sku': var.get('sku', ''),
+                        'in_stock': var.get('is_in_stock', True)
+                    }
+                    variants.append(variant)
+            except:
+                pass
+    variations_from_json = bool(variants)
+    # Above WooCommerce's AJAX threshold the form only carries the product id
+    ajax_product_id = variation_product_id(variation_form) if variation_form else None
+
+    # Fallback: Check for size dropdown
+    if not variants:
+        size_select = soup.find('select', {'name': re.compile('attribute_pa_size|attribute_size')})
+        if size_select:
+            options = size_select.find_all('option')[1:]  # Skip first empty option
+            for opt in options:
+                size = opt.text.strip()
+                if size:
+                    variants.append({
+                        'size': size,
+                        'price': product_data.get('price', 0),
+                        'sku': f"{product_data.get('sku', 'PBL')}-{size.replace(' ', '')}",
+                        'in_stock': True
+                    })
+
+    product_data['variants'] = variants if variants else [default_variant(product_data)]
+
+    # Categories
+    categories = []
+    cat_links = soup.find_all('a', {'rel': 'tag'}) or soup.find_all('a', class_='product-category')
+    for cat in cat_links:
+        cat_text = cat.text.strip()
+        if cat_text and cat_text not in categories:
+            categories.append(cat_text)
+    product_data['categories'] = categories
+
+    # Specifications (if available in table format)
+    specs = extract_specifications(soup)
+    product_data['specifications'] = apply_peptide_defaults(specs, product_data.get('name', ''), categories)
+
+    if diagnostics is not None:
+        diagnostics['has_variation_form'] = variation_form is not None
+        diagnostics['variations_from_json'] = variations_from_json
+        diagnostics['ajax_variations_product_id'] = ajax_product_id
+
+    return product_data
+
+
+class WooCommerceCatalog:
+    """Bulk catalog discovery and extraction through WooCommerce's Store API and XML sitemaps
+
+    The Store API returns up to 100 products per request with prices, images,
+    categories and variation ids; variation prices are then fetched in batches.
+    Sitemaps only provide URLs and feed the regular page-scraping workers.
+    """
+
+    STORE_API_PATH = '/wp-json/wc/store/v1/products'
+    SITEMAP_PATHS = ['/wp-sitemap.xml', '/sitemap_index.xml', '/product-sitemap.xml']
+    SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+    PAGE_SIZE = 100
+
+    def __init__(self, base_url: str, fetch):
+        self.base_url = base_url
+        self.fetch = fetch  # throttled coroutine returning a Playwright APIResponse, retried on 429/5xx
+
+    def store_api_url(self, **params) -> str:
+        """Build a Store API products URL"""
+        params.setdefault('per_page', self.PAGE_SIZE)
+        return f"{self.base_url}{self.STORE_API_PATH}?{urlencode(params)}"
+
+    async def get_json(self, url: str) -> Tuple[Optional[Any], Dict[str, str]]:
+        """GET a JSON document, returning (None, headers) on non-200 responses"""
+        response = await self.fetch(url)
+        if response.status != 200:
+            return None, response.headers
+        return await response.json(), response.headers
+
+    async def require_json(self, url: str) -> Tuple[Any, Dict[str, str]]:
+        """GET a JSON document the result cannot do without, raising IncompleteCatalogError when it fails"""
+        try:
+            response = await self.fetch(url)
+        except RetryableError as e:
+            raise IncompleteCatalogError(f"{e} for {url}") from e
+        if response.status != 200:
+            raise IncompleteCatalogError(f"HTTP {response.status} for {url}")
+        return await response.json(), response.headers
+
+    async def fetch_store_api_products(self) -> Optional[List[Dict]]:
+        """Download the whole catalog as raw product dicts; None when the Store API is unavailable
+
+        Once the first page answers, every later page must too: a partial catalog would
+        read downstream as products removed from the store, so it raises IncompleteCatalogError.
+        """
+        items, headers = await self.get_json(self.store_api_url(page=1))
+        if not isinstance(items, list):
+            return None
+
+        total_pages = int(headers.get('x-wp-totalpages') or 1)
+        if total_pages > 1:
+            pages = await asyncio.gather(*(
+                self.require_json(self.store_api_url(page=page)) for page in range(2, total_pages + 1)
+            ))
+            for page_items, _ in pages:
+                items.extend(page_items)
+        total = int(headers.get('x-wp-total') or 0)
+        if len(items) < total:
+            raise IncompleteCatalogError(f"Store API returned {len(items)} of {total} products")
+        print(f"Fetched {len(items)} products from the Store API in {total_pages} pages")
+
+        variations = await self.fetch_variations(items)
+        return [self.to_raw_product(item, variations) for item in items if item.get('type') != 'variation']
+
+    async def fetch_product_variants(self, product_id: int, fallback_price: float = 0) -> Optional[List[Dict]]:
+        """Variants of one variable product by id, for pages whose form omits the variation data"""
+        item, _ = await self.require_json(f"{self.base_url}{self.STORE_API_PATH}/{product_id}")
+        if not isinstance(item, dict) or not item.get('variations'):
+            return None
+        return self.to_variants(item, await self.fetch_variations([item]), fallback_price)
+
+    async def fetch_variations(self, items: List[Dict]) -> Dict[int, Dict]:
+        """Fetch variation records for all products in concurrent batches; a batch that keeps failing raises"""
+        ids = [variation['id'] for item in items for variation in item.get('variations') or []]
+        batches = [ids[i:i + self.PAGE_SIZE] for i in range(0, len(ids), self.PAGE_SIZE)]
+        # A dropped batch would silently price its variants at the parent's fallback price
+        responses = await asyncio.gather(*(
+            self.require_json(self.store_api_url(type='variation', include=','.join(map(str, batch)),
+                                                 per_page=len(batch)))
+            for batch in batches
+        ))
+
+        variations = {}
+        for batch_items, _ in responses:
+            for variation in batch_items or []:
+                variations[variation['id']] = variation
+        return variations
+
+    @staticmethod
+    def to_price(prices: Dict) -> Optional[float]:
+        """Convert Store API minor-unit prices to a float, using the lowest price of a range"""
+        if not prices:
+            return None
+        amount = (prices.get('price_range') or {}).get('min_amount') or prices.get('price')
+        if amount in (None, ''):
+            return None
+        return int(amount) / (10 ** int(prices.get('currency_minor_unit', 2)))
+
+    @staticmethod
+    def variation_size(attributes: List[Dict]) -> str:
+        """Pick the size attribute of a variation, falling back to its first attribute"""
+        for attribute in attributes:
+            if attribute.get('name', '').lower() in ('size', 'pa_size'):
+                return attribute.get('value', '')
+        return attributes[0].get('value', '') if attributes else ''
+
+    def to_variants(self, item: Dict, variations: Dict[int, Dict], fallback_price: float = 0) -> List[Dict]:
+        """Map a product's variation references onto raw variant dicts"""
+        variants = []
+        for ref in item.get('variations') or []:
+            variation = variations.get(ref['id'], {})
+            variant_price = self.to_price(variation.get('prices'))
+            variants.append({
+                'size': self.variation_size(ref.get('attributes') or []),
+                'price': variant_price if variant_price is not None else fallback_price,
+                'sku': variation.get('sku', ''),
+                'in_stock': variation.get('is_in_stock', True)
+            })
+        return variants
+
+    def to_raw_product(self, item: Dict, variations: Dict[int, Dict]) -> Dict:
+        """Map a Store API product onto the dict produced by parse_product_html"""
+        name = html_lib.unescape(item.get('name', ''))
+        product_data = {
+            'url': item.get('permalink', ''),
+            'scraped_at': datetime.now().isoformat(),
+        }
+        if name:
+            product_data['name'] = name
+            product_data['handle'] = create_handle(name)
+        if item.get('sku'):
+            product_data['sku'] = item['sku']
+
+        price = self.to_price(item.get('prices'))
+        if price is not None:
+            product_data['price'] = price
+
+        short_desc = BeautifulSoup(item.get('short_description') or '', 'lxml').text.strip()
+        if short_desc:
+            product_data['short_description'] = short_desc
+
+        description = BeautifulSoup(item.get('description') or '', 'lxml')
+        if description.text.strip():
+            product_data['full_description'] = description.text.strip()
+
+        product_data['images'] = [
+            image['src'] for image in (item.get('images') or [])[:5]  # Limit to 5 images
+            if image.get('src', '').startswith('http')
+        ]
+
+        variants = self.to_variants(item, variations, product_data.get('price', 0))
+        product_data['variants'] = variants if variants else [default_variant(product_data)]
+
+        categories = []
+        for category in item.get('categories') or []:
+            cat_text = html_lib.unescape(category.get('name', '')).strip()
+            if cat_text and cat_text not in categories:
+                categories.append(cat_text)
+        product_data['categories'] = categories
+
+        specs = extract_specifications(description)
+        product_data['specifications'] = apply_peptide_defaults(specs, product_data.get('name', ''), categories)
+        return product_data
+
+    async def sitemap_product_urls(self) -> List[str]:
+        """Product URLs from the first sitemap that lists any"""
+        for path in self.SITEMAP_PATHS:
+            urls = await self.read_sitemap(f"{self.base_url}{path}")
+            if urls:
+                print(f"Found {len(urls)} product URLs in {path}")
+                return urls
+        return []
+
+    async def read_sitemap(self, url: str, depth: int = 0) -> List[str]:
+        """Read a sitemap or sitemap index, following product sub-sitemaps"""
+        try:
+            response = await self.fetch(url)
+            if response.status != 200:
+                return []
+            root = ElementTree.fromstring(await response.body())
+        except Exception as e:
+            print(f"  Could not read sitemap {url}: {e}")
+            return []
+
+        locs = [loc.text.strip() for loc in root.iter(f"{self.SITEMAP_NS}loc") if loc.text]
+        if root.tag == f"{self.SITEMAP_NS}sitemapindex":
+            if depth >= 2:
+                return []
+            children = await asyncio.gather(*(
+                self.read_sitemap(child, depth + 1) for child in locs if 'product' in child
+            ))
+            return [url for child_urls in children for url in child_urls]
+
+        return [loc for loc in locs if '/product/' in loc]
+
+
+class PageArchive:
+    """Gzipped JSONL archive of fetched product pages for offline, browser-free replay
+
+    A recording that reaches the end of the crawl appends a ``complete`` entry; an
+    archive without one was cut short, and replaying it would drop the products the
+    crawl never reached.
+    """
+
+    DEFAULT_PATH = Path(__file__).parent.parent / 'data' / '.cache' / 'page-archive.jsonl.gz'
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.output = None
+        self.recorded = 0
+
+    def open_for_recording(self, append: bool = False):
+        """Start a new archive, or add gzip members to an existing one"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.output = gzip.open(self.path, 'at' if append else 'wt', encoding='utf-8')
+
+    def record(self, url: str, source: str, headers: Dict[str, str], html: str):
+        """Append one fetched page"""
+        if not self.output:
+            return
+        entry = {'url': url, 'source': source, 'headers': dict(headers), 'html': html,
+                 'recorded_at': datetime.now().isoformat()}
+        self.output.write(json.dumps(entry) + '\n')
+        self.recorded += 1
+
+    def record_variations(self, url: str, product_id: Any, variants: List[Dict]):
+        """Append the Store API variations a page deferred to AJAX, so replay can re-apply them"""
+        if not self.output:
+            return
+        entry = {'kind': 'variations', 'url': url, 'product_id': str(product_id), 'variants': variants,
+                 'recorded_at': datetime.now().isoformat()}
+        self.output.write(json.dumps(entry) + '\n')
+
+    def mark_complete(self, discovered: int):
+        """Record that the crawl finished, so replay can trust the archive to cover the catalog"""
+        if not self.output:
+            return
+        entry = {'kind': 'complete', 'discovered': discovered, 'recorded_at': datetime.now().isoformat()}
+        self.output.write(json.dumps(entry) + '\n')
+
+    def is_complete(self) -> bool:
+        """Whether a recording run finished writing this archive"""
+        return any(entry.get('kind') == 'complete' for entry in self.iter_entries())
+
+    def close(self):
+        """Finish the gzip stream"""
+        if self.output:
+            self.output.close()
+            self.output = None
+
+    def iter_entries(self):
+        """Stream every archived page in recording order"""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def iter_latest(self):
+        """Stream the last capture of each URL (a browser render supersedes the HTTP attempt)"""
+        latest: Dict[str, int] = {}
+        for position, entry in enumerate(self.iter_entries()):
+            if 'kind' not in entry:
+                latest[entry['url']] = position
+        for position, entry in enumerate(self.iter_entries()):
+            if 'kind' not in entry and latest[entry['url']] == position:
+                yield entry
+
+    def latest_variations(self) -> Dict[str, List[Dict]]:
+        """Last recorded AJAX variations per WooCommerce product id"""
+        variations = {}
+        for entry in self.iter_entries():
+            if entry.get('kind') == 'variations':
+                variations[entry['product_id']] = entry['variants']
+        return variations
+
+    def batches(self, size: int):
+        """Group the latest captures into lists of at most ``size`` pages"""
+        batch = []
+        for entry in self.iter_latest():
+            batch.append(entry)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+class SampleReservoir:
+    """Exact count, sum and max of a metric plus a fixed-size uniform sample for percentiles
+
+    Reservoir sampling (Algorithm R) keeps memory constant however many pages a
+    crawl visits; percentiles come from the sample, the totals stay exact.
+    """
+
+    CAPACITY = 4096
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or self.CAPACITY
+        self.count = 0
+        self.total = 0.0
+        self.max: Optional[float] = None
+        self.sample: List[float] = []
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, value: float):
+        """Record one observation"""
+        self.count += 1
+        self.total += value
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self.sample) < self.capacity:
+            self.sample.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.capacity:
+                self.sample[slot] = value
+
+    def percentile(self, quantile: float) -> float:
+        """Nearest-rank percentile of the sample"""
+        ordered = sorted(self.sample)
+        return ordered[max(1, math.ceil(len(ordered) * quantile)) - 1]
+
+
+class CrawlTelemetry:
+    """Per-URL crawl metrics streamed to JSONL and summarized as percentiles"""
+
+    DEFAULT_PATH = Path(__file__).parent.parent / 'data' / '.cache' / 'scrape-metrics.jsonl'
+
+    # field -> (label, Prometheus metric, help text, scale to base unit)
+    METRICS = {
+        'nav_ms': ('navigation', 'scraper_page_navigation_seconds',
+                   'Time to fetch or navigate to a product page', 0.001),
+        'ready_ms': ('ready', 'scraper_page_ready_seconds',
+                     'Time from DOMContentLoaded until the extractor signals are present', 0.001),
+        'parse_ms': ('parse', 'scraper_page_parse_seconds', 'Time to extract a product from its HTML', 0.001),
+        'bytes': ('bytes', 'scraper_page_bytes', 'Bytes transferred while loading a product page', 1),
+        'requests': ('requests', 'scraper_page_requests', 'Network requests issued for a product page', 1),
+        'retries': ('retries', 'scraper_page_retries', 'Extra fetch attempts for a product page', 1),
+    }
+    QUANTILES = (0.5, 0.95, 0.99)
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.active: Dict[str, Dict] = {}
+        self.samples: Dict[str, SampleReservoir] = {field: SampleReservoir() for field in self.METRICS}
+        self.outcomes: Dict[str, int] = {}
+        self.output = None
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.output = open(self.path, 'w')
+
+    def entry(self, url: str) -> Dict:
+        """Return the in-progress metrics for a URL"""
+        if url not in self.active:
+            self.active[url] = {'url': url, 'source': None, 'status': None, 'nav_ms': 0.0, 'ready_ms': None,
+                                'parse_ms': None, 'bytes': 0, 'requests': 0, 'retries': 0,
+                                'started': time.perf_counter()}
+        return self.active[url]
+
+    def add(self, url: str, **increments):
+        """Accumulate counters and timings across every attempt at a URL"""
+        entry = self.entry(url)
+        for key, value in increments.items():
+            entry[key] = (entry[key] or 0) + value
+
+    def set(self, url: str, **values):
+        """Record the latest value of a per-URL field"""
+        self.entry(url).update(values)
+
+    def finish(self, url: str, outcome: str):
+        """Close out a URL and stream its metrics line"""
+        entry = self.active.pop(url, None)
+        if entry is None:
+            return
+        entry['outcome'] = outcome
+        entry['total_ms'] = round((time.perf_counter() - entry.pop('started')) * 1000, 1)
+        for field in self.METRICS:
+            if entry[field] is not None:
+                if isinstance(entry[field], float):
+                    entry[field] = round(entry[field], 1)
+                self.samples[field].add(entry[field])
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        if self.output:
+            self.output.write(json.dumps(entry) + '\n')
+            self.output.flush()
+
+    def close(self):
+        """Flush any URLs that never finished and close the JSONL file"""
+        for url in list(self.active):
+            self.finish(url, 'incomplete')
+        if self.output and not self.output.closed:
+            self.output.close()
+
+    def summary(self) -> List[str]:
+        """p50 / p95 / p99 for every metric that has samples"""
+        lines = []
+        for field, (label, _, _, _) in self.METRICS.items():
+            values = self.samples[field]
+            if not values:
+                continue
+            if field.endswith('_ms'):
+                points = [f"{values.percentile(q):.0f}ms" for q in self.QUANTILES]
+            elif field == 'bytes':
+                points = [f"{values.percentile(q) / 1024:.1f}KB" for q in self.QUANTILES]
+            else:
+                points = [f"{values.percentile(q):g}" for q in self.QUANTILES]
+            lines.append(f"  {label:<11} {' / '.join(points)}  (n={len(values)})")
+        return lines
+
+    def write_prometheus(self, path: Path):
+        """Export the run as a node_exporter textfile (written atomically)"""
+        lines = []
+        for field, (_, metric, help_text, scale) in self.METRICS.items():
+            values = self.samples[field]
+            if not values:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} summary")
+            for quantile in self.QUANTILES:
+                lines.append(f'{metric}{{quantile="{quantile}"}} {values.percentile(quantile) * scale:g}')
+            lines.append(f"{metric}_sum {values.total * scale:g}")
+            lines.append(f"{metric}_count {values.count}")
+        lines.append("# HELP scraper_pages_total Product pages by final outcome")
+        lines.append("# TYPE scraper_pages_total counter")
+        for outcome, count in sorted(self.outcomes.items()):
+            lines.append(f'scraper_pages_total{{outcome="{outcome}"}} {count}')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        tmp_path.replace(path)
+
+
+def chromium_rss(root_pid: int) -> Optional[int]:
+    """Resident memory in bytes of every Chromium process descended from ``root_pid`` (Linux /proc only)"""
+    proc = Path('/proc')
+    if not proc.is_dir():
+        return None
+    children: Dict[int, List[int]] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # The command name may contain spaces, so split after its closing parenthesis
+            ppid = int((entry / 'stat').read_text().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry.name))
+
+    total, stack, page_size = 0, [root_pid], os.sysconf('SC_PAGE_SIZE')
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            name = (proc / str(pid) / 'comm').read_text().strip()
+            if name.startswith(('chrome', 'chromium', 'headless_shell')):
+                total += int((proc / str(pid) / 'statm').read_text().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
 
 class PremierBioLabsScraper:
     """Scraper for Premier Bio Labs peptide products"""
@@ -27,242 +1455,888 @@ class PremierBioLabsScraper:
     BASE_URL = "https://premierbiolabs.com"
     SHOP_URL = f"{BASE_URL}/shop"
 
-    def __init__(self):
+    CONTEXT_OPTIONS = {
+        'viewport': {'width': 1920, 'height': 1080},
+        'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    }
+
+    # Safety limits for catalog discovery
+    MAX_LISTING_PAGES = 500
+    MAX_SCROLLS = 50
+
+    # Fields the server-rendered HTML must provide before the browser can be skipped
+    HTTP_REQUIRED_FIELDS = ('name', 'price', 'full_description')
+
+    # Archived pages handed to the parse pool at a time during replay
+    REPLAY_BATCH = 256
+
+    # Worker contexts are replaced after this many pages, or sooner when memory limits are hit
+    RECYCLE_AFTER_PAGES = 200
+    RECYCLE_HEAP_MB = 256
+    RSS_SAMPLE_EVERY = 10
+
+    # Retries for failed product fetches, with jittered exponential delay between attempts
+    MAX_RETRIES = 3
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 30.0
+
+    def __init__(self, concurrency: int = 4, per_host_limit: int = 2, min_request_interval: float = 0.5,
+                 http_first: bool = False, base_url: Optional[str] = None, cache: Optional[PageCache] = None,
+                 block_resources: bool = False, allow_domains: Optional[List[str]] = None,
+                 catalog_source: str = 'listing', parser: str = 'compiled', parse_workers: Optional[int] = None,
+                 sink: Optional[ProductSink] = None, telemetry: Optional[CrawlTelemetry] = None,
+                 archive: Optional[PageArchive] = None, browser_endpoint: Optional[str] = None,
+                 adaptive: bool = True, max_retries: Optional[int] = None,
+                 recycle_after: Optional[int] = None, recycle_heap_mb: Optional[float] = None,
+                 max_browser_rss_mb: Optional[float] = None):
+        if base_url:
+            self.BASE_URL = base_url.rstrip('/')
+            self.SHOP_URL = f"{self.BASE_URL}/shop"
         self.products: List[Dict] = []
+        self.concurrency = max(1, concurrency)
+        # Adaptive mode lets each host's in-flight limit float between 1 and the worker count
+        self.throttle = HostThrottle(per_host_limit, min_request_interval, self.concurrency if adaptive else None)
+        self.max_retries = self.MAX_RETRIES if max_retries is None else max(0, max_retries)
+        self.http_first = http_first
+        self.catalog_source = catalog_source
+        self.parser = parser
+        self.parse_workers = min(4, os.cpu_count() or 1) if parse_workers is None else max(0, parse_workers)
+        self.parse_pool: Optional[ProcessPoolExecutor] = None
+        self.discovery_slots = asyncio.Semaphore(self.concurrency * 4)
+        self.requeued = 0
+        # Backoff timers of failed URLs waiting to be re-queued
+        self.retry_timers: set = set()
+        self.catalog = WooCommerceCatalog(self.BASE_URL, self.fetch_retrying)
+        self.cache = cache
+        self.sink = sink
+        self.telemetry = telemetry or CrawlTelemetry()
+        self.archive = archive
+        self.page_traffic: List[Dict[str, int]] = [{'bytes': 0, 'requests': 0} for _ in range(self.concurrency)]
+        self.recycle_after = self.RECYCLE_AFTER_PAGES if recycle_after is None else recycle_after
+        self.recycle_heap_mb = self.RECYCLE_HEAP_MB if recycle_heap_mb is None else recycle_heap_mb
+        self.max_browser_rss_mb = max_browser_rss_mb
+        self.cdp_sessions: List = [None] * self.concurrency
+        self.page_visits: List[int] = [0] * self.concurrency
+        self.memory = {'recycled': 0, 'peak_rss_mb': 0.0, 'peak_heap_mb': [0.0] * self.concurrency, 'rss_samples': 0}
+        self.resumed = 0
+        self.block_resources = block_resources
+        self.allow_domains = allow_domains or []
+        self.blockers: List[Optional[RequestBlocker]] = [None] * self.concurrency
+        self.known_sizes = RequestBlocker.load_known_sizes() if block_resources else {}
+        self.playwright = None
         self.browser = None
+        self.browser_endpoint = browser_endpoint
+        self.attached = False
+        self.browser_pid: Optional[int] = None
+        self.http = None
         self.page = None
+        self.pages: List[Optional[Page]] = [None] * self.concurrency
+        self.listing_needs_browser = False
+        self._browser_lock = asyncio.Lock()
+        self.stats = {'http': 0, 'browser': 0, 'unchanged': 0, 'ajax_variations': 0}
+        self.blocked_report: Optional[str] = None
+        self.readiness = ReadinessEngine()
+        self.ready_ms = SampleReservoir()
+        self.ready_timeouts = 0
 
     async def initialize(self):
-        """Initialize browser and page"""
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=True,
-            args=['--disable-blink-features=AutomationControlled']
-        )
-        context = await self.browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        """Start Playwright; the browser is only launched up front when not in HTTP-first mode"""
+        self.playwright = await async_playwright().start()
+        # APIRequestContext is a pooled keep-alive HTTP client that needs no browser; browser mode
+        # still uses it for Store API calls such as AJAX-deferred variations
+        self.http = await self.playwright.request.new_context(
+            user_agent=self.CONTEXT_OPTIONS['user_agent']
         )
-        self.page = await context.new_page()
+        if not self.http_first and self.catalog_source == 'listing':
+            await self.get_listing_page()
+
+    async def launch_browser(self):
+        """Launch Chromium once, on first use"""
+        async with self._browser_lock:
+            if not self.browser and self.browser_endpoint:
+                try:
+                    self.browser = await self.playwright.chromium.connect_over_cdp(self.browser_endpoint)
+                    self.attached = True
+                    # The health check reads a state file and probes DevTools over HTTP, so keep it off the loop
+                    health = await asyncio.to_thread(BrowserDaemon().health)
+                    self.browser_pid = health['pid'] if health else None
+                    print(f"✓ Attached to browser daemon at {self.browser_endpoint}")
+                except Exception as e:
+                    print(f"✗ Could not attach to {self.browser_endpoint} ({e}); launching Chromium")
+            if not self.browser:
+                self.browser = await self.playwright.chromium.launch(
+                    headless=True,
+                    args=['--disable-blink-features=AutomationControlled']
+                )
+
+    async def get_worker_page(self, worker_id: int) -> Page:
+        """Return the worker's dedicated page, creating its isolated context on first use"""
+        if not self.pages[worker_id]:
+            if self.block_resources and not self.blockers[worker_id]:
+                self.blockers[worker_id] = RequestBlocker(urlparse(self.BASE_URL).hostname, self.allow_domains, self.known_sizes)
+            self.pages[worker_id] = await self.open_page(self.blockers[worker_id])
+            await self.track_traffic(self.pages[worker_id].context, worker_id)
+        return self.pages[worker_id]
+
+    async def open_page(self, blocker: Optional[RequestBlocker] = None) -> Page:
+        """New page in its own isolated context, or a tab in the daemon's warm profile when attached"""
+        await self.launch_browser()
+        if self.attached:
+            # The daemon's default context keeps its disk cache and connections between runs
+            page = await self.browser.contexts[0].new_page()
+            await page.set_viewport_size(self.CONTEXT_OPTIONS['viewport'])
+            if blocker:
+                await page.route('**/*', blocker.handle)
+            return page
+
+        context = await self.browser.new_context(**self.CONTEXT_OPTIONS)
+        if blocker:
+            await context.route('**/*', blocker.handle)
+        return await context.new_page()
+
+    async def track_traffic(self, context, worker_id: int):
+        """Count requests and encoded bytes on a worker page through the Chromium network domain"""
+        traffic = self.page_traffic[worker_id]
+
+        def on_request(_event):
+            traffic['requests'] += 1
+
+        def on_loaded(event):
+            traffic['bytes'] += int(event.get('encodedDataLength', 0))
+
+        try:
+            session = await context.new_cdp_session(self.pages[worker_id])
+            session.on('Network.requestWillBeSent', on_request)
+            session.on('Network.loadingFinished', on_loaded)
+            await session.send('Network.enable')
+            await session.send('Performance.enable')
+            self.cdp_sessions[worker_id] = session
+        except Exception as e:
+            print(f"  Network metrics unavailable for worker {worker_id}: {e}")
+
+    async def js_heap_mb(self, worker_id: int) -> Optional[float]:
+        """Used JS heap of a worker page, from the Chromium performance domain"""
+        session = self.cdp_sessions[worker_id]
+        if not session:
+            return None
+        try:
+            metrics = await session.send('Performance.getMetrics')
+        except Exception:
+            return None
+        for metric in metrics.get('metrics', []):
+            if metric['name'] == 'JSHeapUsedSize':
+                return metric['value'] / 1024 / 1024
+        return None
+
+    async def browser_rss_mb(self) -> Optional[float]:
+        """Resident memory of the Chromium processes this run launched (or the daemon it attached to)"""
+        root_pid = self.browser_pid if self.attached else os.getpid()
+        if root_pid is None:
+            return None
+        # Walking /proc takes a while on a busy host; run it in a thread so page work continues
+        rss = await asyncio.to_thread(chromium_rss, root_pid)
+        return rss / 1024 / 1024 if rss is not None else None
+
+    async def after_page(self, worker_id: int, product_url: str):
+        """Track worker memory after a navigation and recycle its context when a limit is reached"""
+        self.page_visits[worker_id] += 1
+        reason = None
+
+        heap = await self.js_heap_mb(worker_id)
+        if heap is not None:
+            self.telemetry.set(product_url, js_heap_mb=round(heap, 1))
+            self.memory['peak_heap_mb'][worker_id] = max(self.memory['peak_heap_mb'][worker_id], heap)
+            if self.recycle_heap_mb and heap >= self.recycle_heap_mb:
+                reason = f"JS heap {heap:.0f} MB"
+
+        self.memory['rss_samples'] += 1
+        if self.memory['rss_samples'] % self.RSS_SAMPLE_EVERY == 0:
+            rss = await self.browser_rss_mb()
+            if rss is not None:
+                self.memory['peak_rss_mb'] = max(self.memory['peak_rss_mb'], rss)
+                if self.max_browser_rss_mb and rss >= self.max_browser_rss_mb and not reason:
+                    reason = f"browser RSS {rss:.0f} MB"
+
+        if not reason and self.recycle_after and self.page_visits[worker_id] >= self.recycle_after:
+            reason = f"{self.page_visits[worker_id]} pages"
+        if reason:
+            await self.recycle_worker(worker_id, reason)
+
+    async def recycle_worker(self, worker_id: int, reason: str):
+        """Close a worker's page and context so its renderer memory is returned; the next fetch opens fresh ones"""
+        page = self.pages[worker_id]
+        self.pages[worker_id] = None
+        self.cdp_sessions[worker_id] = None
+        self.page_visits[worker_id] = 0
+        if not page:
+            return
+        try:
+            if self.attached:
+                await page.close()
+            else:
+                await page.context.close()
+        except Exception as e:
+            print(f"  Error closing worker {worker_id} context: {e}")
+        self.memory['recycled'] += 1
+        print(f"♻ Recycled worker {worker_id} context ({reason})")
+
+    def blocked_summary(self) -> Optional[str]:
+        """Total requests, and estimated bytes, avoided by request interception"""
+        blockers = [blocker for blocker in self.blockers if blocker]
+        pages = sum(blocker.page_count for blocker in blockers)
+        if not pages:
+            return None
+        by_type: Dict[str, int] = {}
+        for blocker in blockers:
+            for resource_type, count in blocker.blocked_by_type.items():
+                by_type[resource_type] = by_type.get(resource_type, 0) + count
+        requests = sum(blocker.blocked_requests for blocker in blockers)
+        sized = sum(blocker.sized_requests for blocker in blockers)
+        avoided_bytes = sum(blocker.avoided_bytes for blocker in blockers)
+        return (f"  Blocked {requests} requests across {pages} pages ({format_type_counts(by_type) or 'none'}"
+                f"{format_avoided_bytes(avoided_bytes, sized, requests)})")
 
     async def close(self):
-        """Clean up browser resources"""
+        """Clean up browser resources and stop the Playwright driver"""
+        for timer in list(self.retry_timers):
+            timer.cancel()
+        if self.cache:
+            self.cache.save()
+            self.cache.close()
+        self.blocked_report = self.blocked_summary()
+        if self.http:
+            await self.http.dispose()
+        if self.attached:
+            # Only close our own tabs; the daemon and its warm profile keep running
+            for page in [self.page, *self.pages]:
+                if page and not page.is_closed():
+                    await page.close()
         if self.browser:
+            # For an attached browser this just disconnects
             await self.browser.close()
+        # Forked parse workers inherit the driver's pipe, so they must exit before the driver can
+        if self.parse_pool:
+            self.parse_pool.shutdown()
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        if self.archive:
+            self.archive.close()
+        self.telemetry.close()
 
-    async def extract_product_data(self, product_url: str) -> Optional[Dict]:
-        """Extract detailed product information from a product page"""
+    @staticmethod
+    def is_congested(status: int) -> bool:
+        """Responses that mean the origin wants us to slow down"""
+        return is_congested(status)
+
+    @staticmethod
+    def retry_after(headers: Dict[str, str]) -> Optional[float]:
+        """Seconds requested by a Retry-After header (delta-seconds form only)"""
+        return parse_retry_after(headers)
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        return backoff_delay(attempt, retry_after, self.RETRY_BASE_DELAY, self.RETRY_MAX_DELAY)
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Issue a throttled GET through the pooled HTTP client, reporting its outcome to the throttle"""
+        async with self.throttle.slot(url):
+            started = time.perf_counter()
+            try:
+                response = await self.http.get(url, headers=headers, timeout=30000)
+            except PlaywrightTimeoutError:
+                self.throttle.record(url, congested=True)
+                raise RetryableError(f"timeout fetching {url}")
+            congested = self.is_congested(response.status)
+            self.throttle.record(url, time.perf_counter() - started, congested,
+                                 self.retry_after(response.headers) if congested else None)
+            return response
+
+    async def fetch_checked(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Like fetch(), but 429/5xx responses raise RetryableError"""
+        response = await self.fetch(url, headers)
+        if self.is_congested(response.status):
+            raise RetryableError(f"HTTP {response.status}", retry_after=self.retry_after(response.headers))
+        return response
+
+    async def retrying(self, url: str, operation):
+        """Await ``operation()`` until it stops raising RetryableError, backing off between attempts"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await operation()
+            except RetryableError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_delay(attempt, e.retry_after)
+                print(f"↻ Retry {attempt + 1}/{self.max_retries} for {url} in {delay:.1f}s ({e})")
+                await asyncio.sleep(delay)
+
+    async def fetch_retrying(self, url: str, headers: Optional[Dict[str, str]] = None):
+        """Throttled GET retried with backoff while the origin is congested, for requests outside the worker queue"""
+        return await self.retrying(url, lambda: self.fetch_checked(url, headers))
+
+    async def fetch_html(self, url: str) -> Optional[str]:
+        """Fetch a page over plain HTTP, returning None on non-200 responses; 429/5xx raise RetryableError"""
+        response = await self.fetch_checked(url)
+        if response.status != 200:
+            print(f"  HTTP {response.status} for {url}")
+            return None
+        return await response.text()
+
+    def reuse_cached(self, product_url: str, record: Dict) -> Dict:
+        """Count and report a product answered from the page cache, as a job for the fetch stage"""
+        self.stats['unchanged'] += 1
+        self.telemetry.set(product_url, source='cache')
+        print(f"= Unchanged: {record.get('name', product_url)}")
+        return {'record': record, 'url': product_url,
+                'ajax_product_id': self.cache.get(product_url).get('ajax_product_id')}
+
+    async def finish_cached(self, job: Dict) -> Optional[Dict]:
+        """Return a cached record with its AJAX variations refreshed; an unchanged page says nothing about them"""
+        record = job['record']
+        if not await self.load_ajax_variations(record, {'ajax_variations_product_id': job.get('ajax_product_id')}):
+            return None
+        return record
+
+    def find_missing_fields(self, product_data: Dict, diagnostics: Dict) -> List[str]:
+        """List the fields an HTTP-parsed product lacks and that a browser render may provide"""
+        missing = [field for field in self.HTTP_REQUIRED_FIELDS if not product_data.get(field)]
+        # AJAX-loaded variations are absent from the rendered page too; they come from the Store API instead
+        if (diagnostics.get('has_variation_form') and not diagnostics.get('variations_from_json')
+                and not diagnostics.get('ajax_variations_product_id')):
+            missing.append('variations')
+        return missing
+
+    async def load_ajax_variations(self, product_data: Dict, diagnostics: Dict) -> bool:
+        """Replace size-select placeholder variants with real ones when the page defers variations to AJAX
+
+        Returns False when the variations could not be loaded: the placeholders carry the
+        parent's price for every size, so the product must fail rather than be saved.
+        """
+        product_id = diagnostics.get('ajax_variations_product_id')
+        if not product_id:
+            return True
         try:
-            await self.page.goto(product_url, wait_until='networkidle')
-            await asyncio.sleep(2)  # Allow dynamic content to load
+            variants = await self.catalog.fetch_product_variants(product_id, product_data.get('price', 0))
+        except Exception as e:
+            print(f"✗ Variations unavailable for {product_data.get('url')}: {e}")
+            return False
+        if self.archive:
+            # Recorded even when empty, so replay knows the placeholders were kept on purpose
+            self.archive.record_variations(product_data.get('url'), product_id, variants)
+        if variants:
+            product_data['variants'] = variants
+            self.stats['ajax_variations'] += 1
+            print(f"  Loaded {len(variants)} variations for product {product_id} from the Store API")
+        return True
 
-            # Get page HTML
-            html = await self.page.content()
-            soup = BeautifulSoup(html, 'lxml')
+    def make_parse_job(self, product_url: str, html: str, headers: Dict[str, str], source: str) -> Dict:
+        """Package a fetched page for the parse stage, short-circuiting unchanged pages"""
+        if self.archive:
+            self.archive.record(product_url, source, headers, html)
+        content_hash = PageCache.hash_content(html)
+        cached = self.cache.lookup(product_url, content_hash) if self.cache else None
+        if cached:
+            return self.reuse_cached(product_url, cached)
+        return {'url': product_url, 'html': html, 'headers': dict(headers), 'content_hash': content_hash,
+                'source': source}
 
-            # Extract product data
-            product_data = {
-                'url': product_url,
-                'scraped_at': datetime.now().isoformat(),
-            }
+    async def fetch_product_http(self, product_url: str) -> Optional[Dict]:
+        """Fetch server-rendered HTML; None means the browser is needed"""
+        try:
+            # The cache keeps records, not bodies: a 304 would leave nothing to archive, so a
+            # recording run fetches in full and relies on the content hash to skip re-parsing
+            headers = self.cache.conditional_headers(product_url) if self.cache and not self.archive else {}
+            started = time.perf_counter()
+            response = await self.fetch(product_url, headers)
+            body = await response.body()
+            self.telemetry.add(product_url, nav_ms=(time.perf_counter() - started) * 1000,
+                               bytes=len(body), requests=1)
+            self.telemetry.set(product_url, source='http', status=response.status)
+            cached = self.cache.record(product_url) if response.status == 304 and self.cache else None
+            if cached:
+                return self.reuse_cached(product_url, cached)
+            if self.is_congested(response.status):
+                raise RetryableError(f"HTTP {response.status}", retry_after=self.retry_after(response.headers))
+            if response.status != 200:
+                print(f"  HTTP {response.status} for {product_url}")
+                return None
+            return self.make_parse_job(product_url, body.decode('utf-8', errors='replace'), response.headers, 'http')
 
-            # Product name
-            title_elem = soup.find('h1', class_='product_title') or soup.find('h1')
-            if title_elem:
-                product_data['name'] = title_elem.text.strip()
-                product_data['handle'] = self.create_handle(product_data['name'])
-
-            # SKU
-            sku_elem = soup.find('span', class_='sku') or soup.find('meta', {'property': 'product:retailer_item_id'})
-            if sku_elem:
-                product_data['sku'] = sku_elem.text.strip() if hasattr(sku_elem, 'text') else sku_elem.get('content')
-
-            # Price
-            price_elem = soup.find('p', class_='price') or soup.find('span', class_='amount')
-            if price_elem:
-                price_text = price_elem.text.strip()
-                # Extract numeric price
-                price_match = re.search(r'[\d,]+\.?\d*', price_text)
-                if price_match:
-                    product_data['price'] = float(price_match.group().replace(',', ''))
-
-            # Short description
-            short_desc = soup.find('div', class_='woocommerce-product-details__short-description')
-            if short_desc:
-                product_data['short_description'] = short_desc.text.strip()
-
-            # Full description
-            full_desc = soup.find('div', {'id': 'tab-description'}) or soup.find('div', class_='woocommerce-Tabs-panel--description')
-            if full_desc:
-                product_data['full_description'] = full_desc.text.strip()
-
-            # Images
-            images = []
-            gallery = soup.find_all('img', class_='wp-post-image') or soup.find_all('img', {'data-large_image': True})
-            for img in gallery[:5]:  # Limit to 5 images
-                img_url = img.get('data-large_image') or img.get('src')
-                if img_url and img_url.startswith('http'):
-                    images.append(img_url)
-            product_data['images'] = images
-
-            # Variants (size options)
-            variants = []
-
-            # Try to find variation form
-            variation_form = soup.find('form', class_='variations_form')
-            if variation_form:
-                # Extract variations data
-                variations_data = variation_form.get('data-product_variations')
-                if variations_data:
-                    try:
-                        variations_json = json.loads(variations_data)
-                        for var in variations_json:
-                            variant = {
-                                'size': var.get('attributes', {}).get('attribute_pa_size', ''),
-                                'price': var.get('display_price', 0),
-                                'sku': var.get('sku', ''),
-                                'in_stock': var.get('is_in_stock', True)
-                            }
-                            variants.append(variant)
-                    except:
-                        pass
-
-            # Fallback: Check for size dropdown
-            if not variants:
-                size_select = soup.find('select', {'name': re.compile('attribute_pa_size|attribute_size')})
-                if size_select:
-                    options = size_select.find_all('option')[1:]  # Skip first empty option
-                    for opt in options:
-                        size = opt.text.strip()
-                        if size:
-                            variants.append({
-                                'size': size,
-                                'price': product_data.get('price', 0),
-                                'sku': f"{product_data.get('sku', 'PBL')}-{size.replace(' ', '')}",
-                                'in_stock': True
-                            })
-
-            product_data['variants'] = variants if variants else [
-                {
-                    'size': 'Standard',
-                    'price': product_data.get('price', 0),
-                    'sku': product_data.get('sku', 'PBL-STD'),
-                    'in_stock': True
-                }
-            ]
+        except RetryableError:
+            raise
+        except Exception as e:
+            print(f"↪ Browser fallback for {product_url}: {e}")
+            return None
+
+    async def fetch_product_rendered(self, product_url: str, page: Page) -> Optional[Dict]:
+        """Render a product page in the browser and capture its HTML; failures raise for the retry loop"""
+        blocker = self.blocker_for(page)
+        traffic = self.traffic_for(page)
+        try:
+            if blocker:
+                blocker.begin_page(product_url)
+            traffic.update(bytes=0, requests=0)
+            async with self.throttle.slot(product_url):
+                started = time.perf_counter()
+                try:
+                    response = await page.goto(product_url, wait_until='domcontentloaded')
+                except PlaywrightTimeoutError:
+                    self.throttle.record(product_url, congested=True)
+                    raise RetryableError(f"navigation timeout for {product_url}")
+                elapsed = time.perf_counter() - started
+                self.telemetry.add(product_url, nav_ms=elapsed * 1000)
+                status = response.status if response else 200
+                retry_after = self.retry_after(response.headers) if response else None
+                self.throttle.record(product_url, elapsed, self.is_congested(status), retry_after)
+            self.telemetry.set(product_url, source='browser', status=response.status if response else None)
+            if self.is_congested(status):
+                raise RetryableError(f"HTTP {status}", retry_after=retry_after)
+
+            # Wait for the elements the extractor reads rather than a fixed delay
+            ready = await self.readiness.wait(page, ReadinessEngine.PRODUCT_SIGNALS)
+            self.record_ready(ready)
+            self.telemetry.set(product_url, ready_ms=ready['ready_ms'])
+            if ready['missing']:
+                print(f"  Not ready after timeout ({', '.join(ready['missing'])}): {product_url}")
+
+            # Get page HTML
+            html = await page.content()
+            self.telemetry.add(product_url, **traffic)
+            return self.make_parse_job(product_url, html, response.headers if response else {}, 'browser')
 
-            # Categories
-            categories = []
-            cat_links = soup.find_all('a', {'rel': 'tag'}) or soup.find_all('a', class_='product-category')
-            for cat in cat_links:
-                cat_text = cat.text.strip()
-                if cat_text and cat_text not in categories:
-                    categories.append(cat_text)
-            product_data['categories'] = categories
-
-            # Specifications (if available in table format)
-            specs = {}
-            spec_tables = soup.find_all('table')
-            for table in spec_tables:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        key = cells[0].text.strip()
-                        value = cells[1].text.strip()
-                        if key and value:
-                            specs[key] = value
-
-            # Add default specifications for peptides
-            if 'peptide' in product_data.get('name', '').lower() or any('peptide' in cat.lower() for cat in categories):
-                specs.setdefault('Purity', '>98%')
-                specs.setdefault('Form', 'Lyophilized Powder')
-                specs.setdefault('Storage', 'Store at -20°C')
-                specs.setdefault('Research Use', 'Laboratory Research Only')
-
-            product_data['specifications'] = specs
-
-            print(f"✓ Scraped: {product_data.get('name', 'Unknown')}")
-            return product_data
+        finally:
+            if blocker:
+                blocker.end_page()
 
+    async def extract_product_data(self, product_url: str, page: Optional[Page] = None) -> Optional[Dict]:
+        """Extract detailed product information from a product page"""
+        try:
+            job = await self.fetch_product_rendered(product_url, page or self.page)
         except Exception as e:
             print(f"✗ Error scraping {product_url}: {e}")
             return None
+        if not job:
+            return None
+        if 'record' in job:
+            return await self.finish_cached(job)
+        product_data, diagnostics = await self.parse_job(job)
+        if not await self.load_ajax_variations(product_data, diagnostics):
+            return None
+        return product_data
+
+    def traffic_for(self, page: Page) -> Dict[str, int]:
+        """Return the network counters of a worker page (a throwaway dict for other pages)"""
+        for worker_page, traffic in zip(self.pages, self.page_traffic):
+            if worker_page is page:
+                return traffic
+        return {'bytes': 0, 'requests': 0}
+
+    def blocker_for(self, page: Page) -> Optional[RequestBlocker]:
+        """Return the request blocker attached to a worker page"""
+        for worker_page, blocker in zip(self.pages, self.blockers):
+            if worker_page is page:
+                return blocker
+        return None
+
+    async def fetch_product(self, product_url: str, worker_id: int, force_browser: bool = False) -> Optional[Dict]:
+        """Fetch one product page, trying plain HTTP first when enabled"""
+        self.telemetry.entry(product_url)
+        if self.http_first and not force_browser:
+            job = await self.fetch_product_http(product_url)
+            if job:
+                return job
+            self.telemetry.add(product_url, retries=1)
+
+        page = await self.get_worker_page(worker_id)
+        try:
+            return await self.fetch_product_rendered(product_url, page)
+        finally:
+            await self.after_page(worker_id, product_url)
+
+    async def parse_job(self, job: Dict) -> Tuple[Dict, Dict]:
+        """Run extraction in the process pool so the event loop keeps serving network I/O"""
+        if self.parse_pool:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.parse_pool, parse_product_page, job['html'], job['url'], self.parser)
+        return parse_product_page(job['html'], job['url'], self.parser)
 
     def create_handle(self, name: str) -> str:
         """Create URL-safe handle from product name"""
-        handle = name.lower()
-        handle = re.sub(r'[^a-z0-9\s-]', '', handle)
-        handle = re.sub(r'[-\s]+', '-', handle)
-        return handle.strip('-')
-
-    async def scrape_shop_page(self) -> List[str]:
-        """Get all product URLs from the shop page"""
-        print(f"Navigating to shop page: {self.SHOP_URL}")
-        await self.page.goto(self.SHOP_URL, wait_until='networkidle')
-        await asyncio.sleep(3)
-
-        # Scroll to load lazy-loaded products
-        await self.page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-        await asyncio.sleep(2)
-
-        # Extract product links
-        product_links = await self.page.evaluate('''() => {
+        return create_handle(name)
+
+    def record_ready(self, ready: Dict):
+        """Fold one page's readiness wait into the running stats"""
+        self.ready_ms.add(ready['ready_ms'])
+        if ready['missing']:
+            self.ready_timeouts += 1
+
+    def readiness_summary(self) -> Optional[str]:
+        """Summarize how long browser-rendered pages took to become ready"""
+        if not self.ready_ms.count:
+            return None
+        return (f"  Ready time: median {self.ready_ms.percentile(0.5):.0f}ms, max {self.ready_ms.max:.0f}ms "
+                f"over {self.ready_ms.count} pages ({self.ready_timeouts} timed out)")
+
+    def extract_links_from_html(self, html: str) -> List[str]:
+        """Collect product URLs from raw listing HTML"""
+        return extract_product_links(html, self.BASE_URL)
+
+    async def get_listing_page(self) -> Page:
+        """Return the dedicated page used for catalog discovery"""
+        if not self.page:
+            blocker = None
+            if self.block_resources:
+                blocker = RequestBlocker(urlparse(self.BASE_URL).hostname, self.allow_domains, self.known_sizes)
+            self.page = await self.open_page(blocker)
+        return self.page
+
+    def shop_page_url(self, page_number: int) -> str:
+        """URL of a paginated shop listing page"""
+        return self.SHOP_URL if page_number == 1 else f"{self.SHOP_URL}/page/{page_number}/"
+
+    async def collect_page_links(self, page: Page) -> List[str]:
+        """Product links currently present in a rendered listing page"""
+        return await page.evaluate('''() => {
             const links = Array.from(document.querySelectorAll('a.woocommerce-LoopProduct-link, .product a[href*="/product/"], .products a[href*="/product/"]'));
             return [...new Set(links.map(a => a.href))].filter(href => href.includes('/product/'));
         }''')
 
-        print(f"Found {len(product_links)} product links")
+    async def scrape_shop_page(self, page_url: str, emit) -> bool:
+        """Stream product links from one listing page into ``emit``; False when the page does not exist"""
+        if self.http_first and not self.listing_needs_browser:
+            html = await self.fetch_html(page_url)
+            product_links = self.extract_links_from_html(html) if html else []
+            if product_links:
+                await emit(product_links)
+                return True
+            if page_url != self.SHOP_URL:
+                return False
+            # Listing is rendered client-side; use the browser for the remaining pages too
+            self.listing_needs_browser = True
+
+        page = await self.get_listing_page()
+        print(f"Navigating to shop page: {page_url}")
+        async with self.throttle.slot(page_url):
+            try:
+                response = await page.goto(page_url, wait_until='domcontentloaded')
+            except PlaywrightTimeoutError:
+                self.throttle.record(page_url, congested=True)
+                raise RetryableError(f"navigation timeout for {page_url}")
+        if response and self.is_congested(response.status):
+            raise RetryableError(f"HTTP {response.status}", retry_after=self.retry_after(response.headers))
+        if response and response.status >= 400:
+            return False
+        ready = await self.readiness.wait(page, ReadinessEngine.SHOP_SIGNALS)
+        self.record_ready(ready)
+
+        product_links = await self.collect_page_links(page)
 
         # If no links found, try alternative selectors
         if not product_links:
-            html = await self.page.content()
-            soup = BeautifulSoup(html, 'lxml')
+            product_links = self.extract_links_from_html(await page.content())
+        await emit(product_links)
+
+        # Keep scrolling while infinite scroll appends more products
+        link_selector = ReadinessEngine.SHOP_SIGNALS[0]['selector']
+        link_count = await page.evaluate('(selector) => document.querySelectorAll(selector).length', link_selector)
+        for _ in range(self.MAX_SCROLLS):
+            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
+            new_count = await self.readiness.wait_for_growth(page, link_selector, link_count)
+            if new_count <= link_count:
+                break
+            link_count = new_count
+            await emit(await self.collect_page_links(page))
+
+        return True
+
+    async def discover_product_urls(self, queue: asyncio.Queue) -> int:
+        """Producer: walk paginated listings and queue each new product URL as soon as it is found"""
+        seen = set()
+
+        async def emit(links: List[str]) -> int:
+            added = 0
+            for url in links:
+                if url not in seen:
+                    seen.add(url)
+                    if self.sink and self.sink.is_done(url):
+                        self.resumed += 1
+                        continue
+                    # Backpressure: discovery never runs far ahead of the fetch workers
+                    await self.discovery_slots.acquire()
+                    await queue.put((len(seen) - 1, url, False, 0))
+                    added += 1
+            return added
+
+        if self.catalog_source == 'sitemap':
+            await emit(await self.catalog.sitemap_product_urls())
+            if seen:
+                return len(seen)
+            print("No product sitemap found, crawling shop listing...")
 
-            # Look for product links in the page
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                if '/product/' in href:
-                    full_url = href if href.startswith('http') else f"{self.BASE_URL}{href}"
-                    if full_url not in product_links:
-                        product_links.append(full_url)
+        try:
+            for page_number in range(1, self.MAX_LISTING_PAGES + 1):
+                before = len(seen)
+                page_url = self.shop_page_url(page_number)
+                # Links already emitted by a failed attempt are de-duplicated by ``seen``
+                if not await self.retrying(page_url, lambda: self.scrape_shop_page(page_url, emit)):
+                    break
+                print(f"Found {len(seen) - before} new product links on listing page {page_number}")
+                if len(seen) == before:
+                    break
+        except Exception as e:
+            print(f"✗ Error crawling shop listing: {e}")
+
+        # If we didn't find product URLs, use known products
+        if not seen:
+            print("No products found via scraping, using known product list...")
+            known_products = [
+                'bpc-157', 'ghk-cu', 'tesamorelin', 'glp-2-t',
+                'glp-3-r', 'nad-plus', 'starter-kit-r', 'starter-kit-t'
+            ]
+            await emit([f"{self.BASE_URL}/product/{p}/" for p in known_products])
 
-        return product_links
+        return len(seen)
 
     async def scrape_all_products(self) -> List[Dict]:
-        """Main scraping function"""
+        """Main scraping function: discovery, page fetching and parsing run as concurrent stages"""
         await self.initialize()
 
         try:
-            # Get product URLs
-            product_urls = await self.scrape_shop_page()
-
-            # If we didn't find product URLs, use known products
-            if not product_urls:
-                print("No products found via scraping, using known product list...")
-                known_products = [
-                    'bpc-157', 'ghk-cu', 'tesamorelin', 'glp-2-t',
-                    'glp-3-r', 'nad-plus', 'starter-kit-r', 'starter-kit-t'
-                ]
-                product_urls = [f"{self.BASE_URL}/product/{p}/" for p in known_products]
-
-            # Scrape each product
-            for url in product_urls:
-                product_data = await self.extract_product_data(url)
-                if product_data:
-                    self.products.append(product_data)
-                await asyncio.sleep(1)  # Be respectful
+            if self.catalog_source == 'store-api':
+                products = await self.scrape_store_api()
+                if products:
+                    return self.collect_all(products)
+                print("Store API unavailable, crawling shop listing...")
+
+            if self.parse_workers:
+                self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+
+            # Discovery -> fetch workers -> bounded parse queue -> parse workers
+            url_queue: asyncio.Queue = asyncio.Queue()
+            parse_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, self.parse_workers) * 2)
+            # Without a sink, finished records are held here until the crawl ends
+            results: Dict[int, Dict] = {}
+            fetchers = [
+                asyncio.create_task(self._product_worker(worker_id, url_queue, parse_queue, results))
+                for worker_id in range(self.concurrency)
+            ]
+            parsers = [
+                asyncio.create_task(self._parse_worker(parse_queue, url_queue, results))
+                for _ in range(max(1, self.parse_workers))
+            ]
+
+            discovered = await self.discover_product_urls(url_queue)
+
+            # Browser fallbacks and retries are re-queued later, so drain until no new work appears
+            while True:
+                requeued = self.requeued
+                await url_queue.join()
+                await parse_queue.join()
+                if self.retry_timers:
+                    await asyncio.wait(set(self.retry_timers))
+                    continue
+                if self.requeued == requeued:
+                    break
+
+            for _ in fetchers:
+                await url_queue.put(None)
+            for _ in parsers:
+                await parse_queue.put(None)
+            await asyncio.gather(*fetchers, *parsers)
+            print(f"Discovered {discovered} product URLs")
+            if self.archive:
+                self.archive.mark_complete(discovered)
+            if self.resumed:
+                print(f"↪ Resumed: skipped {self.resumed} URLs already in {self.sink.path.name}")
+
+            # Keep discovery order regardless of which worker finished first
+            products = [results[index] for index in sorted(results)]
 
             # If still no products, add manual fallback data
-            if not self.products:
+            if not products and not (self.sink and self.sink.count):
                 print("Adding fallback product data...")
-                self.products = self.get_fallback_products()
+                products = self.get_fallback_products()
 
+            return self.collect_all(products)
+
+        finally:
+            await self.close()
+
+    def collect(self, results: Dict[int, Dict], index: int, product_data: Dict):
+        """Stream a finished record to the sink, or keep it for the ordered in-memory result"""
+        if self.sink:
+            self.sink.write(product_data.get('url') or f'#{index}', product_data)
+        else:
+            results[index] = product_data
+        self.telemetry.finish(product_data.get('url'), 'ok')
+
+    def collect_all(self, products: List[Dict]) -> List[Dict]:
+        """Finish a run: streamed records stay on disk, everything else becomes self.products"""
+        if not self.sink:
+            self.products = products
             return self.products
+        for index, product_data in enumerate(products):
+            self.collect({}, index, product_data)
+        self.products = []
+        return self.products
+
+    async def replay_products(self, archive: PageArchive) -> List[Dict]:
+        """Re-run extraction over recorded pages with no network access and no browser
+
+        Raises IncompleteCatalogError for an empty archive or one whose recording never
+        finished, rather than emitting a truncated catalog.
+        """
+        try:
+            if not archive.path.exists():
+                raise IncompleteCatalogError(f"no page archive at {archive.path}")
+            if not archive.is_complete():
+                raise IncompleteCatalogError(f"{archive.path.name} is from a recording that did not finish; "
+                                             f"re-record it (add --resume to continue that crawl)")
+            if self.parse_workers:
+                self.parse_pool = ProcessPoolExecutor(max_workers=self.parse_workers)
+            results: Dict[int, Dict] = {}
+            index = 0
+            started = time.perf_counter()
+            variations = archive.latest_variations()
+            for batch in archive.batches(self.REPLAY_BATCH):
+                urls = [entry['url'] for entry in batch]
+                pages = [entry['html'] for entry in batch]
+                parsers = [self.parser] * len(batch)
+                if self.parse_pool:
+                    chunksize = max(1, len(batch) // (self.parse_workers * 4))
+                    parsed = self.parse_pool.map(parse_product_page, pages, urls, parsers, chunksize=chunksize)
+                else:
+                    parsed = map(parse_product_page, pages, urls, parsers)
+
+                for entry, (product_data, diagnostics) in zip(batch, parsed):
+                    self.telemetry.set(entry['url'], source='replay', status=200)
+                    self.telemetry.add(entry['url'], parse_ms=diagnostics.get('parse_ms', 0),
+                                       bytes=len(entry['html']))
+                    product_id = diagnostics.get('ajax_variations_product_id')
+                    if product_id and str(product_id) in variations:
+                        if variations[str(product_id)]:
+                            product_data['variants'] = variations[str(product_id)]
+                            self.stats['ajax_variations'] += 1
+                    elif product_id:
+                        # As in a live run: the placeholders carry the parent's price for every size
+                        print(f"✗ No archived variations for product {product_id}; skipping {entry['url']}")
+                        self.telemetry.finish(entry['url'], 'error')
+                        continue
+                    print(f"✓ Replayed: {product_data.get('name', 'Unknown')}")
+                    self.collect(results, index, product_data)
+                    index += 1
+
+            if not index:
+                raise IncompleteCatalogError(f"{archive.path.name} holds no product pages")
+            elapsed = time.perf_counter() - started
+            print(f"Replayed {index} pages from {archive.path.name} in {elapsed:.2f}s "
+                  f"({index / elapsed if elapsed else 0:.0f} pages/s)")
+            return self.collect_all([results[position] for position in sorted(results)])
 
         finally:
             await self.close()
 
+    async def scrape_store_api(self) -> Optional[List[Dict]]:
+        """Fetch the full catalog through the Store API in a few bulk requests; None falls back to crawling"""
+        try:
+            products = await self.catalog.fetch_store_api_products()
+        except IncompleteCatalogError:
+            raise
+        except Exception as e:
+            print(f"✗ Error reading Store API: {e}")
+            return None
+        for product_data in products or []:
+            print(f"✓ Scraped (store api): {product_data.get('name', 'Unknown')}")
+        return products
+
+    def schedule_retry(self, url_queue: asyncio.Queue, item: Tuple, delay: float):
+        """Re-queue a URL after its backoff without tying up a worker while it waits"""
+        async def requeue_later():
+            await asyncio.sleep(delay)
+            await url_queue.put(item)
+
+        timer = asyncio.create_task(requeue_later())
+        self.retry_timers.add(timer)
+        timer.add_done_callback(self.retry_timers.discard)
+
+    async def _product_worker(self, worker_id: int, url_queue: asyncio.Queue, parse_queue: asyncio.Queue,
+                              results: Dict[int, Dict]):
+        """Fetch stage: consume product URLs until the end is signalled; each worker owns at most one page"""
+        while True:
+            item = await url_queue.get()
+            try:
+                if item is None:
+                    return
+                index, url, force_browser, attempt = item
+                if not force_browser and not attempt:
+                    self.discovery_slots.release()
+
+                try:
+                    job = await self.fetch_product(url, worker_id, force_browser)
+                except Exception as e:
+                    retry_after = e.retry_after if isinstance(e, RetryableError) else None
+                    if attempt < self.max_retries:
+                        delay = self.retry_delay(attempt, retry_after)
+                        print(f"↻ Retry {attempt + 1}/{self.max_retries} for {url} in {delay:.1f}s ({e})")
+                        self.telemetry.add(url, retries=1)
+                        self.requeued += 1
+                        self.schedule_retry(url_queue, (index, url, force_browser, attempt + 1), delay)
+                    else:
+                        print(f"✗ Error scraping {url} after {attempt + 1} attempts: {e}")
+                        self.telemetry.finish(url, 'error')
+                    continue
+                if job and 'record' in job:
+                    record = await self.finish_cached(job)
+                    if record:
+                        self.collect(results, index, record)
+                    else:
+                        self.telemetry.finish(url, 'error')
+                elif job:
+                    await parse_queue.put((index, job))
+                else:
+                    self.telemetry.finish(url, 'error')
+            finally:
+                url_queue.task_done()
+
+    async def _parse_worker(self, parse_queue: asyncio.Queue, url_queue: asyncio.Queue, results: Dict[int, Dict]):
+        """Parse stage: extract products from fetched HTML and route incomplete HTTP pages to the browser"""
+        while True:
+            item = await parse_queue.get()
+            try:
+                if item is None:
+                    return
+                index, job = item
+                try:
+                    product_data, diagnostics = await self.parse_job(job)
+                except Exception as e:
+                    print(f"✗ Error parsing {job['url']}: {e}")
+                    self.telemetry.finish(job['url'], 'error')
+                    continue
+                self.telemetry.add(job['url'], parse_ms=diagnostics.get('parse_ms', 0))
+
+                if job['source'] == 'http':
+                    missing = self.find_missing_fields(product_data, diagnostics)
+                    if missing:
+                        print(f"↪ Browser fallback for {job['url']} (missing: {', '.join(missing)})")
+                        self.requeued += 1
+                        self.telemetry.add(job['url'], retries=1)
+                        await url_queue.put((index, job['url'], True, 0))
+                        continue
+
+                if not await self.load_ajax_variations(product_data, diagnostics):
+                    self.telemetry.finish(job['url'], 'error')
+                    continue
+                if self.cache:
+                    self.cache.store(job['url'], job['headers'], job['content_hash'], product_data,
+                                     diagnostics.get('ajax_variations_product_id'))
+                self.stats[job['source']] += 1
+                label = ' (http)' if job['source'] == 'http' else ''
+                print(f"✓ Scraped{label}: {product_data.get('name', 'Unknown')}")
+                self.collect(results, index, product_data)
+            finally:
+                parse_queue.task_done()
+
     def get_fallback_products(self) -> List[Dict]:
         """Fallback product data based on known information"""
         return [
@@ -397,10 +2471,15 @@ class PremierBioLabsScraper:
             }
         ]
 
-    def save_products(self, filename: str):
+    def save_products(self, output_path: Path):
         """Save scraped products to JSON file"""
-        output_path = Path(__file__).parent.parent / 'data' / filename
-        output_path.parent.mkdir(exist_ok=True)
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.sink:
+            count = self.sink.export_json(output_path)
+            print(f"\n✅ Saved {count} products to {output_path} (streamed from {self.sink.path.name})")
+            return output_path
 
         with open(output_path, 'w') as f:
             json.dump(self.products, f, indent=2, default=str)
@@ -409,30 +2488,387 @@ class PremierBioLabsScraper:
         return output_path
 
 
-async def main():
+class BrowserDaemon:
+    """Long-lived headless Chromium that scraper runs attach to over CDP instead of cold-starting"""
+
+    STATE_PATH = Path(__file__).parent.parent / 'data' / '.cache' / 'browser-daemon.json'
+    PROFILE_DIR = Path(__file__).parent.parent / 'data' / '.cache' / 'browser-profile'
+    DEFAULT_PORT = 9222
+    STARTUP_TIMEOUT = 15.0
+
+    def __init__(self, state_path: Optional[Path] = None):
+        self.state_path = Path(state_path) if state_path else self.STATE_PATH
+
+    def read_state(self) -> Optional[Dict]:
+        """Return the recorded daemon process, if any"""
+        if not self.state_path.exists():
+            return None
+        with open(self.state_path, 'r') as f:
+            return json.load(f)
+
+    @staticmethod
+    def probe(port: int, timeout: float = 2.0) -> Optional[Dict]:
+        """Ask the DevTools endpoint for its version; None when it does not answer"""
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/json/version", timeout=timeout) as response:
+                return json.load(response)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def is_running(pid: int) -> bool:
+        """Whether a process id is still alive"""
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def health(self) -> Optional[Dict]:
+        """Health check: the recorded process is alive and its DevTools endpoint responds"""
+        state = self.read_state()
+        if not state or not self.is_running(state['pid']):
+            return None
+        version = self.probe(state['port'])
+        if not version:
+            return None
+        return {**state, 'browser': version.get('Browser'), 'ws_endpoint': version.get('webSocketDebuggerUrl')}
+
+    @staticmethod
+    async def executable_path() -> str:
+        """Chromium binary installed by `playwright install chromium`"""
+        playwright = await async_playwright().start()
+        try:
+            return playwright.chromium.executable_path
+        finally:
+            await playwright.stop()
+
+    def start(self, port: int = DEFAULT_PORT, warm_url: Optional[str] = None) -> Dict:
+        """Launch Chromium detached with remote debugging, then optionally warm its profile"""
+        running = self.health()
+        if running:
+            print(f"✓ Browser daemon already running (pid {running['pid']}, port {running['port']})")
+            return running
+
+        executable = asyncio.run(self.executable_path())
+        if not Path(executable).exists():
+            raise RuntimeError(f"Chromium not found at {executable}; run: playwright install chromium")
+        self.PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        log_path = self.state_path.with_suffix('.log')
+        viewport = PremierBioLabsScraper.CONTEXT_OPTIONS['viewport']
+        with open(log_path, 'w') as log:
+            process = subprocess.Popen([
+                executable,
+                '--headless=new',
+                f'--remote-debugging-port={port}',
+                '--remote-debugging-address=127.0.0.1',
+                f'--user-data-dir={self.PROFILE_DIR}',
+                '--no-first-run',
+                '--no-default-browser-check',
+                '--disable-blink-features=AutomationControlled',
+                f"--user-agent={PremierBioLabsScraper.CONTEXT_OPTIONS['user_agent']}",
+                f"--window-size={viewport['width']},{viewport['height']}",
+                'about:blank'
+            ], stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL, start_new_session=True)
+
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        version = None
+        while time.monotonic() < deadline and process.poll() is None:
+            version = self.probe(port, timeout=0.5)
+            if version:
+                break
+            time.sleep(0.2)
+        if not version:
+            process.kill()
+            raise RuntimeError(f"Chromium did not open DevTools on port {port}; see {log_path}")
+
+        state = {
+            'pid': process.pid,
+            'port': port,
+            'endpoint': f"http://127.0.0.1:{port}",
+            'executable': executable,
+            'started_at': datetime.now().isoformat()
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w') as f:
+            json.dump(state, f, indent=2)
+        print(f"✓ Browser daemon started: {version.get('Browser')} (pid {process.pid}, port {port})")
+
+        if warm_url:
+            asyncio.run(self.warm(state['endpoint'], warm_url))
+        return state
+
+    @staticmethod
+    async def warm(endpoint: str, url: str):
+        """Load a page once so the persistent profile holds DNS, TLS sessions and cached assets"""
+        playwright = await async_playwright().start()
+        try:
+            browser = await playwright.chromium.connect_over_cdp(endpoint)
+            page = await browser.contexts[0].new_page()
+            started = time.perf_counter()
+            await page.goto(url, wait_until='load')
+            print(f"✓ Warmed profile with {url} ({(time.perf_counter() - started) * 1000:.0f}ms)")
+            await page.close()
+            await browser.close()
+        except Exception as e:
+            print(f"✗ Warm-up failed for {url}: {e}")
+        finally:
+            await playwright.stop()
+
+    def stop(self) -> bool:
+        """Terminate the daemon and forget its state"""
+        state = self.read_state()
+        if not state:
+            print("Browser daemon is not running")
+            return False
+        if self.is_running(state['pid']):
+            self.signal(state['pid'], signal.SIGTERM)
+            deadline = time.monotonic() + 10
+            while self.is_running(state['pid']) and time.monotonic() < deadline:
+                time.sleep(0.2)
+            if self.is_running(state['pid']):
+                self.signal(state['pid'], signal.SIGKILL)
+        self.state_path.unlink()
+        print(f"✓ Browser daemon stopped (pid {state['pid']})")
+        return True
+
+    @staticmethod
+    def signal(pid: int, signum: int):
+        """Signal the daemon's whole process group (Chromium's helpers included), or just the pid"""
+        try:
+            os.killpg(pid, signum)
+        except ProcessLookupError:
+            os.kill(pid, signum)
+
+    def status(self) -> bool:
+        """Print the health check result"""
+        health = self.health()
+        if not health:
+            print("✗ Browser daemon is not running or not responding")
+            return False
+        print(f"✓ Browser daemon healthy: {health['browser']} (pid {health['pid']}, {health['endpoint']}, "
+              f"since {health['started_at']})")
+        return True
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Scrape Premier Bio Labs peptide products')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Number of browser pages scraping in parallel (default: 4)')
+    parser.add_argument('--per-host-limit', type=int, default=2,
+                        help='Starting in-flight requests per host; adaptive mode grows it up to --concurrency '
+                             '(default: 2)')
+    parser.add_argument('--no-adaptive', action='store_true',
+                        help='Keep --per-host-limit fixed instead of adjusting it to origin latency and errors')
+    parser.add_argument('--recycle-after', type=int, default=PremierBioLabsScraper.RECYCLE_AFTER_PAGES,
+                        help='Replace a worker\'s browser context after this many pages; 0 disables '
+                             f'(default: {PremierBioLabsScraper.RECYCLE_AFTER_PAGES})')
+    parser.add_argument('--recycle-heap-mb', type=float, default=PremierBioLabsScraper.RECYCLE_HEAP_MB,
+                        help='Replace a worker\'s context once its page JS heap reaches this size; 0 disables '
+                             f'(default: {PremierBioLabsScraper.RECYCLE_HEAP_MB})')
+    parser.add_argument('--max-browser-rss-mb', type=float, default=None,
+                        help='Recycle contexts while the Chromium process tree is above this resident size')
+    parser.add_argument('--max-retries', type=int, default=PremierBioLabsScraper.MAX_RETRIES,
+                        help=f'Retries per product after timeouts, 429/5xx or browser errors '
+                             f'(default: {PremierBioLabsScraper.MAX_RETRIES})')
+    parser.add_argument('--min-request-interval', type=float, default=0.5,
+                        help='Minimum seconds between navigation starts per host (default: 0.5)')
+    parser.add_argument('--base-url', default=None,
+                        help='Override the store origin, e.g. a local stand-in server')
+    parser.add_argument('--catalog-source', choices=['listing', 'sitemap', 'store-api'], default='listing',
+                        help='Discover products from shop listings, product sitemaps, or extract them in '
+                             'bulk from the WooCommerce Store API (default: listing)')
+    parser.add_argument('--parser', choices=['compiled', 'soup'], default='compiled',
+                        help='Product page extractor: single-pass lxml (default) or the BeautifulSoup reference')
+    parser.add_argument('--parse-workers', type=int, default=None,
+                        help='Processes for HTML extraction; 0 parses on the event loop (default: min(4, CPUs))')
+    parser.add_argument('--check-parser', nargs='*', metavar='HTML_FILE',
+                        help='Compare both extractors on saved product pages and check listing pages against '
+                             'their .links.json, then exit (default: the pages in scripts/fixtures)')
+    parser.add_argument('--http-first', action='store_true',
+                        help='Fetch pages over plain HTTP and only launch Chromium when fields are missing')
+    parser.add_argument('--block-resources', action='store_true',
+                        help='Abort images, fonts, media and third-party requests in the browser; avoided bytes are '
+                             'estimated from the image store manifest written by download-images.py')
+    parser.add_argument('--allow-domain', action='append', default=[], dest='allow_domains',
+                        help='Third-party domain that may still load with --block-resources (repeatable)')
+    parser.add_argument('--cache', nargs='?', const=str(PageCache.DEFAULT_PATH), default=None,
+                        help='Reuse records for unchanged pages via ETag/Last-Modified and content hashes '
+                             f'(default path: {PageCache.DEFAULT_PATH})')
+    parser.add_argument('--output', default=None,
+                        help='JSON array of the scraped products (default: data/raw-products.json; with --replay '
+                             'or --base-url, data/.cache/raw-products.replay.json or raw-products.stand-in.json)')
+    parser.add_argument('--output-jsonl', default=None,
+                        help='JSONL file each record is appended to as soon as it is scraped '
+                             '(default: --output with a .jsonl suffix)')
+    parser.add_argument('--checkpoint', default=None,
+                        help=f'Journal of completed product URLs (default: {ProductSink.DEFAULT_JOURNAL}; '
+                             'with --replay or --base-url, scrape-checkpoint.replay.txt or .stand-in.txt beside it)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continue an interrupted crawl, skipping URLs already in the checkpoint journal')
+    parser.add_argument('--metrics', default=str(CrawlTelemetry.DEFAULT_PATH),
+                        help=f'Per-URL timing and network metrics as JSONL (default: {CrawlTelemetry.DEFAULT_PATH})')
+    parser.add_argument('--metrics-prom', default=None, metavar='PATH',
+                        help='Also export a Prometheus textfile, e.g. for node_exporter\'s textfile collector')
+    parser.add_argument('--record', nargs='?', const=str(PageArchive.DEFAULT_PATH), default=None, metavar='PATH',
+                        help=f'Archive every fetched product page (default path: {PageArchive.DEFAULT_PATH})')
+    parser.add_argument('--replay', nargs='?', const=str(PageArchive.DEFAULT_PATH), default=None, metavar='PATH',
+                        help='Extract products from a recorded archive instead of the live site; '
+                             'never launches the browser')
+    parser.add_argument('--daemon', choices=['start', 'stop', 'status'], default=None,
+                        help='Manage a long-lived headless Chromium that later runs attach to with --attach')
+    parser.add_argument('--daemon-port', type=int, default=BrowserDaemon.DEFAULT_PORT,
+                        help=f'DevTools port of the browser daemon (default: {BrowserDaemon.DEFAULT_PORT})')
+    parser.add_argument('--no-warm', action='store_true',
+                        help='Start the daemon without loading the shop page into its profile first')
+    parser.add_argument('--attach', action='store_true',
+                        help='Reuse the running browser daemon instead of launching Chromium')
+    return parser.parse_args(argv)
+
+
+def output_paths(args: argparse.Namespace) -> Tuple[Path, Path, Path]:
+    """JSON output, JSONL output and checkpoint journal of a run
+
+    Replays and runs against a stand-in origin do not describe the live catalog, so
+    unless told otherwise they write under data/.cache and leave raw-products.json,
+    the input of transform-data.py, alone.
+    """
+    label = 'replay' if args.replay else 'stand-in' if args.base_url else None
+    cache_dir = ProductSink.DEFAULT_JOURNAL.parent
+    if args.output:
+        output = Path(args.output)
+    elif label:
+        output = cache_dir / f'raw-products.{label}.json'
+    else:
+        output = ProductSink.DEFAULT_PATH.with_suffix('.json')
+    output_jsonl = Path(args.output_jsonl) if args.output_jsonl else output.with_suffix('.jsonl')
+    if args.checkpoint:
+        checkpoint = Path(args.checkpoint)
+    elif label:
+        checkpoint = cache_dir / f'scrape-checkpoint.{label}.txt'
+    else:
+        checkpoint = ProductSink.DEFAULT_JOURNAL
+    return output, output_jsonl, checkpoint
+
+
+async def main(args: Optional[argparse.Namespace] = None):
     """Run the scraper"""
-    scraper = PremierBioLabsScraper()
+    args = args or parse_args([])
+    output_path, output_jsonl, checkpoint = output_paths(args)
+    browser_endpoint = None
+    if args.attach:
+        health = BrowserDaemon().health()
+        if health:
+            browser_endpoint = health['endpoint']
+        else:
+            print("⚠️ Browser daemon is not healthy; this run will launch its own Chromium")
+    archive = PageArchive(Path(args.record)) if args.record and not args.replay else None
+    if archive:
+        archive.open_for_recording(append=args.resume)
+    scraper = PremierBioLabsScraper(
+        concurrency=args.concurrency,
+        per_host_limit=args.per_host_limit,
+        min_request_interval=args.min_request_interval,
+        http_first=args.http_first,
+        base_url=args.base_url,
+        cache=PageCache(Path(args.cache)) if args.cache else None,
+        block_resources=args.block_resources,
+        allow_domains=args.allow_domains,
+        catalog_source=args.catalog_source,
+        parser=args.parser,
+        parse_workers=args.parse_workers,
+        sink=ProductSink(output_jsonl, checkpoint, resume=args.resume),
+        telemetry=CrawlTelemetry(Path(args.metrics)),
+        archive=archive,
+        browser_endpoint=browser_endpoint,
+        adaptive=not args.no_adaptive,
+        max_retries=args.max_retries,
+        recycle_after=args.recycle_after,
+        recycle_heap_mb=args.recycle_heap_mb,
+        max_browser_rss_mb=args.max_browser_rss_mb
+    )
 
     print("🚀 Starting Premier Bio Labs product scraper...")
+    print(f"   Workers: {scraper.concurrency}, per-host limit: {scraper.throttle.max_in_flight}")
     print("-" * 50)
 
-    products = await scraper.scrape_all_products()
+    if scraper.sink.completed:
+        print(f"↪ Resuming from {len(scraper.sink.completed)} checkpointed products")
+
+    try:
+        if args.replay:
+            await scraper.replay_products(PageArchive(Path(args.replay)))
+        else:
+            await scraper.scrape_all_products()
+    except IncompleteCatalogError as e:
+        print(f"✗ Incomplete catalog, nothing saved: {e}")
+        print(f"  The previous output is unchanged; records scraped so far are in {scraper.sink.part_path.name} "
+              f"for --resume")
+        exit(1)
 
     print("-" * 50)
-    print(f"✓ Scraped {len(products)} products")
+    print(f"✓ Scraped {scraper.sink.count} products")
+    if scraper.http_first:
+        print(f"  HTTP: {scraper.stats['http']}, browser fallback: {scraper.stats['browser']}")
+    if scraper.cache:
+        print(f"  Unchanged (from cache): {scraper.stats['unchanged']}")
+    if scraper.stats['ajax_variations']:
+        print(f"  Variations loaded from the Store API: {scraper.stats['ajax_variations']}")
+    if any(scraper.memory['peak_heap_mb']):
+        heaps = ', '.join(f"{heap:.0f}" for heap in scraper.memory['peak_heap_mb'])
+        print(f"  Browser memory: peak RSS {scraper.memory['peak_rss_mb']:.0f} MB, "
+              f"peak JS heap per worker [{heaps}] MB, contexts recycled: {scraper.memory['recycled']}")
+    limits = scraper.throttle.limits()
+    if limits:
+        print(f"  Adaptive per-host limits: {', '.join(f'{host}={limit}' for host, limit in limits.items())}")
+    readiness = scraper.readiness_summary()
+    if readiness:
+        print(readiness)
+    if scraper.blocked_report:
+        print(scraper.blocked_report)
+    metrics = scraper.telemetry.summary()
+    if metrics:
+        print("📈 Page metrics (p50 / p95 / p99):")
+        print('\n'.join(metrics))
+        print(f"  Written to {scraper.telemetry.path}")
+    if archive:
+        print(f"🗄  Recorded {archive.recorded} pages to {archive.path}")
+    if args.metrics_prom:
+        scraper.telemetry.write_prometheus(Path(args.metrics_prom))
+        print(f"  Prometheus textfile: {args.metrics_prom}")
 
     # Save raw products
-    output_file = scraper.save_products('raw-products.json')
+    output_file = scraper.save_products(output_path)
+    if output_path != ProductSink.DEFAULT_PATH.with_suffix('.json'):
+        print(f"  Pipeline input {ProductSink.DEFAULT_PATH.with_suffix('.json').name} was left unchanged; "
+              f"pass --output to replace it")
 
     # Print summary
     print("\n📊 Summary:")
-    for product in products:
+    for product in scraper.sink.iter_records():
         variants = product.get('variants', [])
         variant_info = f"({len(variants)} variants)" if len(variants) > 1 else f"({variants[0]['size']})" if variants else ""
         print(f"  - {product['name']}: ${product.get('price', 0):.2f} {variant_info}")
 
-    return products
+    return output_file
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    cli_args = parse_args()
+    if cli_args.check_parser is not None:
+        exit(1 if check_parser_parity(cli_args.check_parser) else 0)
+    if cli_args.daemon:
+        daemon = BrowserDaemon()
+        if cli_args.daemon == 'start':
+            shop_url = f"{(cli_args.base_url or PremierBioLabsScraper.BASE_URL).rstrip('/')}/shop"
+            try:
+                daemon.start(cli_args.daemon_port, warm_url=None if cli_args.no_warm else shop_url)
+            except RuntimeError as e:
+                print(f"✗ {e}")
+                exit(1)
+            exit(0)
+        exit(0 if getattr(daemon, cli_args.daemon)() else 1)
+    asyncio.run(main(cli_args))
\ No newline at end of file
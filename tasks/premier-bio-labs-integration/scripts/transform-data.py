@@ -4,110 +4,275 @@ Data Transformation Script
 Transforms raw scraped data into Medusa-compatible format
 """
 
+import argparse
+import hashlib
+import io
 import json
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional, TextIO, Tuple
 from datetime import datetime
 
+from delta_manifest import DeltaManifest
+from keyword_matcher import KeywordMatcher
+from pricing import VariantColumns, format_cents, to_cents
+from product_records import MISSING, RawProduct, RawVariant, TransformedProduct, Variant, field_or, to_json
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+
+# Bump whenever transform logic changes so every product is rebuilt on the next incremental run
+TRANSFORMER_VERSION = 2
+
+# Characters read per refill when streaming a JSON array
+READ_CHUNK = 1 << 16
+WHITESPACE = re.compile(r'\s*')
+
+
+def iter_json_array(f: TextIO, chunk_size: int = READ_CHUNK) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array one at a time without loading the whole file"""
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    expecting = '['
+
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer) and not eof:
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if pos == len(buffer):
+            raise ValueError('Unexpected end of file inside JSON array')
+
+        char = buffer[pos]
+        if expecting == '[':
+            if char != '[':
+                raise ValueError(f"Expected a JSON array, found {char!r}")
+            pos += 1
+            expecting = 'first'
+        elif char == ']' and expecting in ('first', ','):
+            return
+        elif expecting == ',':
+            if char != ',':
+                raise ValueError(f"Expected ',' between array elements, found {char!r}")
+            pos += 1
+            expecting = 'value'
+        else:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                value, end = None, len(buffer)
+            # A value is only complete once the following delimiter has been read ("2" may become "2.5")
+            after = WHITESPACE.match(buffer, end).end()
+            if not eof and (after == len(buffer) or buffer[after] in '.eE+-0123456789'):
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            yield value
+            pos = end
+            expecting = ','
+
+
+def iter_raw_products(path: Path) -> Iterator[Dict]:
+    """Stream raw products from a JSON array or a JSONL file"""
+    with open(path, 'r') as f:
+        if path.suffix == '.jsonl':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+class TransformState:
+    """Fingerprints of the raw products behind the last transform, keyed by handle"""
+
+    DEFAULT_PATH = DATA_DIR / '.cache' / 'transform-state.json'
+    # Volatile fields that change on every scrape without changing the product
+    IGNORED_FIELDS = ('scraped_at',)
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+        self.fingerprints: Dict[str, str] = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+            self.fingerprints = state.get('products', {})
+            # Products transformed by another transformer version must all be rebuilt; the handles
+            # are kept so the delta still reports them as changed or removed
+            if state.get('version') != TRANSFORMER_VERSION:
+                self.fingerprints = dict.fromkeys(self.fingerprints, '')
+
+    @classmethod
+    def fingerprint(cls, raw_product: Dict) -> str:
+        """Stable content hash of a raw product"""
+        content = {key: value for key, value in raw_product.items() if key not in cls.IGNORED_FIELDS}
+        encoded = json.dumps(content, sort_keys=True, separators=(',', ':'), default=str)
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def save(self, fingerprints: Dict[str, str]):
+        """Persist the new fingerprints atomically"""
+        self.fingerprints = fingerprints
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': TRANSFORMER_VERSION, 'products': fingerprints}, f)
+        tmp_path.replace(self.path)
+
+
+def transform_chunk(raw_products: List[Dict]) -> Tuple[List[Optional[TransformedProduct]], str]:
+    """Process-pool entry point: transform a chunk, returning results in input order plus its log"""
+    log = io.StringIO()
+    with redirect_stdout(log):
+        transformer = ProductTransformer()
+        products = [transformer.transform_safely(raw_product) for raw_product in raw_products]
+    return products, log.getvalue()
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most ``size`` items"""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 class ProductTransformer:
     """Transform raw product data to Medusa format"""
 
-    def __init__(self):
-        self.transformed_products = []
+    CHUNK_SIZE = 250
+
+    SUBTITLES = {
+        'BPC-157': 'Body Protection Compound - Tissue Repair Research',
+        'GHK-Cu': 'Copper Peptide - Skin & Tissue Research',
+        'Tesamorelin': 'Growth Hormone-Releasing Hormone Analog',
+        'GLP-2': 'Glucagon-Like Peptide-2 - Intestinal Research',
+        'GLP-3': 'GLP-3 Receptor Agonist - Metabolic Research',
+        'NAD+': 'Nicotinamide Adenine Dinucleotide - Cellular Research',
+        'StaRter Kit R': 'Complete Research Peptide Starter Kit',
+        'StarTer Kit T': 'Tissue Research Peptide Kit'
+    }
+
+    PEPTIDE_METADATA = {
+        'BPC': {
+            'sequence': 'Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val',
+            'amino_acids': 15,
+            'class': 'Pentadecapeptide'
+        },
+        'GHK': {
+            'sequence': 'Gly-His-Lys',
+            'amino_acids': 3,
+            'class': 'Tripeptide',
+            'copper_complex': True
+        }
+    }
+
+    CATEGORY_KEYWORDS = {
+        'Research Peptides': ['peptide', 'research', 'peptides'],
+        'Growth Factors': ['growth', 'factor', 'gh'],
+        'Metabolic Compounds': ['metabolic', 'glp', 'glucose', 'diabetes'],
+        'Anti-Aging Research': ['anti-aging', 'nad', 'longevity'],
+        'Tissue Research': ['tissue', 'repair', 'recovery', 'bpc'],
+        'Starter Kits': ['kit', 'starter', 'bundle']
+    }
+
+    TAG_MAPPINGS = {
+        'BPC': ['Tissue Repair', 'Recovery', 'BPC-157', 'Pentadecapeptide'],
+        'GHK': ['Copper Peptide', 'Skin Research', 'GHK-Cu', 'Tripeptide'],
+        'TB-500': ['Thymosin', 'Athletic Recovery', 'TB-500'],
+        'TESAMORELIN': ['Growth Hormone', 'GHRH', 'Tesamorelin'],
+        'GLP': ['GLP Agonist', 'Metabolic Research', 'Diabetes Research'],
+        'NAD': ['NAD+', 'Cellular Energy', 'Anti-Aging', 'Coenzyme'],
+        'KIT': ['Starter Kit', 'Bundle', 'Value Pack']
+    }
+
+    # All keyword tables compiled into one automaton; each name or category is scanned once
+    KEYWORDS = (KeywordMatcher()
+                .add_table('subtitle', SUBTITLES.items())
+                .add_table('metadata', PEPTIDE_METADATA.items())
+                .add_table('tags', TAG_MAPPINGS.items())
+                .add_table('categories', ((keyword, category)
+                                          for category, keywords in CATEGORY_KEYWORDS.items()
+                                          for keyword in keywords)))
+
+    def __init__(self, workers: int = 1, chunk_size: int = CHUNK_SIZE):
+        self.transformed_products: List[TransformedProduct] = []
+        self.workers = (os.cpu_count() or 1) if workers == 0 else max(1, workers)
+        self.chunk_size = max(1, chunk_size)
 
     def transform_product(self, raw_product: Dict) -> Dict:
         """Transform a single product to Medusa format"""
-
-        name = raw_product.get('name', 'Unknown Product')
-        handle = raw_product.get('handle', self.create_handle(name))
-
-        # Base product structure
-        product = {
-            'title': name,
-            'subtitle': self.generate_subtitle(name),
-            'description': raw_product.get('full_description', ''),
-            'handle': handle,
-            'is_giftcard': False,
-            'status': 'published',
-            'thumbnail': raw_product.get('images', [''])[0] if raw_product.get('images') else None,
-            'images': [{'url': img} for img in raw_product.get('images', [])],
-            'weight': 50,  # grams (typical vial weight)
-            'length': 5,   # cm
-            'height': 5,   # cm
-            'width': 2,    # cm
-            'origin_country': 'US',
-            'hs_code': '2937290090',  # Peptide hormones HS code
-            'mid_code': 'peptide',
-            'material': 'Lyophilized Powder',
-            'metadata': self.generate_metadata(raw_product),
-            'categories': self.map_categories(raw_product.get('categories', [])),
-            'tags': self.generate_tags(raw_product),
-            'type': 'Research Peptide'
-        }
+        return self.transform_record(RawProduct.from_dict(raw_product)).to_dict()
+
+    def transform_record(self, raw_product: RawProduct) -> TransformedProduct:
+        """Transform a raw product record to a Medusa product record"""
+
+        # field_or keeps dict.get semantics: only absent fields take the default, explicit nulls pass through
+        name = field_or(raw_product.name, 'Unknown Product')
+        handle = field_or(raw_product.handle, self.create_handle(name))
+        images = field_or(raw_product.images, [])
+
+        # Base product structure; fields shared by every product live on TransformedProduct.DEFAULTS
+        product = TransformedProduct(
+            title=name,
+            subtitle=self.generate_subtitle(name),
+            description=field_or(raw_product.full_description, ''),
+            handle=handle,
+            thumbnail=images[0] if images else None,
+            images=list(images),
+            metadata=self.generate_metadata(raw_product),
+            categories=self.map_categories(field_or(raw_product.categories, [])),
+            tags=self.generate_tags(raw_product)
+        )
 
         # Process variants
-        variants = []
-        raw_variants = raw_product.get('variants', [])
+        raw_variants = field_or(raw_product.variants, [])
 
         if not raw_variants:
             # Create default variant if none exist
-            raw_variants = [{
-                'size': 'Standard',
-                'price': raw_product.get('price', 0),
-                'sku': raw_product.get('sku', f"PBL-{handle.upper()}"),
-                'in_stock': True
-            }]
+            raw_variants = [RawVariant(
+                size='Standard',
+                price=field_or(raw_product.price, 0),
+                sku=field_or(raw_product.sku, f"PBL-{handle.upper()}"),
+                in_stock=True
+            )]
 
         # Generate options from variants
-        sizes = list(set([v.get('size', 'Standard') for v in raw_variants]))
+        sizes = list(set([field_or(v.size, 'Standard') for v in raw_variants]))
         if len(sizes) > 1:
-            product['options'] = [{
+            product.options = [{
                 'title': 'Size',
                 'values': sizes
             }]
 
-        for i, raw_variant in enumerate(raw_variants):
-            variant = self.transform_variant(raw_variant, product, i)
-            variants.append(variant)
-
-        product['variants'] = variants
+        product.variants = [self.transform_variant(raw_variant, product, i)
+                            for i, raw_variant in enumerate(raw_variants)]
         return product
 
-    def transform_variant(self, raw_variant: Dict, product: Dict, index: int) -> Dict:
+    def transform_variant(self, raw_variant: RawVariant, product: TransformedProduct, index: int) -> Variant:
         """Transform a single variant"""
-        size = raw_variant.get('size', 'Standard')
-        price = raw_variant.get('price', 0)
-        sku = raw_variant.get('sku', f"{product['handle']}-{index}")
-
-        variant = {
-            'title': size,
-            'sku': sku.upper(),
-            'barcode': None,
-            'ean': None,
-            'upc': None,
-            'inventory_quantity': 100 if raw_variant.get('in_stock', True) else 0,
-            'allow_backorder': False,
-            'manage_inventory': True,
-            'requires_shipping': True,
-            'weight': 50,  # grams
-            'length': 5,
-            'height': 5,
-            'width': 2,
-            'prices': [
-                {
-                    'currency_code': 'usd',
-                    'amount': int(price * 100)  # Convert to cents
-                }
-            ]
-        }
-
-        # Add options if product has them
-        if product.get('options'):
-            variant['options'] = [{'value': size}]
-
-        return variant
+        size = field_or(raw_variant.size, 'Standard')
+        price = field_or(raw_variant.price, 0)
+        sku = field_or(raw_variant.sku, f"{product.handle}-{index}")
+
+        return Variant(
+            title=size,
+            sku=sku.upper(),
+            inventory_quantity=100 if field_or(raw_variant.in_stock, True) else 0,
+            amount=to_cents(price),
+            # Add options if product has them
+            option_value=size if product.options else MISSING
+        )
 
     def create_handle(self, name: str) -> str:
         """Create URL-safe handle from name"""
@@ -118,26 +283,11 @@ class ProductTransformer:
 
     def generate_subtitle(self, name: str) -> str:
         """Generate product subtitle based on name"""
-        subtitles = {
-            'BPC-157': 'Body Protection Compound - Tissue Repair Research',
-            'GHK-Cu': 'Copper Peptide - Skin & Tissue Research',
-            'Tesamorelin': 'Growth Hormone-Releasing Hormone Analog',
-            'GLP-2': 'Glucagon-Like Peptide-2 - Intestinal Research',
-            'GLP-3': 'GLP-3 Receptor Agonist - Metabolic Research',
-            'NAD+': 'Nicotinamide Adenine Dinucleotide - Cellular Research',
-            'StaRter Kit R': 'Complete Research Peptide Starter Kit',
-            'StarTer Kit T': 'Tissue Research Peptide Kit'
-        }
-
-        for key, subtitle in subtitles.items():
-            if key.lower() in name.lower():
-                return subtitle
-
-        return 'Premium Research-Grade Peptide'
+        return self.KEYWORDS.first(name, 'subtitle', 'Premium Research-Grade Peptide')
 
-    def generate_metadata(self, raw_product: Dict) -> Dict:
+    def generate_metadata(self, raw_product: RawProduct) -> Dict:
         """Generate product metadata"""
-        specs = raw_product.get('specifications', {})
+        specs = field_or(raw_product.specifications, {})
 
         metadata = {
             'purity': specs.get('Purity', '>98%'),
@@ -150,46 +300,21 @@ class ProductTransformer:
             'coa_available': True,
             'third_party_tested': True,
             'research_use_only': True,
-            'original_url': raw_product.get('url', ''),
-            'scraped_at': raw_product.get('scraped_at', datetime.now().isoformat())
+            'original_url': field_or(raw_product.url, ''),
+            'scraped_at': field_or(raw_product.scraped_at, datetime.now().isoformat())
         }
 
         # Add peptide-specific metadata
-        name = raw_product.get('name', '').upper()
-        if 'BPC' in name:
-            metadata.update({
-                'sequence': 'Gly-Glu-Pro-Pro-Pro-Gly-Lys-Pro-Ala-Asp-Asp-Ala-Gly-Leu-Val',
-                'amino_acids': 15,
-                'class': 'Pentadecapeptide'
-            })
-        elif 'GHK' in name:
-            metadata.update({
-                'sequence': 'Gly-His-Lys',
-                'amino_acids': 3,
-                'class': 'Tripeptide',
-                'copper_complex': True
-            })
+        metadata.update(self.KEYWORDS.first(field_or(raw_product.name, ''), 'metadata', {}))
 
         return metadata
 
     def map_categories(self, raw_categories: List[str]) -> List[str]:
         """Map categories to standardized names"""
-        category_map = {
-            'Research Peptides': ['peptide', 'research', 'peptides'],
-            'Growth Factors': ['growth', 'factor', 'gh'],
-            'Metabolic Compounds': ['metabolic', 'glp', 'glucose', 'diabetes'],
-            'Anti-Aging Research': ['anti-aging', 'nad', 'longevity'],
-            'Tissue Research': ['tissue', 'repair', 'recovery', 'bpc'],
-            'Starter Kits': ['kit', 'starter', 'bundle']
-        }
-
         mapped_categories = set()
 
         for raw_cat in raw_categories:
-            raw_lower = raw_cat.lower()
-            for standard_cat, keywords in category_map.items():
-                if any(keyword in raw_lower for keyword in keywords):
-                    mapped_categories.add(standard_cat)
+            mapped_categories.update(self.KEYWORDS.all(raw_cat, 'categories'))
 
         # Default category if none matched
         if not mapped_categories:
@@ -197,7 +322,7 @@ class ProductTransformer:
 
         return list(mapped_categories)
 
-    def generate_tags(self, raw_product: Dict) -> List[str]:
+    def generate_tags(self, raw_product: RawProduct) -> List[str]:
         """Generate product tags for search and filtering"""
         tags = [
             'Research Grade',
@@ -208,52 +333,148 @@ class ProductTransformer:
             'COA Available'
         ]
 
-        name = raw_product.get('name', '').upper()
-
         # Add specific tags based on product
-        tag_mappings = {
-            'BPC': ['Tissue Repair', 'Recovery', 'BPC-157', 'Pentadecapeptide'],
-            'GHK': ['Copper Peptide', 'Skin Research', 'GHK-Cu', 'Tripeptide'],
-            'TB-500': ['Thymosin', 'Athletic Recovery', 'TB-500'],
-            'TESAMORELIN': ['Growth Hormone', 'GHRH', 'Tesamorelin'],
-            'GLP': ['GLP Agonist', 'Metabolic Research', 'Diabetes Research'],
-            'NAD': ['NAD+', 'Cellular Energy', 'Anti-Aging', 'Coenzyme'],
-            'KIT': ['Starter Kit', 'Bundle', 'Value Pack']
-        }
-
-        for key, specific_tags in tag_mappings.items():
-            if key in name:
-                tags.extend(specific_tags)
+        for specific_tags in self.KEYWORDS.all(field_or(raw_product.name, ''), 'tags'):
+            tags.extend(specific_tags)
 
         # Add size tags from variants
-        for variant in raw_product.get('variants', []):
-            size = variant.get('size', '')
+        for variant in field_or(raw_product.variants, []):
+            size = field_or(variant.size, '')
             if 'mg' in size.lower():
                 tags.append(size)
 
         return list(set(tags))  # Remove duplicates
 
-    def transform_all(self, raw_products: List[Dict]) -> List[Dict]:
+    def transform_safely(self, raw_product: Dict) -> Optional[TransformedProduct]:
+        """Transform one product, reporting and skipping it on error"""
+        try:
+            transformed_product = self.transform_record(RawProduct.from_dict(raw_product))
+            print(f"✓ Transformed: {transformed_product.title}")
+            return transformed_product
+        except Exception as e:
+            print(f"✗ Error transforming {raw_product.get('name', 'Unknown')}: {e}")
+            return None
+
+    def transform_all(self, raw_products: List[Dict]) -> List[TransformedProduct]:
         """Transform all products"""
-        transformed = []
-        for raw_product in raw_products:
-            try:
-                transformed_product = self.transform_product(raw_product)
-                transformed.append(transformed_product)
-                print(f"✓ Transformed: {transformed_product['title']}")
-            except Exception as e:
-                print(f"✗ Error transforming {raw_product.get('name', 'Unknown')}: {e}")
-
+        transformed = list(self.transform_stream(raw_products))
         self.transformed_products = transformed
         return transformed
 
+    def transform_incremental(self, raw_products: List[Dict], state: TransformState,
+                              previous: Dict[str, TransformedProduct], rebuild_all: bool = False) -> Dict[str, Any]:
+        """Transform only products whose raw content changed since the last run; returns the delta"""
+        # State is keyed by handle, so a repeated handle would flip between fingerprints on every run
+        handles, unique, seen, duplicates = [], [], set(), {}
+        for raw in raw_products:
+            handle = raw.get('handle', self.create_handle(raw.get('name', 'Unknown Product')))
+            if handle in seen:
+                duplicates[handle] = duplicates.get(handle, 0) + 1
+                continue
+            seen.add(handle)
+            handles.append(handle)
+            unique.append(raw)
+        if duplicates:
+            print(f"⚠️ Skipped {sum(duplicates.values())} raw products repeating an earlier handle (kept the first): "
+                  f"{', '.join(duplicates)}")
+        raw_products = unique
+
+        fingerprints = [TransformState.fingerprint(raw) for raw in raw_products]
+        stale = [index for index, (handle, fingerprint) in enumerate(zip(handles, fingerprints))
+                 if rebuild_all or state.fingerprints.get(handle) != fingerprint or handle not in previous]
+        rebuilt = dict(zip(stale, self.transform_ordered(raw_products[index] for index in stale)))
+
+        transformed = []
+        new_state = {}
+        delta = {'added': [], 'changed': [], 'removed': [], 'unchanged': 0}
+        for index, (handle, fingerprint) in enumerate(zip(handles, fingerprints)):
+            if index not in rebuilt:
+                transformed.append(previous[handle])
+                new_state[handle] = fingerprint
+                delta['unchanged'] += 1
+            elif rebuilt[index]:
+                transformed.append(rebuilt[index])
+                new_state[handle] = fingerprint
+                delta['changed' if handle in state.fingerprints else 'added'].append(handle)
+            elif handle in previous:
+                # Keep the last good version; the old fingerprint makes the next run retry it
+                print(f"  Keeping previous version of {handle}")
+                transformed.append(previous[handle])
+                new_state[handle] = state.fingerprints.get(handle, '')
+        delta['removed'] = [handle for handle in state.fingerprints if handle not in new_state]
+
+        state.save(new_state)
+        self.transformed_products = transformed
+        return delta
+
+    def transform_stream(self, raw_products: Iterable[Dict]) -> Iterator[TransformedProduct]:
+        """Transform products lazily, in input order, across worker processes when configured"""
+        for transformed_product in self.transform_ordered(raw_products):
+            if transformed_product:
+                yield transformed_product
+
+    def transform_ordered(self, raw_products: Iterable[Dict]) -> Iterator[Optional[TransformedProduct]]:
+        """Yield one result per input product, None where its transform failed"""
+        if self.workers == 1:
+            yield from map(self.transform_safely, raw_products)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # A bounded window of chunks in flight keeps streaming input from being read ahead entirely
+            pending = deque()
+            chunks = chunked(raw_products, self.chunk_size)
+            for chunk in chunks:
+                pending.append(pool.submit(transform_chunk, chunk))
+                if len(pending) < self.workers * 2:
+                    continue
+                yield from self.drain_chunk(pending.popleft())
+            while pending:
+                yield from self.drain_chunk(pending.popleft())
+
+    @staticmethod
+    def drain_chunk(future) -> Iterator[Optional[TransformedProduct]]:
+        """Replay a finished chunk's log and yield its results"""
+        products, log = future.result()
+        print(log, end='')
+        yield from products
+
+    @staticmethod
+    def write_delta(delta: Dict[str, Any], path: Path) -> DeltaManifest:
+        """Merge this run's delta into the manifest seed-peptides.ts has not applied yet"""
+        manifest = DeltaManifest(path)
+        manifest.merge(delta['added'], delta['changed'], delta['removed'])
+        manifest.save(transformer_version=TRANSFORMER_VERSION, unchanged=delta['unchanged'])
+        return manifest
+
+    def stream_to_jsonl(self, raw_products: Iterable[Dict], output_path: Path) -> Dict[str, int]:
+        """Transform a raw product stream straight to a JSONL file, holding one product at a time"""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+        stats = {'read': 0, 'products': 0, 'variants': 0}
+
+        def counted(products: Iterable[Dict]) -> Iterator[Dict]:
+            for raw_product in products:
+                stats['read'] += 1
+                yield raw_product
+
+        with open(tmp_path, 'w') as f:
+            for product in self.transform_stream(counted(raw_products)):
+                f.write(json.dumps(product.to_dict()))
+                f.write('\n')
+                stats['products'] += 1
+                stats['variants'] += len(product.variants)
+        tmp_path.replace(output_path)
+
+        print(f"\n✅ Streamed {stats['products']} of {stats['read']} products to {output_path}")
+        return stats
+
     def save_transformed(self, filename: str) -> Path:
         """Save transformed products to JSON"""
-        output_path = Path(__file__).parent.parent / 'data' / filename
+        output_path = DATA_DIR / filename
         output_path.parent.mkdir(exist_ok=True)
 
         with open(output_path, 'w') as f:
-            json.dump(self.transformed_products, f, indent=2)
+            json.dump(self.transformed_products, f, indent=2, default=to_json)
 
         print(f"\n✅ Saved {len(self.transformed_products)} transformed products to {output_path}")
         return output_path
@@ -264,24 +485,26 @@ class ProductTransformer:
         summary.append("\n📊 Transformation Summary:")
         summary.append("-" * 50)
 
-        total_variants = 0
-        for product in self.transformed_products:
-            variants = product.get('variants', [])
-            total_variants += len(variants)
+        # Price ranges for the whole catalog in one batch
+        columns = VariantColumns.from_products(self.transformed_products)
+        lows, highs = columns.price_ranges()
+        counts = columns.variant_counts()
 
-            # Price range
-            prices = [v['prices'][0]['amount'] / 100 for v in variants]
-            price_str = f"${min(prices):.2f}" if len(prices) == 1 else f"${min(prices):.2f} - ${max(prices):.2f}"
+        for product, low, high, count in zip(self.transformed_products, lows, highs, counts):
+            if low is None:
+                price_str = "N/A"
+            else:
+                price_str = format_cents(low) if count == 1 else f"{format_cents(low)} - {format_cents(high)}"
 
-            summary.append(f"  {product['title']}:")
-            summary.append(f"    Handle: {product['handle']}")
-            summary.append(f"    Variants: {len(variants)}")
+            summary.append(f"  {product.title}:")
+            summary.append(f"    Handle: {product.handle}")
+            summary.append(f"    Variants: {count}")
             summary.append(f"    Price: {price_str}")
-            summary.append(f"    Categories: {', '.join(product['categories'])}")
+            summary.append(f"    Categories: {', '.join(product.categories)}")
             summary.append("")
 
         summary.append(f"\nTotal Products: {len(self.transformed_products)}")
-        summary.append(f"Total Variants: {total_variants}")
+        summary.append(f"Total Variants: {sum(counts)}")
 
         return "\n".join(summary)
 
@@ -420,36 +643,87 @@ def get_fallback_products() -> List[Dict]:
         }
     ]
 
-def main():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description='Transform raw scraped products into Medusa format')
+    parser.add_argument('--input', default=str(DATA_DIR / 'raw-products.json'),
+                        help='Raw products, as a JSON array or JSONL (default: raw-products.json)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Transform one product at a time and write JSONL, with flat memory use')
+    parser.add_argument('--output', default=None,
+                        help='Output file (default: transformed-products.json, or .jsonl with --stream)')
+    parser.add_argument('--full', action='store_true',
+                        help='Re-transform every product instead of only those whose raw data changed')
+    parser.add_argument('--state', default=str(TransformState.DEFAULT_PATH),
+                        help='Fingerprints from the previous run (default: data/.cache/transform-state.json)')
+    parser.add_argument('--delta', default=str(DeltaManifest.DEFAULT_PATH),
+                        help='Manifest of handles not yet seeded; each run merges into it until seed-peptides.ts '
+                             'applies it (default: data/transform-delta.json)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Transform processes; 0 uses every core (default: 1, in-process)')
+    parser.add_argument('--chunk-size', type=int, default=ProductTransformer.CHUNK_SIZE,
+                        help=f'Products per worker task (default: {ProductTransformer.CHUNK_SIZE})')
+    return parser.parse_args(argv)
+
+
+def main(args: Optional[argparse.Namespace] = None):
     """Main execution"""
-    # Load raw products
-    raw_data_path = Path(__file__).parent.parent / 'data' / 'raw-products.json'
+    args = args or parse_args([])
+    raw_data_path = Path(args.input)
 
     # If raw data doesn't exist, use fallback
     if not raw_data_path.exists():
         print("⚠️ Raw products file not found. Creating with fallback data...")
-        raw_products = get_fallback_products()
         raw_data_path.parent.mkdir(exist_ok=True)
         with open(raw_data_path, 'w') as f:
-            json.dump(raw_products, f, indent=2)
+            # Same format the suffix promises, so the readers below and later runs can parse it
+            if raw_data_path.suffix == '.jsonl':
+                for product in get_fallback_products():
+                    f.write(json.dumps(product) + '\n')
+            else:
+                json.dump(get_fallback_products(), f, indent=2)
+
+    transformer = ProductTransformer(args.workers, args.chunk_size)
+    if args.stream:
+        output_path = Path(args.output) if args.output else DATA_DIR / 'transformed-products.jsonl'
+        print(f"📦 Streaming raw products from {raw_data_path}")
+        stats = transformer.stream_to_jsonl(iter_raw_products(raw_data_path), output_path)
+        print(f"Total Products: {stats['products']}")
+        print(f"Total Variants: {stats['variants']}")
+        return output_path
+
+    if raw_data_path.suffix == '.jsonl':
+        raw_products = list(iter_raw_products(raw_data_path))
     else:
         with open(raw_data_path, 'r') as f:
             raw_products = json.load(f)
 
     print(f"📦 Loaded {len(raw_products)} raw products")
 
-    # Transform products
-    transformer = ProductTransformer()
-    transformed_products = transformer.transform_all(raw_products)
+    # Transform products whose raw data changed, reusing the previous output for the rest
+    output_name = args.output or 'transformed-products.json'
+    previous_path = DATA_DIR / output_name
+    state = TransformState(Path(args.state))
+    previous = {}
+    if state.fingerprints and previous_path.exists():
+        with open(previous_path, 'r') as f:
+            previous = {product['handle']: TransformedProduct.from_dict(product) for product in json.load(f)}
+
+    delta = transformer.transform_incremental(raw_products, state, previous, rebuild_all=args.full)
+    manifest = transformer.write_delta(delta, Path(args.delta))
+    print(f"♻ Reused {delta['unchanged']} unchanged products; delta: {len(delta['added'])} added, "
+          f"{len(delta['changed'])} changed, {len(delta['removed'])} removed")
+    print(f"  Pending seed: {len(manifest.added)} added, {len(manifest.changed)} changed, "
+          f"{len(manifest.removed)} removed since {manifest.pending_since} ({manifest.path})")
 
     # Save transformed products
-    transformer.save_transformed('transformed-products.json')
+    transformer.save_transformed(output_name)
 
     # Print summary
     print(transformer.generate_summary())
 
-    return transformed_products
+    return [product.to_dict() for product in transformer.transformed_products]
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(parse_args())
\ No newline at end of file
@@ -60,6 +60,7 @@ echo "---------------------------------"
 test_item "Scraping script exists" "[ -f tasks/premier-bio-labs-integration/scripts/scrape-products.py ]"
 test_item "Transform script exists" "[ -f tasks/premier-bio-labs-integration/scripts/transform-data.py ]"
 test_item "Description generator exists" "[ -f tasks/premier-bio-labs-integration/scripts/generate-descriptions.py ]"
+test_item "Product page parsers agree on fixtures" "python3 tasks/premier-bio-labs-integration/scripts/scrape-products.py --check-parser"
 
 # Test data files
 test_item "Raw products JSON exists" "[ -f tasks/premier-bio-labs-integration/data/raw-products.json ]"
@@ -78,7 +79,35 @@ test_item "ResearchDisclaimer exists" "[ -f storefront/src/components/research-d
 test_item "Peptide detection utility exists" "[ -f storefront/src/lib/util/is-peptide-product.ts ]"
 
 echo ""
-echo "📊 Phase 2: Data Validation Tests"
+echo "🛰  Phase 2: Scraper Stand-in Run"
+echo "---------------------------------"
+
+# Scrape a local stand-in store (Store API pages, variation batches, sitemaps,
+# one 429 + Retry-After per catalog source) into a temp dir and check the records
+SCRIPTS=tasks/premier-bio-labs-integration/scripts
+STANDIN_PORT=${STANDIN_PORT:-8766}
+STANDIN_URL="http://127.0.0.1:$STANDIN_PORT"
+STANDIN_DIR=$(mktemp -d)
+python3 $SCRIPTS/fixtures/stand-in-store.py --port $STANDIN_PORT > /dev/null 2>&1 &
+STANDIN_PID=$!
+for _ in $(seq 50); do
+    python3 -c "import urllib.request; urllib.request.urlopen('$STANDIN_URL/wp-sitemap.xml')" 2>/dev/null && break
+    sleep 0.1
+done
+
+test_item "Store API catalog scraped from stand-in" "python3 $SCRIPTS/scrape-products.py --base-url $STANDIN_URL --catalog-source store-api --output $STANDIN_DIR/api.json --checkpoint $STANDIN_DIR/api.checkpoint --metrics $STANDIN_DIR/api.metrics.jsonl > $STANDIN_DIR/api.log 2>&1"
+test_item "Store API pagination saved all 250 products" "python3 -c \"import json, sys; sys.exit(len(json.load(open('$STANDIN_DIR/api.json'))) != 250)\""
+test_item "Variation batches priced every size" "python3 -c \"import json, sys; v = [[x['price'] for x in p['variants']] for p in json.load(open('$STANDIN_DIR/api.json')) if len(p['variants']) == 2]; sys.exit(len(v) != 83 or any(prices != [17.99, 27.99] for prices in v))\""
+test_item "Store API 429 retried after Retry-After" "grep -q 'Retry 1/.*page=2.*HTTP 429' $STANDIN_DIR/api.log"
+test_item "Sitemap products scraped from stand-in" "python3 $SCRIPTS/scrape-products.py --base-url $STANDIN_URL --catalog-source sitemap --http-first --output $STANDIN_DIR/sitemap.json --checkpoint $STANDIN_DIR/sitemap.checkpoint --metrics $STANDIN_DIR/sitemap.metrics.jsonl > $STANDIN_DIR/sitemap.log 2>&1"
+test_item "Sitemap adapter saved every product page" "python3 -c \"import json, sys; r = {p['url'].rstrip('/').rsplit('/', 1)[1]: [x['price'] for x in p['variants']] for p in json.load(open('$STANDIN_DIR/sitemap.json'))}; sys.exit(sorted(r) != ['simple', 'tb-500', 'variable'] or r['tb-500'] != [17.99, 27.99])\""
+test_item "Product page 429 retried after Retry-After" "grep -q 'Retry 1/.*/product/variable/.*HTTP 429' $STANDIN_DIR/sitemap.log"
+
+kill $STANDIN_PID 2>/dev/null
+rm -rf "$STANDIN_DIR"
+
+echo ""
+echo "📊 Phase 3: Data Validation Tests"
 echo "----------------------------------"
 
 # Check product count
@@ -105,7 +134,7 @@ test_item "COA metadata present" "grep -q 'coa_available' tasks/premier-bio-labs
 test_item "Research use metadata" "grep -q 'research_use_only' tasks/premier-bio-labs-integration/data/final-products.json"
 
 echo ""
-echo "🧩 Phase 3: Component Integration Tests"
+echo "🧩 Phase 4: Component Integration Tests"
 echo "----------------------------------------"
 
 # Check component imports
@@ -115,7 +144,7 @@ test_item "PeptideSpecs imported in template" "grep -q 'import PeptideSpecs' sto
 test_item "ResearchDisclaimer in layout" "grep -q 'ResearchDisclaimer' storefront/src/app/[countryCode]/(main)/layout.tsx"
 
 echo ""
-echo "🔧 Phase 4: TypeScript Compilation Test"
+echo "🔧 Phase 5: TypeScript Compilation Test"
 echo "----------------------------------------"
 
 # Test TypeScript compilation for key files
@@ -130,7 +159,7 @@ fi
 cd ..
 
 echo ""
-echo "📦 Phase 5: Dependencies Test"
+echo "📦 Phase 6: Dependencies Test"
 echo "------------------------------"
 
 # Check for required npm packages
@@ -140,7 +169,7 @@ test_item "class-variance-authority installed" "npm ls class-variance-authority
 cd ..
 
 echo ""
-echo "🌐 Phase 6: Backend Tests"
+echo "🌐 Phase 7: Backend Tests"
 echo "-------------------------"
 
 # Check if database is accessible
@@ -153,7 +182,7 @@ else
 fi
 
 echo ""
-echo "🎨 Phase 7: Storefront Readiness"
+echo "🎨 Phase 8: Storefront Readiness"
 echo "---------------------------------"
 
 # Check for build issues